@@ -2,92 +2,82 @@
 
 from __future__ import annotations
 
-import asyncio
-
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import Platform
 from homeassistant.core import HomeAssistant
 
-from .const import DOMAIN
+from .const import DOMAIN, PLATFORMS
 from .coordinator import WorltyDataCoordinator
+from .store import WorltySnapshotStore
+from .worlty import WorltyLocal
 
-PLATFORMS: list[Platform] = [
-    Platform.BINARY_SENSOR,
-    Platform.CLIMATE,
-    Platform.FAN,
-    Platform.LIGHT,
-    Platform.SENSOR,
-    Platform.SWITCH,
-    Platform.WATER_HEATER,
-    Platform.NUMBER,
-    Platform.TIME,
-    Platform.DATE,
-]
 
+def startup_platforms(api: WorltyLocal) -> list[Platform]:
+    """Return the platforms of the known devices, always with the sensor platform.
 
-async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
-    """Set up Worlty from a config entry."""
+    The sensor platform carries the pad diagnostics. Platforms of devices
+    that show up later are loaded by the API on demand.
+    """
+    present = {record.platform for record in api.devices if not record.hide}
+    return [
+        platform
+        for platform in PLATFORMS
+        if platform is Platform.SENSOR or platform in present
+    ]
 
-    async def init_coordinator(coordinator: WorltyDataCoordinator, entry: ConfigEntry):
-        """Initialize coordinator."""
-        if entry.unique_id is None:
-            hass.config_entries.async_update_entry(
-                entry, unique_id=coordinator.api.worlty_pad.mac_address
-            )
-
-        await coordinator.async_config_entry_first_refresh()
-
-        hass.data[DOMAIN][entry.entry_id]["task"] = hass.loop.create_task(
-            coordinator.api.listen_for_message()
-        )
-
-    async def retry_auth(coordinator: WorltyDataCoordinator, entry: ConfigEntry):
-        """Retry auth."""
-        auth = False
-        auth_count = 0
-        while not auth and auth_count <= 3:
-            auth_count += 1
-            auth, _ = await coordinator.api.auth(entry)
-            if auth is False:
-                await asyncio.sleep(5)
-            else:
-                await init_coordinator(coordinator, entry)
-        
 
+async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
+    """Set up Worlty from a config entry."""
     coordinator: WorltyDataCoordinator = WorltyDataCoordinator(hass, entry)
     await coordinator.connect()
 
     hass.data.setdefault(DOMAIN, {})[entry.entry_id] = {}
     hass.data[DOMAIN][entry.entry_id]["api"] = coordinator
-    hass.data[DOMAIN][entry.entry_id]["reauth"] = None
+    # The API updates entry.data itself, only an options change reloads.
+    hass.data[DOMAIN][entry.entry_id]["options"] = dict(entry.options)
 
     if coordinator.api is not None:
-        auth, _ = await coordinator.api.auth(entry)
-        if hass.data[DOMAIN][entry.entry_id]["reauth"] is not None:
-            hass.data[DOMAIN][entry.entry_id]["reauth"].cancel()
-            hass.data[DOMAIN][entry.entry_id]["reauth"] = None
+        # The supervisor keeps reconnecting in the background after this.
+        if await coordinator.api.async_warm_start(entry):
+            # Entities come from the snapshot, the pad catches up when it answers.
+            await coordinator.api.start(entry, wait=False)
+        else:
+            await coordinator.api.start(entry)
+        await coordinator.async_config_entry_first_refresh()
+        platforms = [
+            platform
+            for platform in startup_platforms(coordinator.api)
+            if platform not in coordinator.api.platforms
+        ]
+        coordinator.api.platforms.update(platforms)
+        await hass.config_entries.async_forward_entry_setups(entry, platforms)
+
+    entry.async_on_unload(entry.add_update_listener(async_reload_entry))
+    return True
 
-        if auth is True:
-            await init_coordinator(coordinator, entry)
-        elif hass.data[DOMAIN][entry.entry_id]["reauth"] is None:
-            hass.data[DOMAIN][entry.entry_id]["reauth"] = hass.loop.create_task(retry_auth(coordinator, entry))
 
-        await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
-
-    return True
+async def async_reload_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Reload the config entry when its options change."""
+    entry_data = hass.data.get(DOMAIN, {}).get(entry.entry_id, {})
+    if entry_data.get("options") == dict(entry.options):
+        return
+    await hass.config_entries.async_reload(entry.entry_id)
 
 
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
-    if unload_ok := await hass.config_entries.async_unload_platforms(entry, PLATFORMS):
-        coordinator: WorltyDataCoordinator = hass.data[DOMAIN][entry.entry_id]["api"]
+    coordinator: WorltyDataCoordinator = hass.data[DOMAIN][entry.entry_id]["api"]
+    # A platform still waiting to be forwarded is not set up, do not unload it.
+    await coordinator.api.async_cancel_platform_loads()
+    if unload_ok := await hass.config_entries.async_unload_platforms(
+        entry, coordinator.api.platforms
+    ):
         await coordinator.api.disconnect()
-        task = hass.data[DOMAIN][entry.entry_id].get("task")
-        if task is not None:
-            task.cancel()
-        task = hass.data[DOMAIN][entry.entry_id].get("loop")
-        if task is not None:
-            task.cancel()
         hass.data[DOMAIN].pop(entry.entry_id)
 
     return unload_ok
+
+
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Remove the device snapshot of a config entry."""
+    await WorltySnapshotStore(hass, entry.entry_id).async_remove()
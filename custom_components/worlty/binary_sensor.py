@@ -1,7 +1,5 @@
 """Worlty binary sensor."""
 
-from typing import Any
-
 from homeassistant.components.binary_sensor import BinarySensorEntity
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import Platform
@@ -10,6 +8,7 @@ from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
 from .const import DOMAIN
 from .coordinator import WorltyDataCoordinator
+from .devices import WorltyDeviceRecord
 from .worlty import WorltyBaseEntity
 
 
@@ -25,15 +24,17 @@ async def async_setup_entry(
         entities = [
             WorltyBinarySensor(coordinator.api, entity)
             for entity in coordinator.data.get(Platform.BINARY_SENSOR, {}).values()
-            if entity.get("hide") is not True
+            if not entity.hide
         ]
 
     async_add_entities(entities)
 
     @callback
-    def async_add_entity(entity: dict[str, Any]):
-        """Add entity from API."""
-        async_add_entities([WorltyBinarySensor(coordinator.api, entity)])
+    def async_add_entity(records: list[WorltyDeviceRecord]):
+        """Add the entities of new devices from API in one batch."""
+        async_add_entities(
+            [WorltyBinarySensor(coordinator.api, record) for record in records]
+        )
 
     coordinator.api.register_add_listener(Platform.BINARY_SENSOR, async_add_entity)
 
@@ -0,0 +1,42 @@
+"""Capability bitmask decoding for worlty integration."""
+
+from __future__ import annotations
+
+from collections.abc import Hashable, Mapping
+from types import MappingProxyType
+
+
+class WorltyBitmask:
+    """Decode capability bitmasks of one field, such as sm or ssw.
+
+    Every bit set in a mask selects the value mapped to that bit. A decoded
+    mask is kept as a tuple, so entities reporting the same mask share it
+    and the bits are only walked once per distinct mask.
+    """
+
+    def __init__(
+        self, mapping: Mapping[int, Hashable], base: tuple[Hashable, ...] = ()
+    ) -> None:
+        """Initialize."""
+        self.mapping = MappingProxyType(dict(mapping))
+        self._base = base
+        # The first key of a value wins, as with a scan of the mapping.
+        self._keys = MappingProxyType(
+            {value: key for key, value in reversed(self.mapping.items())}
+        )
+        self._decoded: dict[int, tuple[Hashable, ...]] = {}
+
+    def decode(self, mask: int) -> tuple[Hashable, ...]:
+        """Return the base values followed by the values of the bits in mask."""
+        values = self._decoded.get(mask)
+        if values is None:
+            found = list(self._base)
+            for bit, value in self.mapping.items():
+                if mask & (1 << bit) and value not in found:
+                    found.append(value)
+            values = self._decoded[mask] = tuple(found)
+        return values
+
+    def key(self, value: Hashable) -> int | None:
+        """Return the key of a mapped value."""
+        return self._keys.get(value)
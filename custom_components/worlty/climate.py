@@ -1,5 +1,6 @@
 """Worlty climate."""
 
+from functools import lru_cache
 from typing import Any
 
 from homeassistant.components.climate import (
@@ -31,8 +32,10 @@ from homeassistant.const import ATTR_TEMPERATURE, Platform, UnitOfTemperature
 from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
+from .capabilities import WorltyBitmask
 from .const import DOMAIN
 from .coordinator import WorltyDataCoordinator
+from .devices import WorltyDeviceRecord
 from .worlty import WorltyBaseEntity
 
 HVAC_MODE_MAPPING = {
@@ -83,37 +86,52 @@ CLIMATE_ACTION_MAPPING = {
     10: HVACAction.IDLE,
 }
 
+HVAC_MODES = WorltyBitmask(HVAC_MODE_MAPPING, (HVACMode.OFF,))
+PRESET_MODES = WorltyBitmask(PRESET_MODE_MAPPING, (PRESET_NONE,))
+FAN_MODES = WorltyBitmask(FAN_MODE_MAPPING)
+SWING_MODES = WorltyBitmask(SWING_MODE_MAPPING)
+
 
 def hvac_mode_to_key(hvac_mode: HVACMode) -> int | None:
     """Convert hvac mode value to mode key."""
-    for key, mode in HVAC_MODE_MAPPING.items():
-        if mode == hvac_mode:
-            return key
-    return None
+    return HVAC_MODES.key(hvac_mode)
 
 
 def fan_mode_to_key(fan_mode: str) -> int | None:
     """Convert fan mode value to mode key."""
-    for key, mode in FAN_MODE_MAPPING.items():
-        if mode == fan_mode:
-            return key
-    return None
+    return FAN_MODES.key(fan_mode)
 
 
 def preset_mode_to_key(preset_mode: str) -> int | None:
     """Convert preset mode value to mode key."""
-    for key, mode in PRESET_MODE_MAPPING.items():
-        if mode == preset_mode:
-            return key
-    return None
+    return PRESET_MODES.key(preset_mode)
 
 
 def swing_mode_to_key(swing_mode: str) -> int | None:
     """Convert swing mode value to mode key."""
-    for key, mode in SWING_MODE_MAPPING.items():
-        if mode == swing_mode:
-            return key
-    return None
+    return SWING_MODES.key(swing_mode)
+
+
+@lru_cache(maxsize=None)
+def climate_capabilities(
+    sm: int, sf: int, ssw: int
+) -> tuple[
+    tuple[HVACMode, ...], tuple[str, ...], tuple[str, ...], tuple[str, ...], ClimateEntityFeature
+]:
+    """Return hvac, preset, fan and swing modes and features of the masks."""
+    preset_modes = PRESET_MODES.decode(sm)
+    fan_modes = FAN_MODES.decode(sf)
+    swing_modes = SWING_MODES.decode(ssw)
+
+    features = ClimateEntityFeature.TURN_ON
+    features |= ClimateEntityFeature.TURN_OFF
+    if len(preset_modes) > 1:
+        features |= ClimateEntityFeature.PRESET_MODE
+    if len(fan_modes) > 0:
+        features |= ClimateEntityFeature.FAN_MODE
+    if len(swing_modes) > 0:
+        features |= ClimateEntityFeature.SWING_MODE
+    return HVAC_MODES.decode(sm), preset_modes, fan_modes, swing_modes, features
 
 
 async def async_setup_entry(
@@ -128,15 +146,17 @@ async def async_setup_entry(
         entities = [
             WorltyClimate(coordinator.api, entity)
             for entity in coordinator.data.get(Platform.CLIMATE, {}).values()
-            if entity.get("hide") is not True
+            if not entity.hide
         ]
 
     async_add_entities(entities)
 
     @callback
-    def async_add_entity(entity: dict[str, Any]):
-        """Add entity from API."""
-        async_add_entities([WorltyClimate(coordinator.api, entity)])
+    def async_add_entity(records: list[WorltyDeviceRecord]):
+        """Add the entities of new devices from API in one batch."""
+        async_add_entities(
+            [WorltyClimate(coordinator.api, record) for record in records]
+        )
 
     coordinator.api.register_add_listener(Platform.CLIMATE, async_add_entity)
 
@@ -145,10 +165,10 @@ class WorltyClimate(WorltyBaseEntity, ClimateEntity):
     """Worlty climate."""
 
     _supported_features: ClimateEntityFeature
-    _hvac_modes: list[HVACMode]
-    _preset_modes: list[str]
-    _fan_modes: list[str]
-    _swing_modes: list[str]
+    _hvac_modes: tuple[HVACMode, ...]
+    _preset_modes: tuple[str, ...]
+    _fan_modes: tuple[str, ...]
+    _swing_modes: tuple[str, ...]
 
     def __init__(self, worlty_coordinator, worlty_entity_info) -> None:
         """Initialize the entity."""
@@ -164,47 +184,17 @@ class WorltyClimate(WorltyBaseEntity, ClimateEntity):
     @callback
     def _update_entity(self) -> None:
         """Update entity."""
-        self._supported_features = 0
-        self._hvac_modes = [HVACMode.OFF]
-        self._preset_modes = [PRESET_NONE]
-        self._fan_modes = []
-        self._swing_modes = []
-
-        sm = self.worlty_attribute.get("sm", 0)
-        for mode_bit, hvac_mode in HVAC_MODE_MAPPING.items():
-            if sm & (1 << mode_bit) and hvac_mode not in self._hvac_modes:
-                self._hvac_modes.append(hvac_mode)
-
-        for preset_bit, preset_mode in PRESET_MODE_MAPPING.items():
-            if sm & (1 << preset_bit) and preset_mode not in self._preset_modes:
-                self._preset_modes.append(preset_mode)
-
-        sf = self.worlty_attribute.get("sf", 0)
-        for fan_bit, fan_mode in FAN_MODE_MAPPING.items():
-            if sf & (1 << fan_bit) and fan_mode not in self._fan_modes:
-                self._fan_modes.append(fan_mode)
-
-        ssw = self.worlty_attribute.get("ssw", 0)
-        for swing_bit, swing_mode in SWING_MODE_MAPPING.items():
-            if ssw & (1 << swing_bit) and swing_mode not in self._swing_modes:
-                self._swing_modes.append(swing_mode)
-
-        tt, tc = self.target_temperature, self.current_temperature
-        ht, hc = self.target_humidity, self.current_humidity
-
-        features = ClimateEntityFeature.TURN_ON
-        features |= ClimateEntityFeature.TURN_OFF
-        if tt is not None or tc is not None:
-            features |= ClimateEntityFeature.TARGET_TEMPERATURE
-        if ht is not None or hc is not None:
-            features |= ClimateEntityFeature.TARGET_HUMIDITY
-        if len(self._preset_modes) > 1:
-            features |= ClimateEntityFeature.PRESET_MODE
-        if len(self._fan_modes) > 0:
-            features |= ClimateEntityFeature.FAN_MODE
-        if len(self._swing_modes) > 0:
-            features |= ClimateEntityFeature.SWING_MODE
-        self._supported_features = features
+        (
+            self._hvac_modes,
+            self._preset_modes,
+            self._fan_modes,
+            self._swing_modes,
+            self._supported_features,
+        ) = climate_capabilities(
+            self.worlty_attribute.get("sm", 0),
+            self.worlty_attribute.get("sf", 0),
+            self.worlty_attribute.get("ssw", 0),
+        )
 
     @property
     def hvac_action(self) -> HVACAction:
@@ -277,7 +267,13 @@ class WorltyClimate(WorltyBaseEntity, ClimateEntity):
     @property
     def supported_features(self) -> ClimateEntityFeature:
         """Return the list of supported features."""
-        return self._supported_features
+        # Temperature and humidity follow the reported fields, not the masks.
+        features = self._supported_features
+        if self.target_temperature is not None or self.current_temperature is not None:
+            features |= ClimateEntityFeature.TARGET_TEMPERATURE
+        if self.target_humidity is not None or self.current_humidity is not None:
+            features |= ClimateEntityFeature.TARGET_HUMIDITY
+        return features
 
     @property
     def temperature_unit(self) -> UnitOfTemperature:
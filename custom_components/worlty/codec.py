@@ -0,0 +1,125 @@
+"""Framing and JSON codec for worlty integration."""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+import json
+from typing import Any
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+READ_CHUNK_SIZE = 65536
+MAX_FRAME_SIZE = 16 * 1024 * 1024
+OFFLOAD_FRAME_SIZE = 256 * 1024
+# 패드와 주고받는 프레임은 모두 줄바꿈으로 끝난다.
+FRAME_DELIMITER = b"\n"
+
+
+class WorltyCodec:
+    """JSON codec working on bytes."""
+
+    def __init__(
+        self,
+        name: str,
+        loads: Callable[[bytes], Any],
+        dumps: Callable[[Any], bytes],
+    ) -> None:
+        """Initialize."""
+        self.name = name
+        self.loads = loads
+        self.dumps = dumps
+
+    def __repr__(self) -> str:
+        """Return a string representation of the codec."""
+        return f"WorltyCodec({self.name})"
+
+
+JSON_CODEC = WorltyCodec("json", json.loads, lambda obj: json.dumps(obj).encode())
+ORJSON_CODEC = (
+    WorltyCodec("orjson", orjson.loads, orjson.dumps) if orjson is not None else None
+)
+
+
+def get_codec(name: str | None = None) -> WorltyCodec:
+    """Return the codec by name, orjson when installed by default."""
+    if name == JSON_CODEC.name or ORJSON_CODEC is None:
+        return JSON_CODEC
+    return ORJSON_CODEC
+
+
+class FrameTooLarge(Exception):
+    """Frame exceeded the maximum frame size."""
+
+
+class WorltyFrameDecoder:
+    """Split a byte stream into newline delimited frames.
+
+    Frames are sliced straight out of the receive buffer, there is no line
+    length limit other than max_frame_size and partial frames are kept until
+    the rest arrives.
+    """
+
+    def __init__(self, max_frame_size: int = MAX_FRAME_SIZE) -> None:
+        """Initialize."""
+        self._buffer = bytearray()
+        self._scanned = 0
+        self._discard = False
+        self._max_frame_size = max_frame_size
+        self.bytes_received = 0
+        self.frames = 0
+        self.max_frame = 0
+        self.oversized = 0
+
+    def feed(self, data: bytes) -> None:
+        """Append received bytes."""
+        self.bytes_received += len(data)
+        self._buffer += data
+
+    def next_frame(self) -> bytes | None:
+        """Return the next complete frame or None if more data is needed.
+
+        Raises FrameTooLarge once for a frame above max_frame_size, the rest
+        of that frame is skipped.
+        """
+        while True:
+            end = self._buffer.find(FRAME_DELIMITER, self._scanned)
+            if end < 0:
+                self._scanned = len(self._buffer)
+                if self._scanned > self._max_frame_size:
+                    self._buffer.clear()
+                    self._scanned = 0
+                    if not self._discard:
+                        self._discard = True
+                        self.oversized += 1
+                        raise FrameTooLarge
+                return None
+
+            with memoryview(self._buffer) as view:
+                frame = view[:end].tobytes()
+            del self._buffer[: end + 1]
+            self._scanned = 0
+            if self._discard:
+                self._discard = False
+                continue
+            if not frame or frame.isspace():
+                continue
+            if end > self._max_frame_size:
+                self.oversized += 1
+                raise FrameTooLarge
+
+            self.frames += 1
+            self.max_frame = max(self.max_frame, end)
+            return frame
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return decoder metrics."""
+        return {
+            "bytes_received": self.bytes_received,
+            "frames": self.frames,
+            "max_frame": self.max_frame,
+            "oversized": self.oversized,
+            "buffered": len(self._buffer),
+        }
@@ -0,0 +1,222 @@
+"""Command acknowledgement tracking for worlty integration."""
+
+from __future__ import annotations
+
+from collections import deque
+import time
+from typing import Any
+
+from .const import WorltyBaseType
+
+ACK_TIMEOUT = 5.0  # 초
+ACK_RETRIES = 1
+RTT_SAMPLES = 200
+
+
+def worlty_type_name(worlty_type: Any) -> str:
+    """Return the name used to group latency samples."""
+    try:
+        return WorltyBaseType(worlty_type).name.lower()
+    except ValueError:
+        return str(worlty_type)
+
+
+def percentile(samples: list[float], pct: float) -> float:
+    """Return the nearest rank percentile of sorted samples."""
+    if not samples:
+        return 0.0
+    return samples[min(len(samples) - 1, int(len(samples) * pct / 100))]
+
+
+class WorltyCommand:
+    """Command waiting for the pad to report the requested fields."""
+
+    __slots__ = (
+        "attempts",
+        "deadline",
+        "fields",
+        "kind",
+        "lct",
+        "mismatched",
+        "pk",
+        "sent",
+        "seq",
+    )
+
+    def __init__(
+        self,
+        seq: int,
+        pk: int,
+        fields: dict[str, Any],
+        kind: str,
+        timeout: float,
+        lct: int = 0,
+    ) -> None:
+        """Initialize."""
+        self.seq = seq
+        self.pk = pk
+        self.fields = fields
+        self.kind = kind
+        # 전송 시점 레코드의 lct, 패드 시계 기준으로 비교한다.
+        self.lct = lct
+        self.sent = time.monotonic()
+        self.deadline = self.sent + timeout
+        self.attempts = 1
+        self.mismatched = False
+
+    def __repr__(self) -> str:
+        """Return a string representation of the command."""
+        return f"WorltyCommand(seq={self.seq}, pk={self.pk}, fields={self.fields}, attempts={self.attempts})"
+
+
+class WorltyCommandTracker:
+    """Match sent commands against the next state change of their pk.
+
+    Fields of a parent device are compared with its payload or stt, a field
+    named after a child cid with the stt of that child. A command is
+    acknowledged once every field was reported with the requested value.
+    Only a frame newer than the record the command was sent against marks
+    it mismatched, older frames were already in flight.
+    """
+
+    def __init__(
+        self, timeout: float = ACK_TIMEOUT, retries: int = ACK_RETRIES
+    ) -> None:
+        """Initialize."""
+        self._timeout = timeout
+        self._retries = retries
+        self._pending: dict[int, WorltyCommand] = {}
+        self._rtt: dict[str, deque[float]] = {}
+        self._seq = 0
+        self.sent_count = 0
+        self.acked = 0
+        self.retried = 0
+        self.failed = 0
+        self.superseded = 0
+
+    def __len__(self) -> int:
+        """Return the number of pending commands."""
+        return len(self._pending)
+
+    @property
+    def next_deadline(self) -> float | None:
+        """Return the earliest deadline of the pending commands."""
+        if not self._pending:
+            return None
+        return min(command.deadline for command in self._pending.values())
+
+    def sent(
+        self, pk: int, fields: dict[str, Any], worlty_type: Any, lct: int = 0
+    ) -> WorltyCommand:
+        """Track a command published for pk against a record of lct."""
+        self._seq += 1
+        self.sent_count += 1
+        command = WorltyCommand(
+            self._seq,
+            pk,
+            dict(fields),
+            worlty_type_name(worlty_type),
+            self._timeout,
+            lct,
+        )
+        older = self._pending.get(pk)
+        if older is not None:
+            # The pad is expected to end up with the union of both commands.
+            self.superseded += 1
+            command.fields = {**older.fields, **command.fields}
+        self._pending[pk] = command
+        return command
+
+    def match(self, device: dict[str, Any]) -> WorltyCommand | None:
+        """Check an updated device, return the command it acknowledged."""
+        command = self._pending.get(device.get("pk"))
+        if command is None:
+            return None
+
+        payload = device.get("payload") or {}
+        # A frame changed before the command was sent can not contradict it.
+        lct = device.get("lct")
+        current = lct is not None and lct > command.lct
+        children = None
+        for field, value in list(command.fields.items()):
+            if field in payload:
+                reported = payload[field]
+            elif field == "stt":
+                reported = device.get("stt")
+            else:
+                if children is None:
+                    children = {
+                        child.get("cid"): child for child in device.get("children", [])
+                    }
+                child = children.get(field)
+                if child is None:
+                    continue
+                reported = child.get("stt")
+
+            if reported == value:
+                del command.fields[field]
+            elif current:
+                command.mismatched = True
+
+        if command.fields:
+            return None
+
+        del self._pending[command.pk]
+        self.acked += 1
+        self._rtt.setdefault(command.kind, deque(maxlen=RTT_SAMPLES)).append(
+            time.monotonic() - command.sent
+        )
+        return command
+
+    def get(self, pk: int) -> WorltyCommand | None:
+        """Return the pending command for pk."""
+        return self._pending.get(pk)
+
+    def expired(self) -> tuple[list[WorltyCommand], list[WorltyCommand]]:
+        """Return the commands to retry and the commands given up on."""
+        now = time.monotonic()
+        retry: list[WorltyCommand] = []
+        failed: list[WorltyCommand] = []
+        for command in list(self._pending.values()):
+            if command.deadline > now:
+                continue
+            if command.attempts <= self._retries:
+                command.attempts += 1
+                command.deadline = now + self._timeout
+                self.retried += 1
+                retry.append(command)
+            else:
+                del self._pending[command.pk]
+                self.failed += 1
+                failed.append(command)
+        return retry, failed
+
+    def clear(self) -> None:
+        """Forget every pending command."""
+        self._pending.clear()
+
+    def rtt(self, kind: str | None = None) -> dict[str, float]:
+        """Return round trip percentiles in seconds for a type or all types."""
+        if kind is None:
+            samples = sorted(value for rtt in self._rtt.values() for value in rtt)
+        else:
+            samples = sorted(self._rtt.get(kind, ()))
+        return {
+            "count": len(samples),
+            "p50": round(percentile(samples, 50), 4),
+            "p95": round(percentile(samples, 95), 4),
+            "p99": round(percentile(samples, 99), 4),
+            "max": round(samples[-1], 4) if samples else 0.0,
+        }
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return tracker metrics."""
+        return {
+            "pending": len(self._pending),
+            "sent": self.sent_count,
+            "acked": self.acked,
+            "retried": self.retried,
+            "failed": self.failed,
+            "superseded": self.superseded,
+            "rtt": {kind: self.rtt(kind) for kind in self._rtt},
+        }
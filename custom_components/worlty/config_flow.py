@@ -7,12 +7,34 @@ from typing import Any
 import voluptuous as vol
 
 from homeassistant.components import onboarding
-from homeassistant.config_entries import ConfigFlow, ConfigFlowResult
+from homeassistant.config_entries import (
+    ConfigEntry,
+    ConfigFlow,
+    ConfigFlowResult,
+    OptionsFlow,
+)
 from homeassistant.const import CONF_ACCESS_TOKEN, CONF_HOST, CONF_IP_ADDRESS, CONF_PORT
+from homeassistant.core import callback
 from homeassistant.helpers.service_info.zeroconf import ZeroconfServiceInfo
 import homeassistant.helpers.config_validation as cv
 
-from .const import DOMAIN, LOGGER, MANUFACTURER
+from .const import (
+    CONF_OPTIMISTIC,
+    CONF_PING_INTERVAL,
+    CONF_RESYNC_BATCH,
+    CONF_SNAPSHOT_INTERVAL,
+    CONF_WRITE_BUDGET,
+    CONF_WRITE_INTERVAL,
+    DEFAULT_OPTIMISTIC,
+    DEFAULT_PING_INTERVAL,
+    DEFAULT_RESYNC_BATCH,
+    DEFAULT_SNAPSHOT_INTERVAL,
+    DEFAULT_WRITE_BUDGET,
+    DEFAULT_WRITE_INTERVAL,
+    DOMAIN,
+    LOGGER,
+    MANUFACTURER,
+)
 from .worlty import WorltyLocal
 
 
@@ -23,6 +45,12 @@ class WorltyFlowHandler(ConfigFlow, domain=DOMAIN):
 
     _device: list[str, int]
 
+    @staticmethod
+    @callback
+    def async_get_options_flow(config_entry: ConfigEntry) -> OptionsFlow:
+        """Get the options flow for this handler."""
+        return WorltyOptionsFlow()
+
     async def async_step_user(
         self, user_input: dict[str, Any] | None = None
     ) -> ConfigFlowResult:
@@ -34,11 +62,10 @@ class WorltyFlowHandler(ConfigFlow, domain=DOMAIN):
                 user_input.get(CONF_IP_ADDRESS),
                 user_input.get(CONF_PORT),
                 user_input.get(CONF_ACCESS_TOKEN),
-                None,
             )
             auth, message = await api.auth(None)
+            api.terminate()
             if auth is True:
-                api.terminate()
                 await self.async_set_unique_id(message.get("device_id"))
                 self._abort_if_unique_id_configured(
                     updates={
@@ -113,3 +140,49 @@ class WorltyFlowHandler(ConfigFlow, domain=DOMAIN):
             step_id="discovery_confirm",
             description_placeholders=placeholders,
         )
+
+
+class WorltyOptionsFlow(OptionsFlow):
+    """Handle Worlty options."""
+
+    async def async_step_init(
+        self, user_input: dict[str, Any] | None = None
+    ) -> ConfigFlowResult:
+        """Manage the options."""
+        if user_input is not None:
+            return self.async_create_entry(data=user_input)
+
+        options = self.config_entry.options
+        return self.async_show_form(
+            step_id="init",
+            data_schema=vol.Schema(
+                {
+                    vol.Required(
+                        CONF_OPTIMISTIC,
+                        default=options.get(CONF_OPTIMISTIC, DEFAULT_OPTIMISTIC),
+                    ): cv.boolean,
+                    vol.Required(
+                        CONF_SNAPSHOT_INTERVAL,
+                        default=options.get(
+                            CONF_SNAPSHOT_INTERVAL, DEFAULT_SNAPSHOT_INTERVAL
+                        ),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=5, max=3600)),
+                    vol.Required(
+                        CONF_WRITE_INTERVAL,
+                        default=options.get(CONF_WRITE_INTERVAL, DEFAULT_WRITE_INTERVAL),
+                    ): vol.All(vol.Coerce(float), vol.Range(min=0, max=5)),
+                    vol.Required(
+                        CONF_WRITE_BUDGET,
+                        default=options.get(CONF_WRITE_BUDGET, DEFAULT_WRITE_BUDGET),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=0, max=10000)),
+                    vol.Required(
+                        CONF_RESYNC_BATCH,
+                        default=options.get(CONF_RESYNC_BATCH, DEFAULT_RESYNC_BATCH),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=1, max=1000)),
+                    vol.Required(
+                        CONF_PING_INTERVAL,
+                        default=options.get(CONF_PING_INTERVAL, DEFAULT_PING_INTERVAL),
+                    ): vol.All(vol.Coerce(float), vol.Range(min=0, max=300)),
+                }
+            ),
+        )
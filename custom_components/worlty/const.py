@@ -2,8 +2,10 @@
 
 from __future__ import annotations
 
-from enum import Enum
+from datetime import timedelta, timezone
+from enum import Enum, StrEnum
 import logging
+from types import MappingProxyType
 from typing import Any
 
 from homeassistant.components.binary_sensor import BinarySensorDeviceClass
@@ -33,6 +35,47 @@ MANUFACTURER = "Worlty"
 
 LOGGER = logging.getLogger(__package__)
 
+# 플랫폼 모듈이 있는 HA 플랫폼, 나머지는 엔티티를 만들지 않는다.
+PLATFORMS: list[Platform] = [
+    Platform.BINARY_SENSOR,
+    Platform.CLIMATE,
+    Platform.FAN,
+    Platform.LIGHT,
+    Platform.SENSOR,
+    Platform.SWITCH,
+    Platform.WATER_HEATER,
+    Platform.NUMBER,
+    Platform.TIME,
+    Platform.DATE,
+]
+
+# 패드는 한국 표준시로 시각을 보낸다.
+WORLTY_TIMEZONE = timezone(timedelta(hours=9))
+
+CONF_SNAPSHOT_INTERVAL = "snapshot_interval"
+DEFAULT_SNAPSHOT_INTERVAL = 30  # 초
+CONF_OPTIMISTIC = "optimistic"
+DEFAULT_OPTIMISTIC = False
+CONF_WRITE_INTERVAL = "write_interval"
+DEFAULT_WRITE_INTERVAL = 0.0  # 초, 0이면 루프 한 바퀴마다 기록
+CONF_WRITE_BUDGET = "write_budget"
+DEFAULT_WRITE_BUDGET = 0  # 0이면 제한 없음
+CONF_RESYNC_BATCH = "resync_batch"
+DEFAULT_RESYNC_BATCH = 50  # 한 get 요청에 담을 장치 수
+CONF_PING_INTERVAL = "ping_interval"
+DEFAULT_PING_INTERVAL = 0.0  # 초, 0이면 핑을 보내지 않음
+
+
+class WorltyConnectionState(StrEnum):
+    """Worlty connection supervisor state."""
+
+    STOPPED = "stopped"
+    CONNECTING = "connecting"
+    AUTHENTICATING = "authenticating"
+    SYNCING = "syncing"
+    LIVE = "live"
+    BACKOFF = "backoff"
+
 
 class WorltyBaseType(Enum):
     """Worlty entity type."""
@@ -48,179 +91,180 @@ class WorltyBaseType(Enum):
     COVER = 9
 
 
-def map_worlty_state(lang, state) -> Any:
-    """Map for worlty sub id."""
-    return (
+def _freeze(table: dict) -> MappingProxyType:
+    """Return a read only view of a nested lookup table."""
+    return MappingProxyType(
         {
-            "en": {
-                "high": "High",
-                "medium": "Medium",
-                "low": "Low",
-                "auto": "Auto",
-                "weak": "Weak",
-                "boost": "Boost",
-                "eco": "Eco",
-                "arrive": "Arrive",
-                "call": "Call",
-                "detect": "Detect",
-                "down": "Down",
-                "idle": "idle",
-                "left": "Left",
-                "move": "Move",
-                "open": "Open",
-                "right": "Right",
-                "ring": "Ring",
-                "up": "Up",
-                "wait": "Wait",
-            },
-            "ko": {
-                "high": "강",
-                "medium": "중",
-                "low": "약",
-                "auto": "자동",
-                "weak": "최저",
-                "boost": "최고",
-                "eco": "절전",
-                "arrive": "도착",
-                "call": "통화",
-                "detect": "감지",
-                "down": "아래쪽",
-                "idle": "대기",
-                "left": "왼쪽",
-                "move": "이동",
-                "open": "열기",
-                "right": "오른쪽",
-                "ring": "벨소리",
-                "up": "위쪽",
-                "wait": "기다림",
-            },
+            key: _freeze(value) if isinstance(value, dict) else value
+            for key, value in table.items()
         }
-        .get(lang, {})
-        .get(state, state)
     )
 
 
-def map_worlty_sub(lang, sub_id) -> str:
-    """Map for worlty sub id."""
-    return (
-        {
-            "en": {
-                "ctrl_mode": "Controller Mode",
-                "ctrl_speed": "Controller Speed",
-                "target_speed": "Worlty Speed",
-                "blr-err": "Boiler Error",
-                "front": "Front of Door",
-                "event": "Event",
-                "cook": "GasValve",
-                "bell": "Bell",
-                "light": "Light",
-                "outlet": "Outlet",
-                "away": "Away",
-                "fire_alert": "Fire Alert",
-                "filter_alert": "Filter Alert",
-                "filter_use": "Filter InUse",
-                "gas_leak": "Gas Leak",
-                "consumption": "Total Consumption",
-                "usage": "Usage",
-                "elevator": "Elevator",
-                "direction": "Elevator Direction",
-                "floor": "Elevator Floor",
-                "location": "Location",
-                "apt-0": "APT Gate Alarm",
-                "apt-1": "APT Gate Opend",
-                "apt-2": "APT Gate(book open)",
-                "apt-3": "APT Gate(book shutdown)",
-                "apt-4": "APT Gate(always shutdown)",
-                "home-0": "Home Gate Alarm",
-                "home-1": "Home Gate Open",
-                "home-2": "Home Gate(book open)",
-                "home-3": "Home Gate(book shutdown)",
-                "home-4": "Home Gate(always shutdown)",
-                "timer": "Timer",
-                "interval_ms": "Timer Interval",
-                "running_min_ms": "Minimun Run Time",
-                "running_ms": "Timer Run Time",
-                "start_time": "Timer Start Time",
-                "end_time": "Timer End Time",
-                "start_date": "Timer Start Date",
-                "end_date": "Timer End Date",
-                "temp_offset": "Current Temperature Offset",
-                "temp_target": "Target Temperature",
-                "last_execute": "Timer Last Execute Time",
-                "worlty": "WorltyControl",
-                "worlty_offset": "WorltyControl Offset",
-                "worlty_run_ms": "WorltyControl Run Time",
-                "water_in": "Water Input",
-                "water_out": "Water Output",
-                "bypass": "Bypass State",
-                "bypasser": "Bypass Control",
-                "heater": "Heater",
-                "purifier": "Purifier",
-                "purify": "Purifier State",
-            },
-            "ko": {
-                "ctrl_mode": "리모컨모드",
-                "ctrl_speed": "리모컨속도",
-                "target_speed": "월티속도",
-                "blr-err": "보일러에러",
-                "front": "현관앞",
-                "event": "이벤트",
-                "cook": "가스밸브",
-                "bell": "초인종",
-                "light": "조명",
-                "outlet": "콘센트",
-                "away": "외출",
-                "fire_alert": "화재감지",
-                "filter_alert": "필터 경고",
-                "filter_use": "필터 사용",
-                "gas_leak": "가스누출",
-                "consumption": "누적 소비전력",
-                "usage": "소비전력",
-                "elevator": "엘리베이터",
-                "direction": "엘리베이터 방향",
-                "floor": "엘리베이터 층",
-                "location": "위치",
-                "apt-0": "공동현관 알람",
-                "apt-1": "공동현관 열기",
-                "apt-2": "공동현관(예약열기)",
-                "apt-3": "공동현관(예약종료)",
-                "apt-4": "공동현관(항상종료)",
-                "home-0": "세대현관 알람",
-                "home-1": "세대현관 열기",
-                "home-2": "세대현관(예약열기)",
-                "home-3": "세대현관(예약종료)",
-                "home-4": "세대현관(항상종료)",
-                "timer": "타이머",
-                "interval_ms": "타이머 작동간격",
-                "running_min_ms": "최소 작동 시간",
-                "running_ms": "타이머 작동시간",
-                "start_time": "타이머 시작시간",
-                "end_time": "타이머 종료시간",
-                "start_date": "타이머 시작일자",
-                "end_date": "타이머 종료일자",
-                "temp_offset": "현재온도 오프셋",
-                "temp_target": "목표온도",
-                "last_execute": "타이머 최근 작동시각",
-                "worlty": "월티제어",
-                "worlty_offset": "월티제어 오프셋",
-                "worlty_run_ms": "월티제어 작동시간",
-                "water_in": "출수",
-                "water_out": "환수",
-                "bypass": "바이패스 상태",
-                "bypasser": "바이패스 제어",
-                "heater": "전열",
-                "purifier": "청정기능",
-                "purify": "청정상태",
-            },
-        }
-        .get(lang, {})
-        .get(sub_id, sub_id)
-    )
+WORLTY_STATES = _freeze(
+    {
+        "en": {
+            "high": "High",
+            "medium": "Medium",
+            "low": "Low",
+            "auto": "Auto",
+            "weak": "Weak",
+            "boost": "Boost",
+            "eco": "Eco",
+            "arrive": "Arrive",
+            "call": "Call",
+            "detect": "Detect",
+            "down": "Down",
+            "idle": "idle",
+            "left": "Left",
+            "move": "Move",
+            "open": "Open",
+            "right": "Right",
+            "ring": "Ring",
+            "up": "Up",
+            "wait": "Wait",
+        },
+        "ko": {
+            "high": "강",
+            "medium": "중",
+            "low": "약",
+            "auto": "자동",
+            "weak": "최저",
+            "boost": "최고",
+            "eco": "절전",
+            "arrive": "도착",
+            "call": "통화",
+            "detect": "감지",
+            "down": "아래쪽",
+            "idle": "대기",
+            "left": "왼쪽",
+            "move": "이동",
+            "open": "열기",
+            "right": "오른쪽",
+            "ring": "벨소리",
+            "up": "위쪽",
+            "wait": "기다림",
+        },
+    }
+)
 
 
-def map_worlty_to_platform(worlty_type, worlty_class) -> str:
-    """Map for Worlty type to Platform."""
-    mapping = {
+WORLTY_SUBS = _freeze(
+    {
+        "en": {
+            "ctrl_mode": "Controller Mode",
+            "ctrl_speed": "Controller Speed",
+            "target_speed": "Worlty Speed",
+            "blr-err": "Boiler Error",
+            "front": "Front of Door",
+            "event": "Event",
+            "cook": "GasValve",
+            "bell": "Bell",
+            "light": "Light",
+            "outlet": "Outlet",
+            "away": "Away",
+            "fire_alert": "Fire Alert",
+            "filter_alert": "Filter Alert",
+            "filter_use": "Filter InUse",
+            "gas_leak": "Gas Leak",
+            "consumption": "Total Consumption",
+            "usage": "Usage",
+            "elevator": "Elevator",
+            "direction": "Elevator Direction",
+            "floor": "Elevator Floor",
+            "location": "Location",
+            "apt-0": "APT Gate Alarm",
+            "apt-1": "APT Gate Opend",
+            "apt-2": "APT Gate(book open)",
+            "apt-3": "APT Gate(book shutdown)",
+            "apt-4": "APT Gate(always shutdown)",
+            "home-0": "Home Gate Alarm",
+            "home-1": "Home Gate Open",
+            "home-2": "Home Gate(book open)",
+            "home-3": "Home Gate(book shutdown)",
+            "home-4": "Home Gate(always shutdown)",
+            "timer": "Timer",
+            "interval_ms": "Timer Interval",
+            "running_min_ms": "Minimun Run Time",
+            "running_ms": "Timer Run Time",
+            "start_time": "Timer Start Time",
+            "end_time": "Timer End Time",
+            "start_date": "Timer Start Date",
+            "end_date": "Timer End Date",
+            "temp_offset": "Current Temperature Offset",
+            "temp_target": "Target Temperature",
+            "last_execute": "Timer Last Execute Time",
+            "worlty": "WorltyControl",
+            "worlty_offset": "WorltyControl Offset",
+            "worlty_run_ms": "WorltyControl Run Time",
+            "water_in": "Water Input",
+            "water_out": "Water Output",
+            "bypass": "Bypass State",
+            "bypasser": "Bypass Control",
+            "heater": "Heater",
+            "purifier": "Purifier",
+            "purify": "Purifier State",
+        },
+        "ko": {
+            "ctrl_mode": "리모컨모드",
+            "ctrl_speed": "리모컨속도",
+            "target_speed": "월티속도",
+            "blr-err": "보일러에러",
+            "front": "현관앞",
+            "event": "이벤트",
+            "cook": "가스밸브",
+            "bell": "초인종",
+            "light": "조명",
+            "outlet": "콘센트",
+            "away": "외출",
+            "fire_alert": "화재감지",
+            "filter_alert": "필터 경고",
+            "filter_use": "필터 사용",
+            "gas_leak": "가스누출",
+            "consumption": "누적 소비전력",
+            "usage": "소비전력",
+            "elevator": "엘리베이터",
+            "direction": "엘리베이터 방향",
+            "floor": "엘리베이터 층",
+            "location": "위치",
+            "apt-0": "공동현관 알람",
+            "apt-1": "공동현관 열기",
+            "apt-2": "공동현관(예약열기)",
+            "apt-3": "공동현관(예약종료)",
+            "apt-4": "공동현관(항상종료)",
+            "home-0": "세대현관 알람",
+            "home-1": "세대현관 열기",
+            "home-2": "세대현관(예약열기)",
+            "home-3": "세대현관(예약종료)",
+            "home-4": "세대현관(항상종료)",
+            "timer": "타이머",
+            "interval_ms": "타이머 작동간격",
+            "running_min_ms": "최소 작동 시간",
+            "running_ms": "타이머 작동시간",
+            "start_time": "타이머 시작시간",
+            "end_time": "타이머 종료시간",
+            "start_date": "타이머 시작일자",
+            "end_date": "타이머 종료일자",
+            "temp_offset": "현재온도 오프셋",
+            "temp_target": "목표온도",
+            "last_execute": "타이머 최근 작동시각",
+            "worlty": "월티제어",
+            "worlty_offset": "월티제어 오프셋",
+            "worlty_run_ms": "월티제어 작동시간",
+            "water_in": "출수",
+            "water_out": "환수",
+            "bypass": "바이패스 상태",
+            "bypasser": "바이패스 제어",
+            "heater": "전열",
+            "purifier": "청정기능",
+            "purify": "청정상태",
+        },
+    }
+)
+
+
+WORLTY_PLATFORMS = MappingProxyType(
+    {
         WorltyBaseType.BINARY_SENSOR.value: Platform.BINARY_SENSOR.value,
         WorltyBaseType.CLIMATE.value: Platform.CLIMATE.value,
         WorltyBaseType.COVER.value: Platform.COVER.value,
@@ -230,23 +274,12 @@ def map_worlty_to_platform(worlty_type, worlty_class) -> str:
         WorltyBaseType.SENSOR.value: Platform.SENSOR.value,
         WorltyBaseType.SWITCH.value: Platform.SWITCH.value,
     }
-    ha_type = mapping.get(worlty_type)
-    if worlty_type == WorltyBaseType.CLIMATE.value and worlty_class == 1:
-        ha_type = Platform.WATER_HEATER.value
-    elif worlty_type == WorltyBaseType.INPUT.value and worlty_class == 0:
-        ha_type = Platform.NUMBER.value
-    # elif worlty_type == WorltyBaseType.INPUT.value and worlty_class == 3:
-    #     ha_type = Platform.TIME.value
-    # elif worlty_type == WorltyBaseType.INPUT.value and worlty_class == 4:
-    #     ha_type = Platform.DATE.value
-    return ha_type
+)
 
 
-def get_worlty_description(worlty_device_type: int, worlty_device_class: int) -> tuple:
-    """Map for Worlty name to entity name."""
-    # key, device_class, icon, unit_of_measurement
-    unknown = (None, None, None, None)
-    descriptions = {
+# key, device_class, icon, unit_of_measurement
+WORLTY_DESCRIPTIONS = _freeze(
+    {
         WorltyBaseType.BINARY_SENSOR.value: {
             0: ("binary_sensor", None, None, None),
             1: (
@@ -837,5 +870,39 @@ def get_worlty_description(worlty_device_type: int, worlty_device_class: int) ->
                 None,
             ),
         },
-    }.get(worlty_device_type, {})
-    return descriptions.get(worlty_device_class, unknown)
+    }
+)
+
+_EMPTY = MappingProxyType({})
+_UNKNOWN_DESCRIPTION = (None, None, None, None)
+
+
+def map_worlty_state(lang, state) -> Any:
+    """Map for worlty sub id."""
+    return WORLTY_STATES.get(lang, _EMPTY).get(state, state)
+
+
+def map_worlty_sub(lang, sub_id) -> str:
+    """Map for worlty sub id."""
+    return WORLTY_SUBS.get(lang, _EMPTY).get(sub_id, sub_id)
+
+
+def map_worlty_to_platform(worlty_type, worlty_class) -> str:
+    """Map for Worlty type to Platform."""
+    ha_type = WORLTY_PLATFORMS.get(worlty_type)
+    if worlty_type == WorltyBaseType.CLIMATE.value and worlty_class == 1:
+        ha_type = Platform.WATER_HEATER.value
+    elif worlty_type == WorltyBaseType.INPUT.value and worlty_class == 0:
+        ha_type = Platform.NUMBER.value
+    # elif worlty_type == WorltyBaseType.INPUT.value and worlty_class == 3:
+    #     ha_type = Platform.TIME.value
+    # elif worlty_type == WorltyBaseType.INPUT.value and worlty_class == 4:
+    #     ha_type = Platform.DATE.value
+    return ha_type
+
+
+def get_worlty_description(worlty_device_type: int, worlty_device_class: int) -> tuple:
+    """Map for Worlty name to entity name."""
+    return WORLTY_DESCRIPTIONS.get(worlty_device_type, _EMPTY).get(
+        worlty_device_class, _UNKNOWN_DESCRIPTION
+    )
@@ -29,7 +29,6 @@ class WorltyDataCoordinator(DataUpdateCoordinator):
             self.entry.data.get(CONF_IP_ADDRESS),
             self.entry.data.get(CONF_PORT),
             self.entry.data.get(CONF_ACCESS_TOKEN),
-            self.async_event_handler,
         )
 
     async def _async_update_data(self) -> dict[Platform, dict[str, dict[str, Any]]]:
@@ -38,7 +37,3 @@ class WorltyDataCoordinator(DataUpdateCoordinator):
             return await self.api.get_worlty_devices()
         except Exception as err:
             raise UpdateFailed(err) from err
-
-    async def async_event_handler(self, event, data):
-        """Worlty event handler."""
-        self.async_update_listeners()
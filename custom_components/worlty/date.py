@@ -1,15 +1,15 @@
 """Worlty Input Date."""
 
-from datetime import date, datetime, timedelta, timezone
-from typing import Any
+from datetime import date, datetime
 from homeassistant.components.date import DateEntity
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import Platform
 from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
-from .const import DOMAIN
+from .const import DOMAIN, WORLTY_TIMEZONE
 from .coordinator import WorltyDataCoordinator
+from .devices import WorltyDeviceRecord
 from .worlty import WorltyBaseEntity
 
 
@@ -25,15 +25,17 @@ async def async_setup_entry(
         entities = [
             WorltyDate(coordinator.api, entity, hass)
             for entity in coordinator.data.get(Platform.DATE, {}).values()
-            if entity.get("hide") is not True
+            if not entity.hide
         ]
 
     async_add_entities(entities)
 
     @callback
-    def async_add_entity(entity: dict[str, Any]):
-        """Add entity from API."""
-        async_add_entities([WorltyDate(coordinator.api, entity, hass)])
+    def async_add_entity(records: list[WorltyDeviceRecord]):
+        """Add the entities of new devices from API in one batch."""
+        async_add_entities(
+            [WorltyDate(coordinator.api, record, hass) for record in records]
+        )
 
     coordinator.api.register_add_listener(Platform.DATE, async_add_entity)
 
@@ -49,25 +51,32 @@ class WorltyDate(WorltyBaseEntity, DateEntity):
         super().__init__(worlty_coordinator, worlty_entity_info, self._update_entity)
         self._update_entity()
 
+    _native_value: date | None
+
     @callback
     def _update_entity(self) -> None:
         """Update entity."""
 
+    def _update_state(self) -> None:
+        """Parse the state once per change."""
+        self._native_value = None
+        if isinstance(self.worlty_state, str):
+            try:
+                month, day = map(int, self.worlty_state.split("/"))
+                self._native_value = date(
+                    datetime.now(WORLTY_TIMEZONE).year, month, day
+                )
+            except ValueError:
+                pass
+
     @property
     def native_value(self) -> date | None:
         """Return the current date of the entity."""
         if self.worlty_state is None:
             return None
-
-        tz = timezone(timedelta(hours=9))
-        try:
-            state = self.worlty_state
-            if isinstance(state, str):
-                return datetime.strptime(state, "%m/%d").date(timezone=tz)
-
-            return date.today(timezone=tz)
-        except (ValueError, TypeError):
-            return None
+        if not isinstance(self.worlty_state, str):
+            return datetime.now(WORLTY_TIMEZONE).date()
+        return self._native_value
 
     async def async_set_value(self, value: date) -> None:
         """Update the date."""
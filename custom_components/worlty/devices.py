@@ -0,0 +1,261 @@
+"""Device record store for worlty integration."""
+
+from __future__ import annotations
+
+from collections import defaultdict
+from collections.abc import Iterable, Iterator
+from typing import TYPE_CHECKING, Any, Optional
+
+from .const import map_worlty_to_platform
+
+if TYPE_CHECKING:
+    from .worlty import WorltyBaseEntity
+
+
+class WorltyDeviceRecord:
+    """State of one pad device or child, shared with its entity."""
+
+    __slots__ = (
+        "cid",
+        "cls",
+        "did",
+        "entity",
+        "hide",
+        "lct",
+        "parent",
+        "payload",
+        "pk",
+        "platform",
+        "stt",
+        "type",
+        "unique_id",
+    )
+
+    def __init__(
+        self,
+        unique_id: str,
+        device: dict[str, Any],
+        parent: Optional[WorltyDeviceRecord],
+    ) -> None:
+        """Initialize."""
+        self.unique_id = unique_id
+        self.parent = parent
+        self.pk: int = device.get("pk", 0)
+        self.did: Optional[str] = device.get("did")
+        self.cid: Optional[str] = device.get("cid")
+        self.type: Optional[int] = device.get("type")
+        self.cls: Optional[int] = device.get("cls")
+        self.platform: Optional[str] = map_worlty_to_platform(self.type, self.cls)
+        self.lct: int = 0
+        self.stt: Any = None
+        self.hide = False
+        self.payload: dict[str, Any] = {}
+        self.entity: Optional[WorltyBaseEntity] = None
+        self.apply(device)
+
+    def __repr__(self) -> str:
+        """Return a string representation of the record."""
+        return f"WorltyDeviceRecord(id={self.unique_id}, lct={self.lct}, stt={self.stt})"
+
+    @property
+    def fk(self) -> int:
+        """Return the parent pk, 0 for a parent device."""
+        return self.parent.pk if self.parent is not None else 0
+
+    def is_stale(self, device: dict[str, Any]) -> bool:
+        """Return True if a frame is older than the record."""
+        lct = device.get("lct")
+        return lct is not None and lct < self.lct
+
+    def is_current(self, device: dict[str, Any]) -> bool:
+        """Return True if a frame carries nothing the record does not have.
+
+        lct has a resolution of one second, so a frame with the same lct is
+        only current when its values match too.
+        """
+        if device.get("lct", 0) > self.lct:
+            return False
+        if "stt" in device and device["stt"] != self.stt:
+            return False
+        if "hide" in device and (device["hide"] is True) != self.hide:
+            return False
+        payload = device.get("payload")
+        return not payload or payload.items() <= self.payload.items()
+
+    def apply(self, device: dict[str, Any]) -> set[str]:
+        """Merge a device frame, return the names of the fields it changed.
+
+        Payload fields keep their key, the record fields are reported as
+        lct, stt and hide.
+        """
+        changed: set[str] = set()
+        if "lct" in device and device["lct"] != self.lct:
+            self.lct = device["lct"]
+            changed.add("lct")
+        if "stt" in device and device["stt"] != self.stt:
+            self.stt = device["stt"]
+            changed.add("stt")
+        if "hide" in device and (device["hide"] is True) != self.hide:
+            self.hide = device["hide"] is True
+            changed.add("hide")
+
+        payload = device.get("payload")
+        if payload:
+            current = self.payload
+            for key, value in payload.items():
+                if key not in current or current[key] != value:
+                    current[key] = value
+                    changed.add(key)
+        return changed
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the record as a device frame for persistence.
+
+        The payload is copied, the frame may be serialized in the executor
+        while frames keep changing the record.
+        """
+        device = {
+            "pk": self.pk,
+            "type": self.type,
+            "cls": self.cls,
+            "lct": self.lct,
+            "stt": self.stt,
+            "payload": dict(self.payload),
+        }
+        if self.parent is None:
+            device["did"] = self.did
+        else:
+            device["cid"] = self.cid
+            device["fk"] = self.parent.pk
+        if self.hide:
+            device["hide"] = True
+        return device
+
+
+class WorltyDeviceStore:
+    """Every device record of a pad, indexed by pk, child, platform and unique id."""
+
+    def __init__(self, device_id: str = "") -> None:
+        """Initialize."""
+        self.device_id = device_id
+        self._by_unique_id: dict[str, WorltyDeviceRecord] = {}
+        self._by_pk: dict[int, WorltyDeviceRecord] = {}
+        self._by_child: dict[tuple[int, str], WorltyDeviceRecord] = {}
+        self.by_platform: dict[str, dict[str, WorltyDeviceRecord]] = defaultdict(dict)
+        self.applied = 0
+        self.stale = 0
+        self.duplicates = 0
+        self.rewound = 0
+
+    def __len__(self) -> int:
+        """Return the number of records."""
+        return len(self._by_unique_id)
+
+    def __iter__(self) -> Iterator[WorltyDeviceRecord]:
+        """Iterate over every record."""
+        return iter(self._by_unique_id.values())
+
+    def make_unique_id(self, pk: int, fk: int = 0, did: str = "") -> str:
+        """Get unique id from worlty device."""
+        return (
+            f"{self.device_id}:{pk}:{did}"
+            if fk == 0
+            else f"{self.device_id}:{fk}_{pk}:{did}"
+        )
+
+    def get(self, unique_id: str) -> Optional[WorltyDeviceRecord]:
+        """Return the record with unique_id."""
+        return self._by_unique_id.get(unique_id)
+
+    def get_pk(self, pk: int) -> Optional[WorltyDeviceRecord]:
+        """Return the parent device record with pk."""
+        return self._by_pk.get(pk)
+
+    def get_child(self, fk: int, cid: str) -> Optional[WorltyDeviceRecord]:
+        """Return the child record cid of the parent fk."""
+        return self._by_child.get((fk, cid))
+
+    def find(
+        self, device: dict[str, Any], parent: Optional[WorltyDeviceRecord] = None
+    ) -> Optional[WorltyDeviceRecord]:
+        """Return the record of a device frame without building its unique id."""
+        if parent is None:
+            return self._by_pk.get(device.get("pk", 0))
+        return self._by_child.get((parent.pk, device.get("cid")))
+
+    def add(
+        self, device: dict[str, Any], parent: Optional[WorltyDeviceRecord] = None
+    ) -> WorltyDeviceRecord:
+        """Create the record of a device frame."""
+        pk = device.get("pk", 0)
+        if parent is None:
+            unique_id = self.make_unique_id(pk, 0, device.get("did"))
+        else:
+            unique_id = self.make_unique_id(pk, parent.pk, device.get("cid"))
+
+        record = WorltyDeviceRecord(unique_id, device, parent)
+        self._by_unique_id[unique_id] = record
+        if parent is None:
+            self._by_pk[pk] = record
+        else:
+            self._by_child[(parent.pk, record.cid)] = record
+        if record.platform is not None:
+            self.by_platform[record.platform][unique_id] = record
+        return record
+
+    def accept(self, record: WorltyDeviceRecord, device: dict[str, Any]) -> bool:
+        """Return True if a frame should be applied to record.
+
+        Replays and frames reordered behind a newer one are counted and
+        dropped, so a resync can never move a record back in time.
+        """
+        if record.is_stale(device):
+            self.stale += 1
+            return False
+        if record.is_current(device):
+            self.duplicates += 1
+            return False
+        self.applied += 1
+        return True
+
+    def rewind(self, record: WorltyDeviceRecord, lct: int) -> None:
+        """Move a device and its children back to lct after a pad clock reset.
+
+        Without this every frame from the reset clock would be dropped as
+        stale.
+        """
+        self.rewound += 1
+        record.lct = lct
+        for (fk, _), child in self._by_child.items():
+            if fk == record.pk and child.lct > lct:
+                child.lct = lct
+
+    def load(self, devices: Iterable[dict[str, Any]]) -> None:
+        """Create records from persisted device frames, parents first."""
+        children = []
+        for device in devices:
+            if device.get("fk", 0) > 0:
+                children.append(device)
+            elif self.find(device) is None:
+                self.add(device)
+        for child in children:
+            parent = self._by_pk.get(child["fk"])
+            if parent is not None and self.find(child, parent) is None:
+                self.add(child, parent)
+
+    def metrics(self) -> dict[str, int]:
+        """Return update gate metrics."""
+        return {
+            "records": len(self._by_unique_id),
+            "applied": self.applied,
+            "stale": self.stale,
+            "duplicates": self.duplicates,
+            "rewound": self.rewound,
+        }
+
+    def as_dict(self) -> dict[str, dict[str, Any]]:
+        """Return every record as persisted device frames by unique id."""
+        return {
+            unique_id: record.as_dict()
+            for unique_id, record in self._by_unique_id.items()
+        }
@@ -0,0 +1,44 @@
+"""Diagnostics support for worlty integration."""
+
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import CONF_ACCESS_TOKEN, CONF_IP_ADDRESS
+from homeassistant.core import HomeAssistant
+
+from .const import DOMAIN
+from .coordinator import WorltyDataCoordinator
+
+# The title and the unique id of the entry are the pad device id or mac address.
+TO_REDACT = {
+    CONF_ACCESS_TOKEN,
+    CONF_IP_ADDRESS,
+    "device_id",
+    "mac_address",
+    "title",
+    "unique_id",
+}
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    coordinator: WorltyDataCoordinator = hass.data[DOMAIN][entry.entry_id]["api"]
+    api = coordinator.api
+
+    return {
+        "entry": async_redact_data(entry.as_dict(), TO_REDACT),
+        "pad": (
+            {
+                "model": api.worlty_pad.device_model,
+                "fw_version": api.worlty_pad.fw_version,
+            }
+            if api.worlty_pad is not None
+            else None
+        ),
+        **api.as_diagnostics(),
+    }
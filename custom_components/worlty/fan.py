@@ -1,5 +1,6 @@
 """Worlty fan."""
 
+from functools import lru_cache
 from typing import Any
 
 from homeassistant.components.fan import FanEntity, FanEntityFeature
@@ -12,8 +13,10 @@ from homeassistant.util.percentage import (
     percentage_to_ordered_list_item,
 )
 
+from .capabilities import WorltyBitmask
 from .const import DOMAIN
 from .coordinator import WorltyDataCoordinator
+from .devices import WorltyDeviceRecord
 from .worlty import WorltyBaseEntity
 
 FAN_MODE_MAPPING = {
@@ -48,29 +51,46 @@ FAN_SWING_MAPPING = {
     4: "both",
 }
 
+FAN_MODES = WorltyBitmask(FAN_MODE_MAPPING)
+FAN_SPEEDS = WorltyBitmask(FAN_SPEED_MAPPING)
+FAN_SWINGS = WorltyBitmask(FAN_SWING_MAPPING)
+
 
 def fan_mode_to_key(fan_mode: str) -> int | None:
     """Convert fan mode value to mode key."""
-    for key, mode in FAN_MODE_MAPPING.items():
-        if mode == fan_mode:
-            return key
-    return None
+    return FAN_MODES.key(fan_mode)
 
 
 def fan_speed_to_key(fan_speed: str) -> int | None:
     """Convert fan speed value to speed key."""
-    for key, speed in FAN_SPEED_MAPPING.items():
-        if speed == fan_speed:
-            return key
-    return None
+    return FAN_SPEEDS.key(fan_speed)
 
 
 def fan_swing_to_key(fan_swing: str) -> int | None:
     """Convert fan swing value to swing key."""
-    for key, swing in FAN_SWING_MAPPING.items():
-        if swing == fan_swing:
-            return key
-    return None
+    return FAN_SWINGS.key(fan_swing)
+
+
+@lru_cache(maxsize=None)
+def fan_capabilities(
+    sm: int, ssp: int, ssw: int
+) -> tuple[tuple[str, ...], tuple[str, ...], tuple[str, ...], FanEntityFeature]:
+    """Return modes, speeds and swings and features of the masks."""
+    fan_modes = FAN_MODES.decode(sm)
+    fan_speeds = FAN_SPEEDS.decode(ssp)
+    fan_swings = FAN_SWINGS.decode(ssw)
+
+    features = FanEntityFeature(0)
+    if len(fan_modes) > 0 or len(fan_speeds) > 0:
+        features |= FanEntityFeature.TURN_ON
+        features |= FanEntityFeature.TURN_OFF
+    if len(fan_modes) > 0:
+        features |= FanEntityFeature.PRESET_MODE
+    if len(fan_speeds) > 0:
+        features |= FanEntityFeature.SET_SPEED
+    if len(fan_swings) > 0:
+        features |= FanEntityFeature.DIRECTION
+    return fan_modes, fan_speeds, fan_swings, features
 
 
 async def async_setup_entry(
@@ -85,15 +105,17 @@ async def async_setup_entry(
         entities = [
             WorltyFan(coordinator.api, entity)
             for entity in coordinator.data.get(Platform.FAN, {}).values()
-            if entity.get("hide") is not True
+            if not entity.hide
         ]
 
     async_add_entities(entities)
 
     @callback
-    def async_add_entity(entity: dict[str, Any]):
-        """Add entity from API."""
-        async_add_entities([WorltyFan(coordinator.api, entity)])
+    def async_add_entity(records: list[WorltyDeviceRecord]):
+        """Add the entities of new devices from API in one batch."""
+        async_add_entities(
+            [WorltyFan(coordinator.api, record) for record in records]
+        )
 
     coordinator.api.register_add_listener(Platform.FAN, async_add_entity)
 
@@ -102,9 +124,9 @@ class WorltyFan(WorltyBaseEntity, FanEntity):
     """Worlty fan."""
 
     _supported_features: FanEntityFeature
-    _fan_modes: list[str]
-    _fan_speeds: list[str]
-    _fan_swings: list[str]
+    _fan_modes: tuple[str, ...]
+    _fan_speeds: tuple[str, ...]
+    _fan_swings: tuple[str, ...]
 
     def __init__(self, worlty_coordinator, worlty_entity_info) -> None:
         """Initialize the entity."""
@@ -114,38 +136,16 @@ class WorltyFan(WorltyBaseEntity, FanEntity):
     @callback
     def _update_entity(self) -> None:
         """Update entity."""
-        self._supported_features = 0
-        self._fan_modes = []
-        self._fan_speeds = []
-        self._fan_swings = []
-
-        sm = self.worlty_attribute.get("sm", 0)
-        for mode_bit, fan_mode in FAN_MODE_MAPPING.items():
-            if sm & (1 << mode_bit):
-                self._fan_modes.append(fan_mode)
-
-        ssp = self.worlty_attribute.get("ssp", 0)
-        for speed_bit, fan_speed in FAN_SPEED_MAPPING.items():
-            if ssp & (1 << speed_bit):
-                self._fan_speeds.append(fan_speed)
-
-        ssw = self.worlty_attribute.get("ssw", 0)
-        for swing_bit, fan_swing in FAN_SWING_MAPPING.items():
-            if ssw & (1 << swing_bit):
-                self._fan_swings.append(fan_swing)
-
-        features = 0
-        if len(self._fan_modes) > 0 or len(self._fan_speeds) > 0:
-            features |= FanEntityFeature.TURN_ON
-            features |= FanEntityFeature.TURN_OFF
-        if len(self._fan_modes) > 0:
-            features |= FanEntityFeature.PRESET_MODE
-        if len(self._fan_speeds) > 0:
-            features |= FanEntityFeature.SET_SPEED
-        if len(self._fan_swings) > 0:
-            features |= FanEntityFeature.DIRECTION
-
-        self._supported_features = features
+        (
+            self._fan_modes,
+            self._fan_speeds,
+            self._fan_swings,
+            self._supported_features,
+        ) = fan_capabilities(
+            self.worlty_attribute.get("sm", 0),
+            self.worlty_attribute.get("ssp", 0),
+            self.worlty_attribute.get("ssw", 0),
+        )
 
     @property
     def is_on(self) -> bool:
@@ -1,5 +1,6 @@
 """Worlty light."""
 
+from functools import lru_cache
 from typing import Any
 
 from homeassistant.components.light import ATTR_BRIGHTNESS, ColorMode, LightEntity
@@ -13,9 +14,18 @@ import math
 
 from .const import DOMAIN
 from .coordinator import WorltyDataCoordinator
+from .devices import WorltyDeviceRecord
 from .worlty import WorltyBaseEntity
 
 
+@lru_cache(maxsize=None)
+def light_color_modes(sc: int) -> tuple[frozenset[ColorMode], ColorMode]:
+    """Return the supported color modes and the color mode of the mask."""
+    if sc & (1 << 1) or sc & (1 << 2):
+        return frozenset({ColorMode.BRIGHTNESS}), ColorMode.BRIGHTNESS
+    return frozenset({ColorMode.ONOFF}), ColorMode.ONOFF
+
+
 async def async_setup_entry(
     hass: HomeAssistant,
     config_entry: ConfigEntry,
@@ -28,15 +38,17 @@ async def async_setup_entry(
         entities = [
             WorltyLight(coordinator.api, entity)
             for entity in coordinator.data.get(Platform.LIGHT, {}).values()
-            if entity.get("hide") is not True
+            if not entity.hide
         ]
 
     async_add_entities(entities)
 
     @callback
-    def async_add_entity(entity: dict[str, Any]):
-        """Add entity from API."""
-        async_add_entities([WorltyLight(coordinator.api, entity)])
+    def async_add_entity(records: list[WorltyDeviceRecord]):
+        """Add the entities of new devices from API in one batch."""
+        async_add_entities(
+            [WorltyLight(coordinator.api, record) for record in records]
+        )
 
     coordinator.api.register_add_listener(Platform.LIGHT, async_add_entity)
 
@@ -48,7 +60,6 @@ class WorltyLight(WorltyBaseEntity, LightEntity):
         """Initialize the entity."""
         super().__init__(worlty_coordinator, worlty_entity_info, self._update_entity)
         self._update_entity()
-        self._color_mode: ColorMode = ColorMode.ONOFF
         self.wt_last_bri: int = 0
         self.wt_level_max: int = 0
         self.dim_level = []
@@ -81,20 +92,12 @@ class WorltyLight(WorltyBaseEntity, LightEntity):
     @property
     def color_mode(self) -> ColorMode:
         """Return the color mode."""
-        return self._color_mode
+        return light_color_modes(self.worlty_attribute.get("sc", 0))[1]
 
     @property
     def supported_color_modes(self) -> set[ColorMode]:
         """Return the list of supported color mode."""
-        modes = {ColorMode.ONOFF}
-        sc = self.worlty_attribute.get("sc", 0)
-        if (sc & (1 << 1)) != 0:
-            modes = {ColorMode.BRIGHTNESS}
-            self._color_mode = ColorMode.BRIGHTNESS
-        if (sc & (1 << 2)) != 0:
-            modes = {ColorMode.BRIGHTNESS}
-            self._color_mode = ColorMode.BRIGHTNESS
-        return modes
+        return light_color_modes(self.worlty_attribute.get("sc", 0))[0]
 
     async def async_turn_on(self, **kwargs: Any) -> None:
         """Turn the entity on."""
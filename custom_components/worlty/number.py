@@ -1,7 +1,5 @@
 """Worlty Input Number."""
 
-from typing import Any
-
 from homeassistant.components.number import NumberEntity
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import Platform
@@ -10,16 +8,18 @@ from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
 from .const import DOMAIN
 from .coordinator import WorltyDataCoordinator
+from .devices import WorltyDeviceRecord
 from .worlty import WorltyBaseEntity
 
 NUMBER_RANGE = {
-    "worlty_offset": [-2, 2, 0.1],
-    "temp_offset": [-5, 5, 0.1],
-    "temp_target": [10, 30, 0.1],
-    "interval_ms": [10 * 60, 5 * 60 * 60, 60],
-    "running_ms": [60, 60 * 60, 60],
-    "running_min_ms": [0, 20 * 60, 60],
+    "worlty_offset": (-2, 2, 0.1),
+    "temp_offset": (-5, 5, 0.1),
+    "temp_target": (10, 30, 0.1),
+    "interval_ms": (10 * 60, 5 * 60 * 60, 60),
+    "running_ms": (60, 60 * 60, 60),
+    "running_min_ms": (0, 20 * 60, 60),
 }
+DEFAULT_NUMBER_RANGE = (0, 100, 1)
 
 
 async def async_setup_entry(
@@ -34,15 +34,17 @@ async def async_setup_entry(
         entities = [
             WorltyNumber(coordinator.api, entity)
             for entity in coordinator.data.get(Platform.NUMBER, {}).values()
-            if entity.get("hide") is not True
+            if not entity.hide
         ]
 
     async_add_entities(entities)
 
     @callback
-    def async_add_entity(entity: dict[str, Any]):
-        """Add entity from API."""
-        async_add_entities([WorltyNumber(coordinator.api, entity)])
+    def async_add_entity(records: list[WorltyDeviceRecord]):
+        """Add the entities of new devices from API in one batch."""
+        async_add_entities(
+            [WorltyNumber(coordinator.api, record) for record in records]
+        )
 
     coordinator.api.register_add_listener(Platform.NUMBER, async_add_entity)
 
@@ -50,43 +52,47 @@ async def async_setup_entry(
 class WorltyNumber(WorltyBaseEntity, NumberEntity):
     """Worlty input number."""
 
+    _native_value: float | None
+
     def __init__(self, worlty_coordinator, worlty_entity_info) -> None:
         """Initialize the entity."""
         super().__init__(worlty_coordinator, worlty_entity_info, self._update_entity)
         self._update_entity()
+        self._range = NUMBER_RANGE.get(self.worlty_name, DEFAULT_NUMBER_RANGE)
 
     @callback
     def _update_entity(self) -> None:
         """Update entity."""
 
-    @property
-    def native_value(self) -> float | None:
-        """Return the current value of the number."""
+    def _update_state(self) -> None:
+        """Parse the state once per change."""
         try:
             value = float(self.worlty_state)
             if self.worlty_name.endswith("_ms"):
                 value /= 1000
-            return value
+            self._native_value = value
         except (ValueError, TypeError):
-            return None
+            self._native_value = None
+
+    @property
+    def native_value(self) -> float | None:
+        """Return the current value of the number."""
+        return self._native_value
 
     @property
     def native_max_value(self) -> float | None:
         """Return the maximum accepted value of the number."""
-        default_range = NUMBER_RANGE.get(self.worlty_name, [0, 100, 1])
-        return default_range[1]
+        return self._range[1]
 
     @property
     def native_min_value(self) -> float | None:
         """Return the maximum accepted value of the number."""
-        default_range = NUMBER_RANGE.get(self.worlty_name, [0, 100, 1])
-        return default_range[0]
+        return self._range[0]
 
     @property
     def native_step(self) -> float | None:
         """Return the maximum accepted value of the number."""
-        default_range = NUMBER_RANGE.get(self.worlty_name, [0, 100, 1])
-        return default_range[2]
+        return self._range[2]
 
     async def async_set_native_value(self, value: float) -> None:
         """Update the current value."""
@@ -0,0 +1,552 @@
+"""Message pipeline for worlty integration."""
+
+from __future__ import annotations
+
+import asyncio
+from collections import deque
+import time
+from typing import Any
+
+from .commands import RTT_SAMPLES, percentile
+from .const import LOGGER
+
+INBOUND_QUEUE_SIZE = 1000
+OUTBOUND_QUEUE_SIZE = 256
+OUTBOUND_BATCH_BYTES = 64 * 1024
+
+# 헬스 간격의 몇 배 동안 조용하면 연결이 끊긴 것으로 본다.
+HEALTH_MARGIN = 2.0
+HEALTH_MIN_TIMEOUT = 10.0  # 초
+HEALTH_INTERVAL_HALF_LIFE = 600.0  # 초
+PROBE_TIMEOUT = 2.0  # 초
+
+OVERFLOW_DROP_OLDEST = "drop_oldest"
+OVERFLOW_DROP_NEWEST = "drop_newest"
+
+
+class _QueuedMessage:
+    """Inbound message waiting for the processor."""
+
+    __slots__ = ("devices", "message", "received")
+
+    def __init__(self, message: dict[str, Any], devices: dict[Any, dict] | None) -> None:
+        """Initialize."""
+        self.message = message
+        self.devices = devices
+        self.received = time.monotonic()
+
+
+def _is_dead(queued: _QueuedMessage) -> bool:
+    """Return True if a newer frame superseded everything a message carried."""
+    return queued.message is None or (
+        queued.devices is not None and not queued.devices
+    )
+
+
+class WorltyInboundQueue:
+    """Bounded, ordered inbound queue drained by a single processor.
+
+    A queued update for a pk is superseded by a newer update for the same pk,
+    so under burst load the processor only applies the latest state while
+    frames keep their arrival order. A full queue first evicts superseded
+    entries, then a queued health, and only then the oldest message, whose
+    devices are kept in lost to be fetched again.
+    """
+
+    def __init__(self, maxsize: int = INBOUND_QUEUE_SIZE) -> None:
+        """Initialize."""
+        self._maxsize = maxsize
+        self._queue: deque[_QueuedMessage] = deque()
+        self._updates: dict[Any, _QueuedMessage] = {}
+        self._health: _QueuedMessage | None = None
+        self._dead = 0
+        self._ready = asyncio.Event()
+        self.lost: dict[Any, int] = {}
+        self.received = 0
+        self.processed = 0
+        self.superseded = 0
+        self.dropped = 0
+        self.dropped_devices = 0
+        self.max_depth = 0
+        self.last_lag = 0.0
+        self.max_lag = 0.0
+
+    def __len__(self) -> int:
+        """Return queue depth."""
+        return len(self._queue)
+
+    def put(self, message: dict[str, Any]) -> None:
+        """Queue a message without blocking."""
+        self.received += 1
+        data_type = message.get("type")
+        devices = (message.get("data") or {}).get("devices")
+
+        if (
+            data_type == "update"
+            and isinstance(devices, list)
+            and all(isinstance(device, dict) for device in devices)
+        ):
+            queued = _QueuedMessage(message, {})
+            for device in devices:
+                pk = device.get("pk")
+                older = self._updates.get(pk)
+                if older is not None and older.devices is not None:
+                    older.devices.pop(pk, None)
+                    self.superseded += 1
+                    if not older.devices and older is not queued:
+                        self._dead += 1
+                queued.devices[pk] = device
+                self._updates[pk] = queued
+        elif data_type == "health":
+            queued = _QueuedMessage(message, None)
+            if self._health is not None:
+                # Only the latest lct map matters.
+                self._health.message = None
+                self.superseded += 1
+                self._dead += 1
+            self._health = queued
+        else:
+            queued = _QueuedMessage(message, None)
+
+        if len(self._queue) >= self._maxsize:
+            self._evict()
+
+        self._queue.append(queued)
+        self.max_depth = max(self.max_depth, len(self._queue))
+        self._ready.set()
+
+    async def get(self) -> dict[str, Any]:
+        """Return the next message to process."""
+        while True:
+            while not self._queue:
+                self._ready.clear()
+                await self._ready.wait()
+
+            queued = self._queue.popleft()
+            self._forget(queued)
+            message = queued.message
+            if _is_dead(queued):
+                # Every device was superseded by a newer frame.
+                self._dead -= 1
+                continue
+
+            if queued.devices is not None:
+                message = {
+                    "type": "update",
+                    "data": {"devices": list(queued.devices.values())},
+                }
+
+            self.processed += 1
+            self.last_lag = time.monotonic() - queued.received
+            self.max_lag = max(self.max_lag, self.last_lag)
+            return message
+
+    def take_lost(self) -> dict[Any, int]:
+        """Return and forget the lct by pk of the devices dropped on overflow."""
+        lost, self.lost = self.lost, {}
+        return lost
+
+    def _evict(self) -> None:
+        """Make room for one message, losing as little state as possible."""
+        if self._dead:
+            queued = next(queued for queued in self._queue if _is_dead(queued))
+            self._queue.remove(queued)
+            self._dead -= 1
+            return
+
+        if self._health is not None:
+            # The next health carries every lct again.
+            queued = self._health
+            self._queue.remove(queued)
+        else:
+            queued = self._queue.popleft()
+        self._forget(queued)
+        self.dropped += 1
+        if queued.devices:
+            for pk, device in queued.devices.items():
+                self.lost[pk] = max(self.lost.get(pk, 0), device.get("lct", 0))
+            self.dropped_devices += len(queued.devices)
+        LOGGER.warning(
+            "Inbound queue full, drop %s",
+            queued.message.get("type"),
+        )
+
+    def _forget(self, queued: _QueuedMessage) -> None:
+        """Remove the supersede references of a message leaving the queue."""
+        if queued.devices:
+            for pk in queued.devices:
+                if self._updates.get(pk) is queued:
+                    del self._updates[pk]
+        if self._health is queued:
+            self._health = None
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return queue metrics."""
+        return {
+            "depth": len(self._queue),
+            "max_depth": self.max_depth,
+            "received": self.received,
+            "processed": self.processed,
+            "superseded": self.superseded,
+            "dropped": self.dropped,
+            "dropped_devices": self.dropped_devices,
+            "lost": len(self.lost),
+            "lag": round(self.last_lag, 4),
+            "max_lag": round(self.max_lag, 4),
+        }
+
+
+class WorltyOutboundQueue:
+    """Bounded outbound frame queue drained by a single writer.
+
+    put never blocks. When the queue is full the overflow policy drops the
+    oldest queued frame or rejects the new one, and congested tells producers
+    to hold back while the writer catches up.
+    """
+
+    def __init__(
+        self,
+        maxsize: int = OUTBOUND_QUEUE_SIZE,
+        overflow: str = OVERFLOW_DROP_OLDEST,
+    ) -> None:
+        """Initialize."""
+        self._maxsize = maxsize
+        self._overflow = overflow
+        self._queue: deque[bytes] = deque()
+        self._ready = asyncio.Event()
+        self.enqueued = 0
+        self.dropped = 0
+        self.max_depth = 0
+        self.writes = 0
+        self.frames_written = 0
+        self.bytes_written = 0
+        self.last_drain = 0.0
+        self.max_drain = 0.0
+        self._total_drain = 0.0
+
+    def __len__(self) -> int:
+        """Return queue depth."""
+        return len(self._queue)
+
+    @property
+    def congested(self) -> bool:
+        """Return True when the queue is above its high water mark."""
+        return len(self._queue) >= self._maxsize * 3 // 4
+
+    def put(self, frame: bytes) -> bool:
+        """Queue a frame, return False if it was rejected."""
+        if len(self._queue) >= self._maxsize:
+            self.dropped += 1
+            if self._overflow == OVERFLOW_DROP_NEWEST:
+                LOGGER.warning("Outbound queue full, reject frame")
+                return False
+            self._queue.popleft()
+            LOGGER.warning("Outbound queue full, drop oldest frame")
+
+        self._queue.append(frame)
+        self.enqueued += 1
+        self.max_depth = max(self.max_depth, len(self._queue))
+        self._ready.set()
+        return True
+
+    async def get_batch(self, max_bytes: int = OUTBOUND_BATCH_BYTES) -> list[bytes]:
+        """Wait for frames and return every queued frame up to max_bytes.
+
+        Frames pile up while the previous drain is slow, so a slow socket
+        gets fewer and larger writes.
+        """
+        while not self._queue:
+            self._ready.clear()
+            await self._ready.wait()
+
+        batch = [self._queue.popleft()]
+        size = len(batch[0])
+        while self._queue and size + len(self._queue[0]) <= max_bytes:
+            frame = self._queue.popleft()
+            batch.append(frame)
+            size += len(frame)
+        return batch
+
+    def clear(self) -> None:
+        """Drop every queued frame."""
+        self.dropped += len(self._queue)
+        self._queue.clear()
+
+    def record_write(self, frames: int, size: int, drain: float) -> None:
+        """Record a completed write."""
+        self.writes += 1
+        self.frames_written += frames
+        self.bytes_written += size
+        self.last_drain = drain
+        self.max_drain = max(self.max_drain, drain)
+        self._total_drain += drain
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return queue metrics."""
+        return {
+            "depth": len(self._queue),
+            "max_depth": self.max_depth,
+            "enqueued": self.enqueued,
+            "dropped": self.dropped,
+            "writes": self.writes,
+            "frames_written": self.frames_written,
+            "bytes_written": self.bytes_written,
+            "drain": round(self.last_drain, 4),
+            "max_drain": round(self.max_drain, 4),
+            "avg_drain": round(self._total_drain / self.writes, 4) if self.writes else 0,
+        }
+
+
+class WorltyWriteScheduler:
+    """Coalesce entity state writes into one flush per loop iteration.
+
+    An entity marked again before the flush is written once. With a budget
+    only that many entities are written per flush, priority entities first,
+    and the rest stays dirty for the next flush.
+    """
+
+    def __init__(self, interval: float = 0.0, budget: int = 0) -> None:
+        """Initialize."""
+        self.interval = interval
+        self.budget = budget
+        self._priority: dict[Any, None] = {}
+        self._dirty: dict[Any, None] = {}
+        self._handle: asyncio.Handle | None = None
+        self.marked = 0
+        self.written = 0
+        self.saved = 0
+        self.deferred = 0
+        self.flushes = 0
+        self.max_batch = 0
+
+    def __len__(self) -> int:
+        """Return the number of dirty entities."""
+        return len(self._priority) + len(self._dirty)
+
+    def mark(self, entity: Any, priority: bool = False) -> None:
+        """Write the state of entity with the next flush."""
+        self.marked += 1
+        if entity in self._priority or entity in self._dirty:
+            self.saved += 1
+            if priority and entity in self._dirty:
+                del self._dirty[entity]
+                self._priority[entity] = None
+            return
+        (self._priority if priority else self._dirty)[entity] = None
+        if self._handle is None:
+            loop = asyncio.get_running_loop()
+            self._handle = (
+                loop.call_later(self.interval, self.flush)
+                if self.interval > 0
+                else loop.call_soon(self.flush)
+            )
+
+    def discard(self, entity: Any) -> None:
+        """Forget a pending write of entity."""
+        self._priority.pop(entity, None)
+        self._dirty.pop(entity, None)
+
+    def flush(self) -> None:
+        """Write the dirty entities, up to the budget."""
+        self._handle = None
+        budget = self.budget or len(self)
+        batch = 0
+        for dirty in (self._priority, self._dirty):
+            while dirty and batch < budget:
+                entity = next(iter(dirty))
+                del dirty[entity]
+                entity.async_write_ha_state()
+                batch += 1
+
+        self.flushes += 1
+        self.written += batch
+        self.max_batch = max(self.max_batch, batch)
+        if len(self):
+            self.deferred += len(self)
+            self._handle = asyncio.get_running_loop().call_soon(self.flush)
+
+    def clear(self) -> None:
+        """Drop every pending write."""
+        if self._handle is not None:
+            self._handle.cancel()
+            self._handle = None
+        self._priority.clear()
+        self._dirty.clear()
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return scheduler metrics."""
+        return {
+            "dirty": len(self),
+            "marked": self.marked,
+            "written": self.written,
+            "saved": self.saved,
+            "deferred": self.deferred,
+            "flushes": self.flushes,
+            "max_batch": self.max_batch,
+        }
+
+
+class WorltyLivenessMonitor:
+    """Declare a connection dead once the pad stays silent too long.
+
+    One timer per connection. Traffic only records its arrival time, and the
+    timer re-arms itself for the last arrival plus the threshold when it
+    fires early. Until two health frames were seen the threshold is timeout,
+    then margin times the longest recent health interval, whose memory
+    halves every HEALTH_INTERVAL_HALF_LIFE seconds, within minimum and
+    timeout. Pads sending health often are detected dead sooner.
+
+    With idle set, the same timer calls on_idle after idle seconds of
+    silence to probe the pad, and a probe nothing answered within
+    probe_timeout ends the connection as well.
+    """
+
+    def __init__(
+        self,
+        timeout: float,
+        minimum: float = HEALTH_MIN_TIMEOUT,
+        idle: float = 0.0,
+        probe_timeout: float = PROBE_TIMEOUT,
+    ) -> None:
+        """Initialize."""
+        self.timeout = timeout
+        self.minimum = minimum
+        self.idle = idle
+        self.probe_timeout = probe_timeout
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._handle: asyncio.TimerHandle | None = None
+        self._on_expired: Any = None
+        self._on_idle: Any = None
+        self._probe_sent: float | None = None
+        self._rtt: deque[float] = deque(maxlen=RTT_SAMPLES)
+        self._last = 0.0
+        self._deadline = 0.0
+        self._last_health: float | None = None
+        self._interval = 0.0
+        self.expired = 0
+        self.last_silence = 0.0
+        self.probes = 0
+        self.unanswered = 0
+
+    @property
+    def probing(self) -> bool:
+        """Return True while a probe waits for its answer."""
+        return self._probe_sent is not None
+
+    @property
+    def threshold(self) -> float:
+        """Return the silence after which the connection is dead."""
+        if not self._interval:
+            return self.timeout
+        return min(self.timeout, max(self.minimum, HEALTH_MARGIN * self._interval))
+
+    def start(self, on_expired: Any, on_idle: Any = None) -> None:
+        """Watch a new connection, call on_expired once it went silent.
+
+        on_idle returns True if it sent a probe.
+        """
+        self.stop()
+        self._loop = asyncio.get_running_loop()
+        self._on_expired = on_expired
+        self._on_idle = on_idle
+        self._probe_sent = None
+        self._last = self._loop.time()
+        self._last_health = None
+        if self.idle and on_idle is not None:
+            self._arm(self._last + min(self.idle, self.threshold))
+        else:
+            self._arm(self._last + self.threshold)
+
+    def seen(self) -> None:
+        """Record traffic from the pad."""
+        if self._handle is not None:
+            self._last = self._loop.time()
+
+    def health(self) -> None:
+        """Record a health frame and learn the interval between them."""
+        if self._handle is None:
+            return
+        now = self._last = self._loop.time()
+        if self._last_health is not None:
+            interval = now - self._last_health
+            self._interval = max(
+                interval,
+                self._interval * 0.5 ** (interval / HEALTH_INTERVAL_HALF_LIFE),
+            )
+        self._last_health = now
+        if now + self.threshold < self._deadline:
+            # The threshold shrank, do not wait for the longer deadline.
+            self._handle.cancel()
+            self._arm(now + self.threshold)
+
+    def answered(self) -> None:
+        """Record the answer to the probe."""
+        if self._probe_sent is not None:
+            self._rtt.append(self._loop.time() - self._probe_sent)
+            self._probe_sent = None
+
+    def rtt(self) -> dict[str, float]:
+        """Return probe round trip percentiles in seconds."""
+        samples = sorted(self._rtt)
+        return {
+            "count": len(samples),
+            "last": round(self._rtt[-1], 4) if self._rtt else 0.0,
+            "p50": round(percentile(samples, 50), 4),
+            "p95": round(percentile(samples, 95), 4),
+            "max": round(samples[-1], 4) if samples else 0.0,
+        }
+
+    def stop(self) -> None:
+        """Stop watching the connection."""
+        if self._handle is not None:
+            self._handle.cancel()
+            self._handle = None
+        self._on_expired = None
+        self._on_idle = None
+
+    def _check(self) -> None:
+        """Probe an idle pad, re-arm for the last arrival or report it dead."""
+        now = self._loop.time()
+        deadline = self._last + self.threshold
+        if self.idle and self._on_idle is not None:
+            if self._probe_sent is not None and self._probe_sent >= self._last:
+                # Nothing arrived since the probe was sent.
+                deadline = min(deadline, self._probe_sent + self.probe_timeout)
+            elif now >= self._last + self.idle:
+                if self._on_idle():
+                    self._probe_sent = now
+                    self.probes += 1
+                    deadline = min(deadline, now + self.probe_timeout)
+            else:
+                deadline = min(deadline, self._last + self.idle)
+        if now < deadline:
+            self._arm(deadline)
+            return
+        self._handle = None
+        if self._probe_sent is not None and self._probe_sent >= self._last:
+            self.unanswered += 1
+        else:
+            self._probe_sent = None
+        self.expired += 1
+        self.last_silence = now - self._last
+        on_expired, self._on_expired = self._on_expired, None
+        on_expired()
+
+    def _arm(self, deadline: float) -> None:
+        """Check the silence at deadline."""
+        self._deadline = deadline
+        self._handle = self._loop.call_at(deadline, self._check)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return liveness metrics."""
+        return {
+            "watching": self._handle is not None,
+            "threshold": round(self.threshold, 3),
+            "health_interval": round(self._interval, 3),
+            "expired": self.expired,
+            "last_silence": round(self.last_silence, 3),
+            "idle": self.idle,
+            "probes": self.probes,
+            "unanswered": self.unanswered,
+            "rtt": self.rtt(),
+        }
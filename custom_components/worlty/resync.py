@@ -0,0 +1,284 @@
+"""Device fetches and delta resync for worlty integration."""
+
+from __future__ import annotations
+
+from collections.abc import Iterable, Mapping
+from itertools import islice
+import time
+from typing import Any, Optional
+
+from .const import DEFAULT_RESYNC_BATCH
+from .devices import WorltyDeviceStore
+
+FETCH_WINDOW = 4
+FETCH_TIMEOUT = 5.0  # 초
+FETCH_RETRIES = 2
+# 인증 후 헬스를 기다리는 시간, 지나면 알려진 장치를 모두 가져온다.
+RESYNC_HEALTH_WAIT = 2.0  # 초
+
+
+class WorltyFetchChunk:
+    """One get request waiting for the updates of its devices."""
+
+    __slots__ = ("deadline", "pks", "seq")
+
+    def __init__(self, seq: int, pks: list[int], timeout: float) -> None:
+        """Initialize."""
+        self.seq = seq
+        self.pks = set(pks)
+        self.deadline = time.monotonic() + timeout
+
+    def __repr__(self) -> str:
+        """Return a string representation of the chunk."""
+        return f"WorltyFetchChunk(seq={self.seq}, pks={sorted(self.pks)})"
+
+
+class WorltyFetchScheduler:
+    """Fetch devices in get requests of chunk devices, window chunks in flight.
+
+    A device is wanted until an update at least as new as the lct it was
+    requested for arrives, whether it answers the get or was pushed by the
+    pad. Requesting a wanted device again only raises that lct. A chunk
+    frees its window slot once every device arrived or its deadline passed,
+    then the devices still missing are queued again up to retries times.
+    """
+
+    def __init__(
+        self,
+        chunk: int = DEFAULT_RESYNC_BATCH,
+        window: int = FETCH_WINDOW,
+        timeout: float = FETCH_TIMEOUT,
+        retries: int = FETCH_RETRIES,
+    ) -> None:
+        """Initialize."""
+        self.chunk = chunk
+        self.window = window
+        self._timeout = timeout
+        self._retries = retries
+        self._wanted: dict[int, int] = {}
+        self._attempts: dict[int, int] = {}
+        self._queued: dict[int, None] = {}
+        self._chunk_of: dict[int, WorltyFetchChunk] = {}
+        self._chunks: dict[int, WorltyFetchChunk] = {}
+        self._seq = 0
+        self.requested = 0
+        self.deduplicated = 0
+        self.sent = 0
+        self.completed = 0
+        self.retried = 0
+        self.failed = 0
+        self.max_in_flight = 0
+
+    def __len__(self) -> int:
+        """Return the number of wanted devices."""
+        return len(self._wanted)
+
+    @property
+    def next_deadline(self) -> float | None:
+        """Return the earliest deadline of the chunks in flight."""
+        if not self._chunks:
+            return None
+        return min(chunk.deadline for chunk in self._chunks.values())
+
+    def request(self, devices: Mapping[int, int]) -> None:
+        """Want every pk until an update as new as its lct arrives."""
+        for pk, lct in devices.items():
+            wanted = self._wanted.get(pk)
+            if wanted is not None:
+                self.deduplicated += 1
+                if lct > wanted:
+                    # Changed again while queued or in flight.
+                    self._wanted[pk] = lct
+                continue
+            self.requested += 1
+            self._wanted[pk] = lct
+            self._attempts[pk] = 0
+            self._queued[pk] = None
+
+    def next_chunks(self) -> list[list[int]]:
+        """Return the queued devices that fit in the window, one list per get."""
+        chunks = []
+        while self._queued and len(self._chunks) < self.window:
+            pks = list(islice(self._queued, self.chunk))
+            for pk in pks:
+                del self._queued[pk]
+                self._attempts[pk] += 1
+            self._seq += 1
+            chunk = WorltyFetchChunk(self._seq, pks, self._timeout)
+            self._chunks[chunk.seq] = chunk
+            for pk in pks:
+                self._chunk_of[pk] = chunk
+            chunks.append(pks)
+        self.sent += len(chunks)
+        self.max_in_flight = max(self.max_in_flight, len(self._chunks))
+        return chunks
+
+    def received(self, device: dict[str, Any]) -> bool:
+        """Check an updated device, return True if it completed a fetch."""
+        pk = device.get("pk")
+        wanted = self._wanted.get(pk)
+        if wanted is None or device.get("lct", 0) < wanted:
+            return False
+        self._forget(pk)
+        self.completed += 1
+        return True
+
+    def expired(self) -> list[int]:
+        """Queue the devices of late chunks again, return the ones given up on."""
+        now = time.monotonic()
+        failed: list[int] = []
+        for chunk in list(self._chunks.values()):
+            if chunk.deadline > now:
+                continue
+            del self._chunks[chunk.seq]
+            for pk in chunk.pks:
+                del self._chunk_of[pk]
+                if self._attempts[pk] <= self._retries:
+                    self._queued[pk] = None
+                    self.retried += 1
+                else:
+                    failed.append(pk)
+        for pk in failed:
+            del self._wanted[pk]
+            del self._attempts[pk]
+        self.failed += len(failed)
+        return failed
+
+    def clear(self) -> None:
+        """Forget every wanted device, gets of a lost connection never answer."""
+        self._wanted.clear()
+        self._attempts.clear()
+        self._queued.clear()
+        self._chunk_of.clear()
+        self._chunks.clear()
+
+    def _forget(self, pk: int) -> None:
+        """Stop wanting pk and free its chunk once the chunk is complete."""
+        del self._wanted[pk]
+        del self._attempts[pk]
+        self._queued.pop(pk, None)
+        chunk = self._chunk_of.pop(pk, None)
+        if chunk is not None:
+            chunk.pks.discard(pk)
+            if not chunk.pks:
+                del self._chunks[chunk.seq]
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return scheduler metrics."""
+        return {
+            "wanted": len(self._wanted),
+            "queued": len(self._queued),
+            "in_flight": len(self._chunks),
+            "chunk": self.chunk,
+            "window": self.window,
+            "requested": self.requested,
+            "deduplicated": self.deduplicated,
+            "sent": self.sent,
+            "completed": self.completed,
+            "retried": self.retried,
+            "failed": self.failed,
+            "max_in_flight": self.max_in_flight,
+        }
+
+
+class WorltyResync:
+    """Bring the device records up to date after the pad authenticated.
+
+    The first health frame of a connection carries the lct of every pad
+    device. Only the devices whose lct differs from their record are
+    fetched, and the records are consistent once an update at least as new
+    as that lct arrived for each of them or its fetch was given up on. The
+    pad offers no request for that health, when it is late every known
+    device is fetched instead and later healths fetch what is still missing.
+    """
+
+    def __init__(self) -> None:
+        """Initialize."""
+        self._started = 0.0
+        self._pending: Optional[dict[int, int]] = None
+        self.active = False
+        self.resyncs = 0
+        self.fetched = 0
+        self.without_health = 0
+        self.last_fetched = 0
+        self.last_duration = 0.0
+        self.max_duration = 0.0
+
+    @property
+    def planned(self) -> bool:
+        """Return True once the devices to fetch are known."""
+        return self._pending is not None
+
+    def begin(self) -> None:
+        """Start a resync for a new connection."""
+        self._started = time.monotonic()
+        self._pending = None
+        self.active = True
+
+    def plan(
+        self, devices: Mapping[str, int], store: WorltyDeviceStore
+    ) -> dict[int, int]:
+        """Return the lct by pk of the devices whose lct changed.
+
+        A device the pad reports older than its record had the pad clock
+        reset, the record is rewound so the fetched frame is not stale.
+        """
+        pending = {}
+        for pk, lct in devices.items():
+            record = store.get_pk(int(pk))
+            if record is None or record.lct != lct:
+                if record is not None and lct < record.lct:
+                    store.rewind(record, lct)
+                pending[int(pk)] = lct
+        return self._plan(pending)
+
+    def plan_known(self, store: WorltyDeviceStore) -> dict[int, int]:
+        """Return the lct by pk of every known device, for a pad without health."""
+        self.without_health += 1
+        return self._plan(
+            {record.pk: record.lct for record in store if record.parent is None}
+        )
+
+    def _plan(self, pending: dict[int, int]) -> dict[int, int]:
+        """Wait for pending and return a copy to fetch."""
+        self._pending = pending
+        self.last_fetched = len(pending)
+        self.fetched += len(pending)
+        return dict(pending)
+
+    def received(self, device: dict[str, Any]) -> bool:
+        """Check an updated device, return True if it completed the resync."""
+        if not self.active or self._pending is None:
+            return False
+        lct = self._pending.get(device.get("pk"))
+        if lct is not None and device.get("lct", 0) >= lct:
+            del self._pending[device["pk"]]
+        return not self._pending
+
+    def discard(self, pks: Iterable[int]) -> bool:
+        """Stop waiting for pks, return True if that completed the resync."""
+        if not self.active or self._pending is None:
+            return False
+        for pk in pks:
+            self._pending.pop(pk, None)
+        return not self._pending
+
+    def finish(self) -> None:
+        """Record the time from authentication to consistent records."""
+        self.active = False
+        self.resyncs += 1
+        self.last_duration = time.monotonic() - self._started
+        self.max_duration = max(self.max_duration, self.last_duration)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return resync metrics."""
+        return {
+            "active": self.active,
+            "pending": len(self._pending) if self._pending else 0,
+            "resyncs": self.resyncs,
+            "fetched": self.fetched,
+            "without_health": self.without_health,
+            "last_fetched": self.last_fetched,
+            "last_duration": round(self.last_duration, 3),
+            "max_duration": round(self.max_duration, 3),
+        }
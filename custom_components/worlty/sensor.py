@@ -1,18 +1,29 @@
 """Worlty sensor."""
 
-from datetime import datetime, timezone, timedelta
+from datetime import datetime
 from typing import Any
 
-from homeassistant.components.sensor import SensorEntity, SensorStateClass
+from homeassistant.components.sensor import (
+    SensorDeviceClass,
+    SensorEntity,
+    SensorStateClass,
+)
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import Platform
+from homeassistant.const import EntityCategory, Platform, UnitOfTime
 from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.device_registry import DeviceInfo
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.typing import StateType
 
-from .const import DOMAIN
+from .const import (
+    CONF_PING_INTERVAL,
+    DEFAULT_PING_INTERVAL,
+    DOMAIN,
+    WORLTY_TIMEZONE,
+)
 from .coordinator import WorltyDataCoordinator
-from .worlty import WorltyBaseEntity
+from .devices import WorltyDeviceRecord
+from .worlty import WorltyBaseEntity, WorltyLocal
 
 
 async def async_setup_entry(
@@ -27,15 +38,28 @@ async def async_setup_entry(
         entities = [
             WorltySensor(coordinator.api, entity)
             for entity in coordinator.data.get(Platform.SENSOR, {}).values()
-            if entity.get("hide") is not True
+            if not entity.hide
         ]
+    # The pad may still be offline, the entry remembers its mac address.
+    if mac_address := config_entry.data.get("mac_address"):
+        entities += [
+            WorltyCommandRttSensor(coordinator.api, mac_address),
+            WorltyCommandUnackedSensor(coordinator.api, mac_address),
+        ]
+        if (
+            config_entry.options.get(CONF_PING_INTERVAL, DEFAULT_PING_INTERVAL)
+            > 0
+        ):
+            entities.append(WorltyPingRttSensor(coordinator.api, mac_address))
 
     async_add_entities(entities)
 
     @callback
-    def async_add_entity(entity: dict[str, Any]):
-        """Add entity from API."""
-        async_add_entities([WorltySensor(coordinator.api, entity)])
+    def async_add_entity(records: list[WorltyDeviceRecord]):
+        """Add the entities of new devices from API in one batch."""
+        async_add_entities(
+            [WorltySensor(coordinator.api, record) for record in records]
+        )
 
     coordinator.api.register_add_listener(Platform.SENSOR, async_add_entity)
 
@@ -48,32 +72,42 @@ class WorltySensor(WorltyBaseEntity, SensorEntity):
         super().__init__(worlty_coordinator, worlty_entity_info, self._update_entity)
         self._update_entity()
 
+    _native_value: StateType | datetime
+
     @callback
     def _update_entity(self) -> None:
         """Update entity."""
 
-    @property
-    def native_value(self) -> StateType:
-        """Return the native value of the sensor with timezone information."""
-        tz = timezone(timedelta(hours=9))
+    def _update_state(self) -> None:
+        """Parse the state once per change."""
         if self.worlty_class == 45:
+            # "-" has no time, it is stamped when reported.
             if self.worlty_state == "-":
-                return datetime.now(tz)
-            else:
-                return datetime.fromtimestamp(int(self.worlty_state), tz)
+                self._native_value = datetime.now(WORLTY_TIMEZONE)
+                return
+            try:
+                self._native_value = datetime.fromtimestamp(
+                    int(self.worlty_state), WORLTY_TIMEZONE
+                )
+            except (ValueError, TypeError, OverflowError, OSError):
+                self._native_value = None
+            return
 
         try:
             value = float(self.worlty_state)
             if self.worlty_name.endswith("_ms"):
                 value /= 1000
-            return value
+            self._native_value = value
+            return
         except (ValueError, TypeError):
             pass
-        
-        if self.worlty_state == "-":
-            return 0
 
-        return self.worlty_state
+        self._native_value = 0 if self.worlty_state == "-" else self.worlty_state
+
+    @property
+    def native_value(self) -> StateType:
+        """Return the native value of the sensor with timezone information."""
+        return self._native_value
 
     @property
     def state_class(self) -> SensorStateClass | None:
@@ -81,3 +115,102 @@ class WorltySensor(WorltyBaseEntity, SensorEntity):
         if self.worlty_name in ["usage"]:
             return SensorStateClass.MEASUREMENT
         return None
+
+
+class WorltyDiagnosticSensor(SensorEntity):
+    """Worlty pad diagnostic sensor, polled from the API metrics."""
+
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_has_entity_name = True
+
+    def __init__(self, api: WorltyLocal, mac_address: str, key: str) -> None:
+        """Initialize the entity."""
+        self.api = api
+        self._attr_translation_key = key
+        self._attr_unique_id = f"{mac_address}_{key}".lower()
+        self._attr_device_info = DeviceInfo(
+            identifiers={(DOMAIN, mac_address)},
+        )
+
+
+class WorltyCommandRttSensor(WorltyDiagnosticSensor):
+    """Command round trip time, p95 over every device type."""
+
+    _attr_device_class = SensorDeviceClass.DURATION
+    _attr_native_unit_of_measurement = UnitOfTime.MILLISECONDS
+    _attr_state_class = SensorStateClass.MEASUREMENT
+
+    def __init__(self, api: WorltyLocal, mac_address: str) -> None:
+        """Initialize the entity."""
+        super().__init__(api, mac_address, "command_rtt")
+
+    @property
+    def native_value(self) -> StateType:
+        """Return the p95 round trip time."""
+        rtt = self.api.commands.rtt()
+        return round(rtt["p95"] * 1000) if rtt["count"] else None
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        """Return the percentiles per device type in milliseconds."""
+        return {
+            kind: {
+                key: round(value * 1000) if key != "count" else value
+                for key, value in rtt.items()
+            }
+            for kind, rtt in self.api.commands.as_dict()["rtt"].items()
+        }
+
+
+class WorltyCommandUnackedSensor(WorltyDiagnosticSensor):
+    """Commands the pad never acknowledged."""
+
+    _attr_state_class = SensorStateClass.TOTAL_INCREASING
+
+    def __init__(self, api: WorltyLocal, mac_address: str) -> None:
+        """Initialize the entity."""
+        super().__init__(api, mac_address, "command_unacked")
+
+    @property
+    def native_value(self) -> StateType:
+        """Return the number of failed commands."""
+        return self.api.commands.failed
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        """Return the tracker counters."""
+        metrics = self.api.commands.as_dict()
+        metrics.pop("rtt")
+        return metrics
+
+
+class WorltyPingRttSensor(WorltyDiagnosticSensor):
+    """Round trip time of the last ping to the pad."""
+
+    _attr_device_class = SensorDeviceClass.DURATION
+    _attr_native_unit_of_measurement = UnitOfTime.MILLISECONDS
+    _attr_state_class = SensorStateClass.MEASUREMENT
+    _attr_suggested_display_precision = 1
+
+    def __init__(self, api: WorltyLocal, mac_address: str) -> None:
+        """Initialize the entity."""
+        super().__init__(api, mac_address, "ping_rtt")
+
+    @property
+    def native_value(self) -> StateType:
+        """Return the last round trip time."""
+        rtt = self.api.liveness.rtt()
+        return rtt["last"] * 1000 if rtt["count"] else None
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        """Return the percentiles in milliseconds and the probe counters."""
+        metrics = self.api.liveness.as_dict()
+        return {
+            **{
+                key: round(value * 1000, 1) if key != "count" else value
+                for key, value in metrics["rtt"].items()
+            },
+            "probes": metrics["probes"],
+            "unanswered": metrics["unanswered"],
+        }
@@ -0,0 +1,228 @@
+"""Device snapshot storage for worlty integration.
+
+The device map is persisted as a base snapshot (a regular storage file) and
+an append-only journal of changed devices next to it. Flushes only append the
+devices that changed since the previous flush, the journal is compacted into
+the base snapshot in the background once it grows past the size of the map.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+from typing import Any
+
+from homeassistant.const import EVENT_HOMEASSISTANT_FINAL_WRITE
+from homeassistant.core import CALLBACK_TYPE, Event, HomeAssistant, callback
+from homeassistant.helpers.event import async_call_later
+from homeassistant.helpers.json import json_bytes
+from homeassistant.helpers.storage import STORAGE_DIR, Store
+from homeassistant.util.json import json_loads
+
+from .const import DEFAULT_SNAPSHOT_INTERVAL, DOMAIN, LOGGER
+from .devices import WorltyDeviceStore
+
+STORAGE_VERSION = 1
+JOURNAL_COMPACT_MIN_ENTRIES = 500
+
+
+def journal_line(unique_id: str, device: dict[str, Any]) -> bytes:
+    """Encode one journal entry."""
+    return json_bytes({"id": unique_id, "lct": device.get("lct", 0), "d": device}) + b"\n"
+
+
+def _append_journal(path: str, data: bytes) -> None:
+    """Append data to the journal file."""
+    with open(path, "ab") as journal:
+        journal.write(data)
+
+
+def _read_journal(path: str) -> bytes:
+    """Read the journal file."""
+    try:
+        with open(path, "rb") as journal:
+            return journal.read()
+    except FileNotFoundError:
+        return b""
+
+
+def _truncate_journal(path: str) -> None:
+    """Truncate the journal file."""
+    with open(path, "wb"):
+        pass
+
+
+def _remove_journal(path: str) -> None:
+    """Remove the journal file."""
+    try:
+        os.unlink(path)
+    except FileNotFoundError:
+        pass
+
+
+class WorltySnapshotStore:
+    """Write-behind store for the Worlty device map."""
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        entry_id: str,
+        interval: float = DEFAULT_SNAPSHOT_INTERVAL,
+    ) -> None:
+        """Initialize."""
+        self.hass = hass
+        self._store: Store[dict[str, Any]] = Store(
+            hass, STORAGE_VERSION, f"{DOMAIN}.{entry_id}"
+        )
+        self._journal_path = hass.config.path(
+            STORAGE_DIR, f"{DOMAIN}.{entry_id}.journal"
+        )
+        self._interval = interval
+        self._devices: dict[str, dict[str, Any]] = {}
+        self._records: WorltyDeviceStore | None = None
+        self._dirty: set[str] = set()
+        self._journal_entries = 0
+        self._lock = asyncio.Lock()
+        self._unsub_flush: CALLBACK_TYPE | None = None
+        self._unsub_final_write: CALLBACK_TYPE | None = None
+        self.bytes_written = 0
+        self.compactions = 0
+
+    async def async_load(
+        self, legacy_devices: dict[str, dict[str, Any]] | None = None
+    ) -> dict[str, dict[str, Any]]:
+        """Load the base snapshot and replay the journal.
+
+        The returned device frames seed a WorltyDeviceStore which must be
+        attached before the first flush, changes are then read from its
+        records.
+        """
+        data = await self._store.async_load()
+        if data is not None:
+            self._devices = data.get("devices", {})
+        elif legacy_devices:
+            LOGGER.debug(
+                "Import %d devices from config entry into storage", len(legacy_devices)
+            )
+            self._devices = dict(legacy_devices)
+            # Saved as the base right away, the entry can drop the map after this.
+            await self._store.async_save({"devices": self._devices})
+
+        journal = await self.hass.async_add_executor_job(
+            _read_journal, self._journal_path
+        )
+        for line in journal.splitlines():
+            try:
+                entry: dict[str, Any] = json_loads(line)
+            except ValueError:
+                # A torn write at the end of the journal, the base is still valid.
+                LOGGER.warning("Skip unreadable device journal entry")
+                continue
+            self._journal_entries += 1
+            current = self._devices.get(entry["id"])
+            if current is None or entry["lct"] >= current.get("lct", 0):
+                self._devices[entry["id"]] = entry["d"]
+
+        LOGGER.debug(
+            "Loaded %d devices, replayed %d journal entries",
+            len(self._devices),
+            self._journal_entries,
+        )
+        return self._devices
+
+    @callback
+    def attach(self, records: WorltyDeviceStore) -> None:
+        """Persist from records, the loaded frames are no longer needed."""
+        self._records = records
+        self._devices = {}
+
+    @callback
+    def async_mark_dirty(self, unique_id: str) -> None:
+        """Mark a device as changed and schedule a coalesced flush."""
+        self._dirty.add(unique_id)
+        if self._unsub_flush is None:
+            # Scheduled once per window so a chatty pad can not postpone it.
+            self._async_schedule_flush()
+
+    async def async_flush(self) -> None:
+        """Append pending changes to the journal now."""
+        self._async_cancel_flush()
+        async with self._lock:
+            await self._async_append_dirty()
+        if self._journal_entries > max(JOURNAL_COMPACT_MIN_ENTRIES, len(self._records)):
+            self.hass.async_create_background_task(
+                self.async_compact(), f"{DOMAIN} compact device journal"
+            )
+
+    async def async_compact(self) -> None:
+        """Fold the journal into the base snapshot."""
+        async with self._lock:
+            await self._async_append_dirty()
+            if self._journal_entries == 0:
+                return
+            data = {"devices": self._records.as_dict()}
+            await self._store.async_save(data)
+            await self.hass.async_add_executor_job(
+                _truncate_journal, self._journal_path
+            )
+            LOGGER.debug(
+                "Compacted %d journal entries into device snapshot",
+                self._journal_entries,
+            )
+            self._journal_entries = 0
+            self.compactions += 1
+
+    async def async_remove(self) -> None:
+        """Remove the storage files."""
+        self._async_cancel_flush()
+        self._dirty.clear()
+        await self._store.async_remove()
+        await self.hass.async_add_executor_job(_remove_journal, self._journal_path)
+
+    async def _async_append_dirty(self) -> None:
+        """Append every dirty device to the journal."""
+        if not self._dirty:
+            return
+        dirty, self._dirty = self._dirty, set()
+        data = b"".join(
+            journal_line(unique_id, record.as_dict())
+            for unique_id in dirty
+            if (record := self._records.get(unique_id)) is not None
+        )
+        await self.hass.async_add_executor_job(
+            _append_journal, self._journal_path, data
+        )
+        self._journal_entries += len(dirty)
+        self.bytes_written += len(data)
+        LOGGER.debug("Append %d changed devices to journal", len(dirty))
+
+    @callback
+    def _async_schedule_flush(self) -> None:
+        """Schedule a flush after the interval and on final write."""
+        self._unsub_flush = async_call_later(
+            self.hass, self._interval, self._async_flush_later
+        )
+        if self._unsub_final_write is None:
+            self._unsub_final_write = self.hass.bus.async_listen_once(
+                EVENT_HOMEASSISTANT_FINAL_WRITE, self._async_final_write
+            )
+
+    @callback
+    def _async_cancel_flush(self) -> None:
+        """Cancel scheduled flushes."""
+        if self._unsub_flush is not None:
+            self._unsub_flush()
+            self._unsub_flush = None
+        if self._unsub_final_write is not None:
+            self._unsub_final_write()
+            self._unsub_final_write = None
+
+    async def _async_flush_later(self, _now: Any) -> None:
+        """Flush when the interval elapsed."""
+        self._unsub_flush = None
+        await self.async_flush()
+
+    async def _async_final_write(self, _event: Event) -> None:
+        """Flush on Home Assistant shutdown."""
+        self._unsub_final_write = None
+        await self.async_flush()
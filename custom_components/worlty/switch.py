@@ -10,6 +10,7 @@ from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
 from .const import DOMAIN
 from .coordinator import WorltyDataCoordinator
+from .devices import WorltyDeviceRecord
 from .worlty import WorltyBaseEntity
 
 
@@ -25,15 +26,17 @@ async def async_setup_entry(
         entities = [
             WorltySwitch(coordinator.api, entity)
             for entity in coordinator.data.get(Platform.SWITCH, {}).values()
-            if entity.get("hide") is not True
+            if not entity.hide
         ]
 
     async_add_entities(entities)
 
     @callback
-    def async_add_entity(entity: dict[str, Any]):
-        """Add entity from API."""
-        async_add_entities([WorltySwitch(coordinator.api, entity)])
+    def async_add_entity(records: list[WorltyDeviceRecord]):
+        """Add the entities of new devices from API in one batch."""
+        async_add_entities(
+            [WorltySwitch(coordinator.api, record) for record in records]
+        )
 
     coordinator.api.register_add_listener(Platform.SWITCH, async_add_entity)
 
@@ -1,7 +1,6 @@
 """Worlty Input Time."""
 
-from datetime import time, timedelta, datetime, timezone
-from typing import Any
+from datetime import date, datetime, time, timedelta
 from homeassistant.components.time import TimeEntity
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import Platform
@@ -13,8 +12,11 @@ import re
 
 from .const import DOMAIN
 from .coordinator import WorltyDataCoordinator
+from .devices import WorltyDeviceRecord
 from .worlty import WorltyBaseEntity
 
+SPECIAL_TIME_PATTERN = re.compile(r"^(sunset|sunrise|noon|midnight)([+-]\d{1,2}:\d{2})?$")
+
 
 async def async_setup_entry(
     hass: HomeAssistant,
@@ -28,15 +30,17 @@ async def async_setup_entry(
         entities = [
             WorltyTime(coordinator.api, entity, hass)
             for entity in coordinator.data.get(Platform.TIME, {}).values()
-            if entity.get("hide") is not True
+            if not entity.hide
         ]
 
     async_add_entities(entities)
 
     @callback
-    def async_add_entity(entity: dict[str, Any]):
-        """Add entity from API."""
-        async_add_entities([WorltyTime(coordinator.api, entity, hass)])
+    def async_add_entity(records: list[WorltyDeviceRecord]):
+        """Add the entities of new devices from API in one batch."""
+        async_add_entities(
+            [WorltyTime(coordinator.api, record, hass) for record in records]
+        )
 
     coordinator.api.register_add_listener(Platform.TIME, async_add_entity)
 
@@ -44,6 +48,10 @@ async def async_setup_entry(
 class WorltyTime(WorltyBaseEntity, TimeEntity):
     """Worlty input time."""
 
+    _native_value: time | None
+    _special: tuple[str, timedelta] | None
+    _special_day: date | None
+
     def __init__(
         self, worlty_coordinator, worlty_entity_info, hass: HomeAssistant
     ) -> None:
@@ -56,51 +64,57 @@ class WorltyTime(WorltyBaseEntity, TimeEntity):
     def _update_entity(self) -> None:
         """Update entity."""
 
-    @property
-    def native_value(self) -> time | None:
-        """Return the current time of the entity."""
-        if self.worlty_state is None:
-            return None
+    def _update_state(self) -> None:
+        """Parse the state once per change."""
+        self._native_value = None
+        self._special = None
+        self._special_day = None
+        state = self.worlty_state
+        if not isinstance(state, str):
+            return
 
-        tz = timezone(timedelta(hours=0))
-        try:
-            state = self.worlty_state
-            if isinstance(state, str):
-                return self._parse_special_time(state)
+        match = SPECIAL_TIME_PATTERN.match(state)
+        if match:
+            keyword, offset_str = match.groups()
+            self._special = (
+                keyword,
+                self._parse_time_offset(offset_str) if offset_str else timedelta(0),
+            )
+            return
 
+        try:
             hours, minutes = map(int, state.split(":"))
-            return time(hour=hours, minute=minutes, timezone=tz)
-        except (ValueError, TypeError):
-            return None
-
-    def _parse_special_time(self, state: str) -> time | None:
-        """Parse and convert special time keywords (sunset, sunrise, etc.) with optional time adjustment."""
-        tz = timezone(timedelta(hours=0))
-        now = datetime.now(tz)
+            self._native_value = time(hour=hours, minute=minutes)
+        except ValueError:
+            pass
 
-        match = re.match(r"^(sunset|sunrise|noon|midnight)([+-]\d{1,2}:\d{2})?$", state)
-        if match:
-            keyword, offset_str = match.groups()
-            offset = timedelta(0)
-
-            if offset_str:
-                offset = self._parse_time_offset(offset_str)
-
-            base_time = None
-            if keyword == "sunset":
-                base_time = get_astral_event_date(self.hass, "sunset", dt_util.utcnow())
-            elif keyword == "sunrise":
-                base_time = get_astral_event_date(
-                    self.hass, "sunrise", dt_util.utcnow()
-                )
-            elif keyword == "noon":
-                base_time = datetime.combine(now.date(), time(12, 0))
-            elif keyword == "midnight":
-                base_time = datetime.combine(now.date(), time(0, 0))
-
-            if base_time:
-                adjusted_time = (base_time + offset).time()
-                return adjusted_time
+    @property
+    def native_value(self) -> time | None:
+        """Return the current time of the entity."""
+        if self._special is not None:
+            # Keywords move with the local day, resolve them once per day.
+            today = dt_util.now().date()
+            if self._special_day != today:
+                self._special_day = today
+                self._native_value = self._parse_special_time(today, *self._special)
+        return self._native_value
+
+    def _parse_special_time(
+        self, today: date, keyword: str, offset: timedelta
+    ) -> time | None:
+        """Convert special time keywords (sunset, sunrise, etc.) with time adjustment."""
+        base_time = None
+        if keyword == "sunset":
+            base_time = get_astral_event_date(self.hass, "sunset", today)
+        elif keyword == "sunrise":
+            base_time = get_astral_event_date(self.hass, "sunrise", today)
+        elif keyword == "noon":
+            base_time = datetime.combine(today, time(12, 0))
+        elif keyword == "midnight":
+            base_time = datetime.combine(today, time(0, 0))
+
+        if base_time:
+            return (base_time + offset).time()
         return None
 
     def _parse_time_offset(self, offset_str: str) -> timedelta:
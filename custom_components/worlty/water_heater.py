@@ -1,5 +1,6 @@
 """Worlty water heater."""
 
+from functools import lru_cache
 from typing import Any
 
 from homeassistant.components.climate import (
@@ -20,8 +21,10 @@ from homeassistant.const import ATTR_TEMPERATURE, Platform, UnitOfTemperature
 from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
+from .capabilities import WorltyBitmask
 from .const import DOMAIN
 from .coordinator import WorltyDataCoordinator
+from .devices import WorltyDeviceRecord
 from .worlty import WorltyBaseEntity
 
 HVAC_MODE_MAPPING = {
@@ -37,13 +40,27 @@ HVAC_MODE_MAPPING = {
     9: PRESET_BOOST,
 }
 
+HVAC_MODES = WorltyBitmask(HVAC_MODE_MAPPING, (HVACMode.OFF,))
+
 
 def hvac_mode_to_key(hvac_mode: str) -> int | None:
     """Convert hvac mode value to mode key."""
-    for key, mode in HVAC_MODE_MAPPING.items():
-        if mode == hvac_mode:
-            return key
-    return None
+    return HVAC_MODES.key(hvac_mode)
+
+
+@lru_cache(maxsize=None)
+def water_heater_capabilities(
+    sm: int,
+) -> tuple[tuple[str, ...], WaterHeaterEntityFeature]:
+    """Return the modes and features of the mode mask."""
+    hvac_modes = HVAC_MODES.decode(sm)
+
+    features = WaterHeaterEntityFeature.ON_OFF
+    features |= WaterHeaterEntityFeature.TARGET_TEMPERATURE
+    features |= WaterHeaterEntityFeature.OPERATION_MODE
+    if PRESET_AWAY in hvac_modes:
+        features |= WaterHeaterEntityFeature.AWAY_MODE
+    return hvac_modes, features
 
 
 async def async_setup_entry(
@@ -58,15 +75,17 @@ async def async_setup_entry(
         entities = [
             WorltyWaterHeater(coordinator.api, entity)
             for entity in coordinator.data.get(Platform.WATER_HEATER, {}).values()
-            if entity.get("hide") is not True
+            if not entity.hide
         ]
 
     async_add_entities(entities)
 
     @callback
-    def async_add_entity(entity: dict[str, Any]):
-        """Add entity from API."""
-        async_add_entities([WorltyWaterHeater(coordinator.api, entity)])
+    def async_add_entity(records: list[WorltyDeviceRecord]):
+        """Add the entities of new devices from API in one batch."""
+        async_add_entities(
+            [WorltyWaterHeater(coordinator.api, record) for record in records]
+        )
 
     coordinator.api.register_add_listener(Platform.WATER_HEATER, async_add_entity)
 
@@ -75,7 +94,7 @@ class WorltyWaterHeater(WorltyBaseEntity, WaterHeaterEntity):
     """Worlty water heater."""
 
     _supported_features: WaterHeaterEntityFeature
-    _hvac_modes: list[HVACMode]
+    _hvac_modes: tuple[str, ...]
 
     def __init__(self, worlty_coordinator, worlty_entity_info) -> None:
         """Initialize the entity."""
@@ -87,22 +106,9 @@ class WorltyWaterHeater(WorltyBaseEntity, WaterHeaterEntity):
     @callback
     def _update_entity(self) -> None:
         """Update entity."""
-        self._supported_features = 0
-        self._hvac_modes = [HVACMode.OFF]
-
-        sm = self.worlty_attribute.get("sm", 0)
-        for mode_bit, hvac_mode in HVAC_MODE_MAPPING.items():
-            if sm & (1 << mode_bit):
-                self._hvac_modes.append(hvac_mode)
-
-        features = WaterHeaterEntityFeature.ON_OFF
-        features |= WaterHeaterEntityFeature.TARGET_TEMPERATURE
-        features |= WaterHeaterEntityFeature.OPERATION_MODE
-
-        if PRESET_AWAY in self._hvac_modes:
-            features |= WaterHeaterEntityFeature.AWAY_MODE
-
-        self._supported_features = features
+        self._hvac_modes, self._supported_features = water_heater_capabilities(
+            self.worlty_attribute.get("sm", 0)
+        )
 
     @property
     def supported_features(self) -> WaterHeaterEntityFeature:
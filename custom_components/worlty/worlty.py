@@ -3,8 +3,12 @@
 import asyncio
 from collections import defaultdict
 import datetime
-import json
+from functools import lru_cache, partial
+import logging
 import random
+import socket
+import time
+from types import MappingProxyType
 from typing import Any, Optional
 
 from homeassistant.components.binary_sensor import BinarySensorEntityDescription
@@ -24,34 +28,73 @@ from homeassistant.helpers import device_registry as dr
 from homeassistant.helpers.device_registry import DeviceInfo
 from homeassistant.helpers.entity import Entity, generate_entity_id
 
+from .codec import (
+    FRAME_DELIMITER,
+    OFFLOAD_FRAME_SIZE,
+    READ_CHUNK_SIZE,
+    FrameTooLarge,
+    WorltyFrameDecoder,
+    get_codec,
+)
+from .commands import WorltyCommand, WorltyCommandTracker
+from .devices import WorltyDeviceRecord, WorltyDeviceStore
 from .const import (
+    CONF_OPTIMISTIC,
+    CONF_PING_INTERVAL,
+    CONF_RESYNC_BATCH,
+    CONF_SNAPSHOT_INTERVAL,
+    CONF_WRITE_BUDGET,
+    CONF_WRITE_INTERVAL,
+    DEFAULT_OPTIMISTIC,
+    DEFAULT_PING_INTERVAL,
+    DEFAULT_RESYNC_BATCH,
+    DEFAULT_SNAPSHOT_INTERVAL,
+    DEFAULT_WRITE_BUDGET,
+    DEFAULT_WRITE_INTERVAL,
     DOMAIN,
     LOGGER,
     MANUFACTURER,
+    PLATFORMS,
     WorltyBaseType,
+    WorltyConnectionState,
     get_worlty_description,
     map_worlty_state,
     map_worlty_sub,
     map_worlty_to_platform,
 )
+from .pipeline import (
+    WorltyInboundQueue,
+    WorltyLivenessMonitor,
+    WorltyOutboundQueue,
+    WorltyWriteScheduler,
+)
+from .resync import RESYNC_HEALTH_WAIT, WorltyFetchScheduler, WorltyResync
+from .store import WorltySnapshotStore
 
 BACKOFF_BASE = 1.0   # 초
 BACKOFF_CAP  = 30.0  # 초
+CONNECT_TIMEOUT = 10.0  # 초
+AUTH_TIMEOUT = 5.0  # 초
+HEALTH_TIMEOUT = 90.0  # 초
+COMMAND_FLUSH_DELAY = 0.05  # 초
+PUBLISH_TIMEOUT = 5.0  # 초
+# 핑이 없는 쪽도 커널이 반쯤 열린 연결을 정리하도록 한다.
+KEEPALIVE_IDLE = 10  # 초
+KEEPALIVE_INTERVAL = 3  # 초
+KEEPALIVE_COUNT = 3
+
+# 기능 목록을 바꾸는 필드, 나머지 필드는 상태만 바꾼다.
+CAPABILITY_FIELDS = frozenset({"sm", "sf", "ssw", "ssp", "sc"})
+# 상태 기록이 필요 없는 필드, event는 lct를 상태에 표시한다.
+STATELESS_FIELDS = frozenset({"lct", "hide"})
+# 기록 제한이 있을 때 먼저 기록하는 조작 가능한 플랫폼
+WRITE_PRIORITY_PLATFORMS = frozenset(
+    {Platform.LIGHT, Platform.SWITCH, Platform.CLIMATE, Platform.FAN, Platform.WATER_HEATER}
+)
 
 
-
-def map_worlty_entity_description(
-    worlty_type: int, worlty_class: int, worlty_sub: str
-) -> tuple:
-    """Map for Worlty entity description."""
-    key, device_class, icon, unit_of_measurement = get_worlty_description(
-        worlty_type, worlty_class
-    )
-    if key is None:
-        return None, "unknown"
-
-    platform_type = map_worlty_to_platform(worlty_type, worlty_class)
-    entity_description_cls = {
+ENTITY_DESCRIPTION_CLASSES = MappingProxyType(
+    {
         Platform.BINARY_SENSOR: BinarySensorEntityDescription,
         Platform.CLIMATE: ClimateEntityDescription,
         Platform.FAN: FanEntityDescription,
@@ -62,7 +105,27 @@ def map_worlty_entity_description(
         Platform.SENSOR: SensorEntityDescription,
         Platform.SWITCH: SwitchEntityDescription,
         Platform.WATER_HEATER: WaterHeaterEntityDescription,
-    }.get(platform_type)
+    }
+)
+
+
+@lru_cache(maxsize=None)
+def map_worlty_entity_description(
+    worlty_type: int, worlty_class: int, worlty_sub: str, language: str
+) -> tuple:
+    """Map for Worlty entity description.
+
+    Descriptions are frozen, one instance per (type, class, sub, language)
+    is shared by every entity.
+    """
+    key, device_class, icon, unit_of_measurement = get_worlty_description(
+        worlty_type, worlty_class
+    )
+    if key is None:
+        return None, "unknown"
+
+    platform_type = map_worlty_to_platform(worlty_type, worlty_class)
+    entity_description_cls = ENTITY_DESCRIPTION_CLASSES.get(platform_type)
 
     if entity_description_cls:
         if unit_of_measurement is not None:
@@ -98,7 +161,6 @@ class WorltyLocal:
         host: str,
         port: int,
         access_token: str,
-        async_event_handler,
     ) -> None:
         """Initialize."""
         self.hass = hass
@@ -108,20 +170,49 @@ class WorltyLocal:
         self._access_token: str = access_token
         self._subscribe = None
         self._publish = None
-        self._async_event_handler = async_event_handler
+        self._codec = get_codec()
+        self._frames = WorltyFrameDecoder()
         self._disconnect = False
         self._connected = False
-        self._reconnect = False
-        self._health = datetime.datetime.now()
-        self._queue: list[dict[str, Any]] = []
+        self._supervisor: Optional[asyncio.Task] = None
+        self.state = WorltyConnectionState.STOPPED
+        self._state_since = time.monotonic()
+        self._state_time: dict[WorltyConnectionState, float] = {
+            state: 0.0 for state in WorltyConnectionState
+        }
+        self._lost_at: Optional[float] = None
+        self.recoveries = 0
+        self.last_recovery = 0.0
+        self.max_recovery = 0.0
+        self._queue: dict[int, dict[str, Any]] = {}
+        self._queue_flush: Optional[asyncio.TimerHandle] = None
+        self._queue_types: dict[int, Any] = {}
+        self._ack_timer: Optional[asyncio.TimerHandle] = None
+        self._snapshot: Optional[WorltySnapshotStore] = None
+        self._processor: Optional[asyncio.Task] = None
+        self._writer: Optional[asyncio.Task] = None
+        self.inbound = WorltyInboundQueue()
+        self.outbound = WorltyOutboundQueue()
+        self.commands = WorltyCommandTracker()
+        self.writes = WorltyWriteScheduler()
+        self.liveness = WorltyLivenessMonitor(HEALTH_TIMEOUT)
+        self._ping_pk: Optional[int] = None
+        self.resync = WorltyResync()
+        self.fetches = WorltyFetchScheduler()
+        self._fetch_timer: Optional[asyncio.TimerHandle] = None
+        self._resync_timer: Optional[asyncio.TimerHandle] = None
 
         self._add_entity_listeners: dict[Platform, Any] = defaultdict()
-        self._entity_map: dict[str, dict[str, Any]] = {}
-        self._health_map: dict[str, int] = {}
-        self._entities: dict[Platform, dict[str, dict[str, Any]]] = defaultdict(dict)
+        self._pending_adds: dict[Platform, dict[str, WorltyDeviceRecord]] = {}
+        self.platforms: set[Platform] = set()
+        self._platform_loads: dict[Platform, asyncio.Task] = {}
+        self._adds_flush: Optional[asyncio.Handle] = None
+        self.entities_added = 0
+        self.entity_batches = 0
+        self.devices = WorltyDeviceStore()
         self.worlty_pad: Optional[WorltyBaseDevice] = None
-        self.worlty_entity: dict[str, WorltyBaseEntity] = {}
         self.worlty_entities: dict[Platform, list[WorltyBaseEntity]] = defaultdict(list)
+        self._optimistic: dict[int, dict[str, WorltyBaseEntity]] = {}
         LOGGER.debug(f"API created with {self._host}:{self._port}")
 
     @classmethod
@@ -131,10 +222,9 @@ class WorltyLocal:
         host: str,
         port: int,
         access_token: str,
-        async_event_handler,
     ):
         """Create Worlty API."""
-        instance = cls(hass, host, port, access_token, async_event_handler)
+        instance = cls(hass, host, port, access_token)
 
         return instance
 
@@ -144,44 +234,75 @@ class WorltyLocal:
         return random.uniform(0, expo)
 
     async def _connect(self) -> bool:
-        """Connnect device."""
-        
-        attempt = 0
-        while not self._disconnect:
-            try:
-                LOGGER.debug(
-                    "[%s] Try connect to %s:%s",
-                    self.worlty_pad.device_id if self.worlty_pad is not None else self._host,
-                    self._host, self._port,
-                )
-                self._subscribe, self._publish = await asyncio.open_connection(self._host, self._port)
-                self._connected = True
-                LOGGER.debug(
-                    "[%s] Connected to %s:%s",
-                    self.worlty_pad.device_id if self.worlty_pad is not None else self._host,
-                    self._host, self._port,
-                )
-                return True
-            except (OSError, asyncio.TimeoutError) as e:
-                self._connected = False
-                delay = self._compute_backoff(attempt)
-                LOGGER.error("Connection failed (attempt=%d). Error: %s. retry in %.2fs", attempt+1, e, delay)
-            except Exception as e:
-                self._connected = False
-                delay = self._compute_backoff(attempt)
-                LOGGER.error("Unexpected error: %s. retry in %.2fs", e, delay)
+        """Open the connection, retrying is up to the supervisor."""
+        LOGGER.debug(
+            "[%s] Try connect to %s:%s",
+            self.worlty_pad.device_id if self.worlty_pad is not None else self._host,
+            self._host, self._port,
+        )
+        try:
+            self._subscribe, self._publish = await asyncio.wait_for(
+                asyncio.open_connection(self._host, self._port), CONNECT_TIMEOUT
+            )
+        except (OSError, asyncio.TimeoutError) as e:
+            self._connected = False
+            LOGGER.error("Connection failed. Error: %s", e)
+            return False
+        except Exception as e:
+            self._connected = False
+            LOGGER.error("Unexpected error: %s", e)
+            return False
 
-            attempt += 1
-            await asyncio.sleep(delay)
+        self._tune_socket()
+        self._frames = WorltyFrameDecoder()
+        # Frames queued for the previous connection must not precede auth.
+        self.outbound.clear()
+        self._writer = self.hass.async_create_background_task(
+            self._write_frames(self._publish), f"{DOMAIN} write frames"
+        )
+        self._connected = True
+        LOGGER.debug(
+            "[%s] Connected to %s:%s",
+            self.worlty_pad.device_id if self.worlty_pad is not None else self._host,
+            self._host, self._port,
+        )
+        return True
 
-        LOGGER.warning("Connect aborted by _disconnect")
-        return False
+    def _tune_socket(self) -> None:
+        """Disable Nagle and let the kernel probe a silent connection."""
+        sock = self._publish.get_extra_info("socket")
+        if sock is None:
+            return
+        options = [
+            (socket.IPPROTO_TCP, socket.TCP_NODELAY, 1),
+            (socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1),
+        ]
+        # Linux names, macOS only has TCP_KEEPALIVE for the idle time.
+        for name, value in (
+            ("TCP_KEEPIDLE", KEEPALIVE_IDLE),
+            ("TCP_KEEPINTVL", KEEPALIVE_INTERVAL),
+            ("TCP_KEEPCNT", KEEPALIVE_COUNT),
+        ):
+            if hasattr(socket, name):
+                options.append((socket.IPPROTO_TCP, getattr(socket, name), value))
+        for level, option, value in options:
+            try:
+                sock.setsockopt(level, option, value)
+            except OSError as e:
+                LOGGER.debug("Socket option %s not set > [%s]", option, e)
 
     def terminate(self) -> None:
         """Terminate stream."""
         self._connected = False
-        if self.worlty_pad is not None:
-            self.worlty_pad.device_available = False
+        self._set_available(False)
+        self.liveness.stop()
+        if self._resync_timer is not None:
+            self._resync_timer.cancel()
+            self._resync_timer = None
+        if self._writer is not None:
+            if self._writer is not asyncio.current_task():
+                self._writer.cancel()
+            self._writer = None
         if self._publish:
             try:
                 self._publish.close()
@@ -194,26 +315,58 @@ class WorltyLocal:
     async def disconnect(self):
         """Disconnect device."""
         self._disconnect = True
+        if self._supervisor is not None:
+            self._supervisor.cancel()
+            self._supervisor = None
+        self.terminate()
+        if self._queue_flush is not None:
+            self._queue_flush.cancel()
+            self._queue_flush = None
+        if self._ack_timer is not None:
+            self._ack_timer.cancel()
+            self._ack_timer = None
+        if self._fetch_timer is not None:
+            self._fetch_timer.cancel()
+            self._fetch_timer = None
+        self.writes.clear()
+        if self._adds_flush is not None:
+            self._adds_flush.cancel()
+            self._adds_flush = None
+        if self._processor is not None:
+            self._processor.cancel()
+            self._processor = None
+        if self._snapshot is not None:
+            await self._snapshot.async_flush()
         
-    async def is_connected(self) -> bool:
-        """Check stream state."""
-        if not self._publish or self._publish.is_closing():
-            return False
-        if not self._subscribe or self._subscribe.at_eof():
-            return False
-        return self._connected
+    def as_diagnostics(self) -> dict[str, Any]:
+        """Return runtime metrics for diagnostics."""
+        return {
+            "inbound": self.inbound.as_dict(),
+            "outbound": self.outbound.as_dict(),
+            "commands": self.commands.as_dict(),
+            "connection": self.connection_metrics(),
+            "liveness": self.liveness.as_dict(),
+            "devices": self.devices.metrics(),
+            "writes": self.writes.as_dict(),
+            "resync": self.resync.as_dict(),
+            "fetches": self.fetches.as_dict(),
+            "entities": {
+                "added": self.entities_added,
+                "batches": self.entity_batches,
+                "held": {
+                    platform: len(records)
+                    for platform, records in self._pending_adds.items()
+                },
+            },
+            "frames": {"codec": self._codec.name, **self._frames.as_dict()},
+        }
 
     async def auth(self, entry: ConfigEntry = None):
         """Auth device."""
-        if self._connected is False:
-            connected = await self._connect()
-            if self.worlty_pad is not None:
-                self.worlty_pad.device_available = connected
+        if self._connected is False and not await self._connect():
+            return False, "cannot_connect"
 
-            if connected is False:
-                return connected, "cannot_connect"
-
-        message: dict[str, Any] = await self.subscribe(5)
+        message: dict[str, Any] = await self.subscribe(AUTH_TIMEOUT)
         if message.get("error") or message.get("type") is None:
             self.terminate()
 
@@ -223,10 +376,9 @@ class WorltyLocal:
             return False, "unreachable"
 
         if message.get("type") == "auth_required":
-            await asyncio.sleep(0.5)
             await self.publish({"type": "auth", "access_token": self._access_token, "platform": "ha"})
 
-        message = await self.subscribe(5)
+        message = await self.subscribe(AUTH_TIMEOUT)
         if message.get("error"):
             LOGGER.error(
                 f"[{self.worlty_pad.device_id if self.worlty_pad is not None else self._host}] Can not auth device {self._host}:{self._port}, error: no_response, message: {message}"
@@ -242,39 +394,16 @@ class WorltyLocal:
                 return True, data
             if self._entry is None:
                 self._entry = entry
-                self._health = datetime.datetime.now()
-
-                if (
-                    self.hass.data[DOMAIN][self._entry.entry_id].get("health")
-                    is not None
-                ):
-                    self.hass.data[DOMAIN][self._entry.entry_id]["health"].cancel()
-
-                self.hass.data[DOMAIN][self._entry.entry_id]["health"] = (
-                    self.hass.loop.create_task(self.health_check())
-                )
-
-                self.worlty_pad = WorltyBaseDevice(data)
-                device_registry = dr.async_get(self.hass)
-                device_registry.async_get_or_create(
-                    config_entry_id=self._entry.entry_id,
-                    identifiers={(DOMAIN, self.worlty_pad.mac_address)},
-                    serial_number=self.worlty_pad.mac_address,
-                    manufacturer=self.worlty_pad.manufacturer,
-                    name=self.worlty_pad.device_id,
-                    model=self.worlty_pad.device_model,
-                    sw_version=self.worlty_pad.fw_version,
-                )
-
-                self._entity_map: dict[str, dict[str, Any]] = self.get_data(
-                    "devices", {}
-                )
-
-                for device in self._entity_map.copy().values():
-                    self.update_device(device)
-                    
-                for k, v in data.items():
-                    self.set_data(k, v)
+                if entry.unique_id is None:
+                    self.hass.config_entries.async_update_entry(
+                        entry, unique_id=data.get("mac_address")
+                    )
+                await self._setup_pad(data)
+                self.set_data(data)
+            elif data.get("version") != self.worlty_pad.fw_version:
+                # Warm started from the entry, store what the pad runs now.
+                self.worlty_pad.fw_version = data.get("version")
+                self.set_data(data)
 
             LOGGER.debug(
                 f"[{self.worlty_pad.device_id if self.worlty_pad is not None else self._host}] Authenticated {self._host}:{self._port}"
@@ -285,56 +414,72 @@ class WorltyLocal:
         )
         return False, "invalid_access_token"
 
-    async def reauth(self) -> bool:
-        """Retry auth."""
-        if self._disconnect:
-            return False
-
-        if self._connected is False:
-            attempt = 0
-            auth, _ = await self.auth(self._entry)
-            while not auth and not self._disconnect:
-                if self._connected:
-                    self._connected = False
-                    self.terminate()
+    async def async_warm_start(self, entry: ConfigEntry) -> bool:
+        """Load the pad and its devices from the entry before connecting.
 
-                delay = self._compute_backoff(attempt)
-                await asyncio.sleep(delay)
-                auth, _ = await self.auth(self._entry)
-                attempt += 1
-
-            if not auth:
-                return False
-
-            if self.worlty_pad is not None:
-                self.worlty_pad.device_available = auth
-
-            task = self.hass.data[DOMAIN][self._entry.entry_id].get("task")
-            if task:
-                task.cancel()
-                self.hass.data[DOMAIN][self._entry.entry_id]["task"] = None
-
-            result = await self.get_worlty_devices()
-            if result is None:
-                self._connected = False
-                self.terminate()
-                return False
-
-            self.hass.data[DOMAIN][self._entry.entry_id]["task"] = self.hass.async_create_task(self.listen_for_message())
+        Returns False when the entry never stored pad information, then the
+        first authentication sets the pad up.
+        """
+        if self._entry is not None or not entry.data.get("mac_address"):
+            return False
+        self._entry = entry
+        await self._setup_pad(entry.data)
+        self.worlty_pad.device_available = False
+        return True
 
-            self._health = datetime.datetime.now()
-            if (h := self.hass.data[DOMAIN][self._entry.entry_id].get("health")):
-                h.cancel()
-            self.hass.data[DOMAIN][self._entry.entry_id]["health"] = self.hass.async_create_task(self.health_check())
+    async def _setup_pad(self, data: dict[str, Any]) -> None:
+        """Register the pad and load the device snapshot."""
+        self.worlty_pad = WorltyBaseDevice(data)
+        device_registry = dr.async_get(self.hass)
+        device_registry.async_get_or_create(
+            config_entry_id=self._entry.entry_id,
+            identifiers={(DOMAIN, self.worlty_pad.mac_address)},
+            serial_number=self.worlty_pad.mac_address,
+            manufacturer=self.worlty_pad.manufacturer,
+            name=self.worlty_pad.device_id,
+            model=self.worlty_pad.device_model,
+            sw_version=self.worlty_pad.fw_version,
+        )
 
-            self._reconnect = True
-        return True
+        self._snapshot = WorltySnapshotStore(
+            self.hass,
+            self._entry.entry_id,
+            self._entry.options.get(CONF_SNAPSHOT_INTERVAL, DEFAULT_SNAPSHOT_INTERVAL),
+        )
+        self.devices.device_id = self.worlty_pad.device_id
+        self.devices.load(
+            (await self._snapshot.async_load(self.get_data("devices", {}))).values()
+        )
+        self._snapshot.attach(self.devices)
+        if "devices" in self._entry.data:
+            # Imported into the snapshot store, the entry keeps pad information only.
+            self.hass.config_entries.async_update_entry(
+                self._entry,
+                data={
+                    key: value
+                    for key, value in self._entry.data.items()
+                    if key != "devices"
+                },
+            )
 
-    def set_data(self, name: str, value: Any) -> Any:
-        """Set entry data."""
+    def _set_available(self, available: bool) -> None:
+        """Set pad availability and write every entity when it changes."""
+        if self.worlty_pad is None or self.worlty_pad.device_available == available:
+            return
+        self.worlty_pad.device_available = available
+        for record in self.devices:
+            if record.entity is not None:
+                record.entity._update_callback()
+
+    def set_data(self, data: dict[str, Any]) -> None:
+        """Set entry data.
+
+        The entry only holds connection settings and pad information, the
+        device map lives in WorltySnapshotStore.
+        """
         if self._entry is None:
-            return value
-        
+            return
+
         new_data = {
             "ip_address": self._host,
             "port": self._port,
@@ -346,13 +491,19 @@ class WorltyLocal:
             "device": {},
         }
 
-        new_data.update({name: value})
+        new_data.update(data)
 
         self.hass.config_entries.async_update_entry(
             entry=self._entry,
             data=new_data,
         )
-        return value
+
+    @property
+    def optimistic(self) -> bool:
+        """Return True if entities show commanded state before the pad confirms it."""
+        return self._entry is not None and self._entry.options.get(
+            CONF_OPTIMISTIC, DEFAULT_OPTIMISTIC
+        )
 
     def get_data(self, name: str, default_value=False) -> Any:
         """Get entry data."""
@@ -361,66 +512,113 @@ class WorltyLocal:
         
         return self._entry.data.get(name, default_value)
 
-    async def reconnect(self) -> bool:
-        """Recoonect."""
-        self.terminate()
-        try:
-            return await self._connect()
-        except Exception:
-            return False
-
     async def publish(self, payload) -> bool:
-        """Publish message."""
+        """Queue message for the writer, never waits for the socket."""
         try:
-            message = json.dumps(payload)
+            # Delimited, the writer joins queued frames into one write.
+            message = self._codec.dumps(payload) + FRAME_DELIMITER
         except TypeError as e:
             LOGGER.error(f"JSON serialization failed: {e}")
             return False
 
-        if not self._publish:
-            LOGGER.error("Publish object is not initialized.")
+        if not self._publish or self._writer is None:
+            LOGGER.error(
+                "[%s] Publish failed > [not connected]",
+                self.worlty_pad.device_id if self.worlty_pad is not None else self._host,
+            )
             return False
 
-        try:
-            if not await self.is_connected():
-                if not await self.reconnect():
-                    LOGGER.error(f"Reconnect failed")
-                    return False
+        return self.outbound.put(message)
 
-            LOGGER.debug(
-                f"[{self.worlty_pad.device_id if self.worlty_pad is not None else self._host}] Publish message > [{message}]"
-            )
-            self._publish.write(message.encode())
-            await asyncio.wait_for(self._publish.drain(), timeout=5)
-            return True
-        except asyncio.TimeoutError:
-            LOGGER.error(
-                f"[{self.worlty_pad.device_id if self.worlty_pad is not None else self._host}] Publish failed > [timeout]"
-            )
-        except (ConnectionResetError, BrokenPipeError, asyncio.IncompleteReadError):
-            LOGGER.error(
-                f"[{self.worlty_pad.device_id if self.worlty_pad is not None else self._host}] Publish failed > [reset]"
-            )
-        except Exception as e:
-            LOGGER.error(
-                f"[{self.worlty_pad.device_id if self.worlty_pad is not None else self._host}] Publish failed > [{e}]"
-            )
-        return False
+    async def _write_frames(self, writer: asyncio.StreamWriter) -> None:
+        """Write queued frames, the only coroutine that touches the transport."""
+        while True:
+            frames = await self.outbound.get_batch()
+            data = b"".join(frames)
+            if LOGGER.isEnabledFor(logging.DEBUG):
+                LOGGER.debug(
+                    "[%s] Publish %d messages > [%s]",
+                    self.worlty_pad.device_id if self.worlty_pad is not None else self._host,
+                    len(frames),
+                    data[:512],
+                )
+
+            started = time.monotonic()
+            try:
+                writer.write(data)
+                await asyncio.wait_for(writer.drain(), timeout=PUBLISH_TIMEOUT)
+            except asyncio.TimeoutError:
+                LOGGER.error(
+                    f"[{self.worlty_pad.device_id if self.worlty_pad is not None else self._host}] Publish failed > [timeout]"
+                )
+            except (ConnectionResetError, BrokenPipeError, asyncio.IncompleteReadError):
+                LOGGER.error(
+                    f"[{self.worlty_pad.device_id if self.worlty_pad is not None else self._host}] Publish failed > [reset]"
+                )
+            except Exception as e:
+                LOGGER.error(
+                    f"[{self.worlty_pad.device_id if self.worlty_pad is not None else self._host}] Publish failed > [{e}]"
+                )
+            else:
+                self.outbound.record_write(
+                    len(frames), len(data), time.monotonic() - started
+                )
+                continue
+
+            # Closing the stream ends the listener, which owns reconnecting.
+            self.terminate()
+            return
 
     async def subscribe(self, timeout: float = None) -> dict[str, Any]:
         """Subscribe message."""
         try:
-            line = await asyncio.wait_for(self._subscribe.readline(), timeout=timeout)
-            if not line: 
-                self._connected = False
-                return {"error": "connection_lost"}
-
-            msg = line.decode("utf-8", errors="replace").strip()
-            if not msg:
-                return {}
-            LOGGER.debug("[%s] message decode > [%s]",
-                        self.worlty_pad.device_id if self.worlty_pad else self._host, msg)
-            return json.loads(msg)
+            while True:
+                try:
+                    frame = self._frames.next_frame()
+                except FrameTooLarge:
+                    LOGGER.warning(
+                        "[%s] Skip frame larger than the frame limit",
+                        self.worlty_pad.device_id if self.worlty_pad else self._host,
+                    )
+                    continue
+
+                if frame is None:
+                    if timeout is None:
+                        data = await self._subscribe.read(READ_CHUNK_SIZE)
+                    else:
+                        data = await asyncio.wait_for(
+                            self._subscribe.read(READ_CHUNK_SIZE), timeout=timeout
+                        )
+                    if not data:
+                        self._connected = False
+                        return {"error": "connection_lost"}
+                    self.liveness.seen()
+                    self._frames.feed(data)
+                    continue
+
+                try:
+                    if len(frame) >= OFFLOAD_FRAME_SIZE:
+                        message = await self.hass.async_add_executor_job(
+                            self._codec.loads, frame
+                        )
+                    else:
+                        message = self._codec.loads(frame)
+                except ValueError as e:
+                    LOGGER.warning(
+                        "[%s] Skip undecodable frame > [%s]",
+                        self.worlty_pad.device_id if self.worlty_pad else self._host,
+                        e,
+                    )
+                    continue
+
+                if LOGGER.isEnabledFor(logging.DEBUG):
+                    LOGGER.debug(
+                        "[%s] message decode > %d bytes [%s]",
+                        self.worlty_pad.device_id if self.worlty_pad else self._host,
+                        len(frame),
+                        frame[:512],
+                    )
+                return message if isinstance(message, dict) else {}
 
         except asyncio.TimeoutError:
             return {"error": "timeout"}
@@ -433,86 +631,204 @@ class WorltyLocal:
             self._connected = False
             return {"error": "connection_lost"}
 
-    async def health_check(self):
-        """Health check."""
-        while not self._disconnect:
-            await asyncio.sleep(1)
-            elapsed = datetime.datetime.now() - self._health
-            if elapsed >= datetime.timedelta(seconds=90):
-                LOGGER.debug(
-                    f"[{self.worlty_pad.device_id if self.worlty_pad else self._host}] Health elapsed 90 seconds"
-                )
-                break
+    async def start(self, entry: ConfigEntry, wait: bool = True) -> bool:
+        """Start the supervisor.
 
-        task = self.hass.data[DOMAIN][self._entry.entry_id].get("task")
-        if task:
-            task.cancel()
-        self.terminate()
-        if not self._disconnect:
-            await self.reauth()
+        With wait return once the first connection attempt ended, True if it
+        authenticated.
+        """
+        self._disconnect = False
+        self.writes.interval = entry.options.get(
+            CONF_WRITE_INTERVAL, DEFAULT_WRITE_INTERVAL
+        )
+        self.writes.budget = entry.options.get(CONF_WRITE_BUDGET, DEFAULT_WRITE_BUDGET)
+        self.fetches.chunk = entry.options.get(CONF_RESYNC_BATCH, DEFAULT_RESYNC_BATCH)
+        self.liveness.idle = entry.options.get(CONF_PING_INTERVAL, DEFAULT_PING_INTERVAL)
+        if self._processor is None or self._processor.done():
+            self._processor = self.hass.async_create_background_task(
+                self.process_messages(), f"{DOMAIN} process messages"
+            )
+        attempted = asyncio.Event()
+        self._supervisor = self.hass.async_create_background_task(
+            self._supervise(entry, attempted), f"{DOMAIN} supervisor"
+        )
+        if not wait:
+            return False
+        await attempted.wait()
+        return self.state in (
+            WorltyConnectionState.SYNCING,
+            WorltyConnectionState.LIVE,
+        )
 
-    async def listen_for_message(self):
-        """Listen for Wolrty message."""
+    def _set_state(self, state: WorltyConnectionState) -> None:
+        """Enter a connection state and account the time spent in the last one."""
+        now = time.monotonic()
+        self._state_time[self.state] += now - self._state_since
+        if state is WorltyConnectionState.LIVE and self._lost_at is not None:
+            self.last_recovery = now - self._lost_at
+            self.max_recovery = max(self.max_recovery, self.last_recovery)
+            self.recoveries += 1
+            self._lost_at = None
+        elif self.state is WorltyConnectionState.LIVE:
+            self._lost_at = now
         LOGGER.debug(
-            f"[{self.worlty_pad.device_id if self.worlty_pad is not None else self._host}] Listen for Wolrty message"
+            "[%s] Connection %s > %s (%.3fs)",
+            self.worlty_pad.device_id if self.worlty_pad is not None else self._host,
+            self.state,
+            state,
+            now - self._state_since,
         )
+        self.state = state
+        self._state_since = now
+
+    def connection_metrics(self) -> dict[str, Any]:
+        """Return the supervisor state and the time spent per state."""
+        time_in_state = dict(self._state_time)
+        time_in_state[self.state] += time.monotonic() - self._state_since
+        return {
+            "state": self.state,
+            "time_in_state": {
+                state: round(spent, 3) for state, spent in time_in_state.items()
+            },
+            "recoveries": self.recoveries,
+            "last_recovery": round(self.last_recovery, 3),
+            "max_recovery": round(self.max_recovery, 3),
+        }
+
+    async def _supervise(self, entry: ConfigEntry, attempted: asyncio.Event) -> None:
+        """Own the connection: connect, authenticate, listen, back off, repeat."""
+        attempt = 0
         try:
-            """Listen for Wolrty message."""
-            LOGGER.debug(
-                f"[{self.worlty_pad.device_id if self.worlty_pad is not None else self._host}] Subscribe message, connection[{self._connected}]"
-            )
-            await asyncio.sleep(1)
-            while self._connected:
-                message = await self.subscribe(3)
-
-                if message.get("error") == "connection_lost":
-                    LOGGER.warning("[%s] Socket closed. Reconnecting...",
-                                self.worlty_pad.device_id if self.worlty_pad else self._host)
-                    self._connected = False
-                    break
-                elif message.get("data"):
-                    self._health = datetime.datetime.now()
-                    self.hass.loop.create_task(self.handle_message(message))
-                elif message.get("error") == "timeout":
-                    continue
-                else:
-                    LOGGER.debug("[%s] Invalid message %s",
-                                self.worlty_pad.device_id if self.worlty_pad else self._host, message)
+            while not self._disconnect:
+                self._set_state(WorltyConnectionState.CONNECTING)
+                if await self._connect():
+                    self._set_state(WorltyConnectionState.AUTHENTICATING)
+                    auth, _ = await self.auth(entry)
+                    if auth is True:
+                        attempt = 0
+                        self._set_available(True)
+                        self.fetches.clear()
+                        self.resync.begin()
+                        self._set_state(WorltyConnectionState.SYNCING)
+                        if len(self.devices) > 0:
+                            # Without known devices only the health tells what to get.
+                            self._resync_timer = self.hass.loop.call_later(
+                                RESYNC_HEALTH_WAIT, self._resync_without_health
+                            )
+                        attempted.set()
+                        await self._listen()
+                attempted.set()
+                self.terminate()
+                if self._disconnect:
                     break
-        except asyncio.CancelledError:
-            LOGGER.debug(
-                f"[{self.worlty_pad.device_id if self.worlty_pad is not None else self._host}] Listener cancelled"
-            )
+
+                delay = self._compute_backoff(attempt)
+                attempt += 1
+                self._set_state(WorltyConnectionState.BACKOFF)
+                LOGGER.debug(
+                    "[%s] Reconnect in %.2fs",
+                    self.worlty_pad.device_id if self.worlty_pad is not None else self._host,
+                    delay,
+                )
+                await asyncio.sleep(delay)
         finally:
-            if self.worlty_pad is not None:
-                self.worlty_pad.device_available = False
+            attempted.set()
+            self.terminate()
+            self._set_state(WorltyConnectionState.STOPPED)
 
+    async def _listen(self) -> None:
+        """Read frames until the connection is lost or the pad falls silent."""
+        LOGGER.debug(
+            f"[{self.worlty_pad.device_id if self.worlty_pad is not None else self._host}] Listen for Wolrty message"
+        )
+        # Reads block without a timeout, the monitor closes a silent connection.
+        self.liveness.start(self._health_expired, self._ping)
+        while self._connected:
+            message = await self.subscribe()
+
+            if message.get("error") == "connection_lost":
+                LOGGER.warning("[%s] Socket closed. Reconnecting...",
+                            self.worlty_pad.device_id if self.worlty_pad else self._host)
+                break
+            elif message.get("data"):
+                message_type = message.get("type")
+                if message_type == "health":
+                    self.liveness.health()
+                elif (
+                    message_type == "update"
+                    and self.liveness.probing
+                    and any(
+                        isinstance(device, dict) and device.get("pk") == self._ping_pk
+                        for device in message["data"].get("devices") or ()
+                    )
+                ):
+                    self.liveness.answered()
+                self.inbound.put(message)
+            else:
+                LOGGER.debug("[%s] Invalid message %s",
+                            self.worlty_pad.device_id if self.worlty_pad else self._host, message)
+                break
+
+    @callback
+    def _ping(self) -> bool:
+        """Get one device to probe an idle pad, return False if none is known."""
+        record = self.devices.get_pk(self._ping_pk) if self._ping_pk is not None else None
+        if record is None or record.hide:
+            # The probed device is gone or hidden, probe a current one.
+            record = next(
+                (
+                    record
+                    for record in self.devices
+                    if record.parent is None and not record.hide
+                ),
+                None,
+            )
+            if record is None:
+                self._ping_pk = None
+                return False
+            self._ping_pk = record.pk
+        self.hass.async_create_task(
+            self.publish({"type": "get", "data": {"devices": [self._ping_pk]}})
+        )
+        return True
+
+    @callback
+    def _health_expired(self) -> None:
+        """Close a connection the pad stayed silent on."""
+        if self.liveness.probing:
+            LOGGER.warning(
+                "[%s] Ping not answered in %.1f seconds",
+                self.worlty_pad.device_id if self.worlty_pad else self._host,
+                self.liveness.probe_timeout,
+            )
+        else:
             LOGGER.debug(
-                f"[{self.worlty_pad.device_id if self.worlty_pad is not None else self._host}] Listener finished"
+                "[%s] Health elapsed %.0f seconds",
+                self.worlty_pad.device_id if self.worlty_pad else self._host,
+                self.liveness.last_silence,
             )
-            self._connected = False
-            self.terminate()
+        self.terminate()
 
-            await asyncio.sleep(1)
-            
-            if self._disconnect is False:
-                LOGGER.debug(
-                    "[%s] Try auth as listener finished",
-                    self.worlty_pad.device_id if self.worlty_pad is not None else self._host,
+    async def process_messages(self) -> None:
+        """Apply queued messages one at a time in arrival order."""
+        while not self._disconnect:
+            message = await self.inbound.get()
+            try:
+                if lost := self.inbound.take_lost():
+                    # Updates dropped by a full queue, get the current state.
+                    await self._fetch(lost)
+                await self.handle_message(message)
+            except Exception:
+                LOGGER.exception(
+                    "[%s] Handle message failed > [%s]",
+                    self.worlty_pad.device_id if self.worlty_pad else self._host,
+                    message.get("type"),
                 )
-                attempt = 0
-                success = await self.reauth()
-                while not success and not self._disconnect:
-                    delay = self._compute_backoff(attempt)
-                    await asyncio.sleep(delay)
-                    success = await self.reauth()
-                    attempt += 1
 
     def is_entity_changed(self, pk, lct) -> bool:
         """Check if entity with pk and lct is changed."""
-        if self._health_map.get(pk, 0) != lct:
-            return True
-        return False
+        record = self.devices.get_pk(int(pk))
+        return record is None or record.lct != lct
 
     async def handle_message(self, message: dict[str, Any]) -> None:
         """Handle Wolrty message."""
@@ -523,41 +839,63 @@ class WorltyLocal:
             isinstance(device, dict) for device in devices
         ):
             LOGGER.debug(
-                f"[{self.worlty_pad.device_id if self.worlty_pad is not None else self._host}] Handle {len(devices)} devices"
+                "[%s] Handle %d devices",
+                self.worlty_pad.device_id if self.worlty_pad is not None else self._host,
+                len(devices),
             )
 
-            devices = sorted(devices, key=lambda device: device.get("pk", 0))
-
+            # Records are found by pk and (fk, cid), order does not matter.
+            fetched = False
             for device in devices:
-                device["children"] = sorted(
-                    device.get("children", []), key=lambda child: child.get("pk", 0)
-                )
-
-                for child in device["children"]:
-                    child["fk"] = device.get("pk", 0)
-
+                if self.commands:
+                    record = self.devices.find(device)
+                    if record is None or not record.is_stale(device):
+                        self._match_command(device)
                 self.update_device(device)
-                self._health_map[str(device["pk"])] = device["lct"]
-
-            if len(devices) > 0:
-                self.set_data("devices", self._entity_map.copy())
+                if self.fetches and self.fetches.received(device):
+                    fetched = True
+                if self.resync.received(device):
+                    self._resynced()
+            if fetched:
+                # Completed chunks freed window slots.
+                await self._send_fetches()
         elif data_type == "health":
             devices: dict[str, int] = data.get("devices")
 
-            pks = [
-                int(pk)
-                for pk, lct in devices.items()
-                if self.is_entity_changed(pk, lct)
-            ]
+            if self.resync.active and not self.resync.planned:
+                # First health after authenticated, fetch what changed meanwhile.
+                if self._resync_timer is not None:
+                    self._resync_timer.cancel()
+                    self._resync_timer = None
+                pending = self.resync.plan(devices, self.devices)
+                LOGGER.info(
+                    "[%s] Resync %d of %d devices",
+                    self.worlty_pad.device_id if self.worlty_pad is not None else self._host,
+                    len(pending),
+                    len(devices),
+                )
+                if pending:
+                    await self._fetch(pending)
+                else:
+                    self._resynced()
+                return
+
+            pks = {}
+            for pk, lct in devices.items():
+                if not self.is_entity_changed(pk, lct):
+                    continue
+                record = self.devices.get_pk(int(pk))
+                if record is not None and lct < record.lct:
+                    # The pad clock went back, the fetched frame is not stale.
+                    self.devices.rewind(record, lct)
+                pks[int(pk)] = lct
 
             if len(pks) > 0:
-                LOGGER.info(f"[{self.worlty_pad.device_id if self.worlty_pad is not None else self._host}] Update devices : {pks}")
-                await asyncio.sleep(1)
-                await self.publish({"type": "get", "data": {"devices": pks}})
+                LOGGER.info(f"[{self.worlty_pad.device_id if self.worlty_pad is not None else self._host}] Update devices : {list(pks)}")
+                await self._fetch(pks)
         elif data_type == "device/list":
             # TODO 해당 데이터에 없는 entity 삭제
-            await asyncio.sleep(1)
-            await self.publish({"type": "get", "data": {"devices": devices}})
+            await self._fetch(dict.fromkeys(devices, 0))
         elif data_type == "device/delete":
             # TODO 해당 데이터에 있는 entity 삭제
             LOGGER.debug(
@@ -568,98 +906,323 @@ class WorltyLocal:
                 f"[{self.worlty_pad.device_id if self.worlty_pad is not None else self._host}] Unhandled message : {message}"
             )
 
-    def get_worlty_entity(self, unique_id) -> dict[str, Any]:
-        """Get entity."""
-        return self._entity_map.get(unique_id)
+    async def _fetch(self, devices: dict[int, int]) -> None:
+        """Request devices until an update as new as their lct arrives."""
+        self.fetches.request(devices)
+        await self._send_fetches()
+
+    async def _send_fetches(self) -> None:
+        """Publish the queued fetches that fit in the window."""
+        for pks in self.fetches.next_chunks():
+            await self.publish({"type": "get", "data": {"devices": pks}})
+        self._schedule_fetch_check()
+
+    def _schedule_fetch_check(self) -> None:
+        """Arm the timer for the earliest fetch deadline."""
+        deadline = self.fetches.next_deadline
+        if self._fetch_timer is not None or deadline is None:
+            return
+        self._fetch_timer = self.hass.loop.call_later(
+            max(0.0, deadline - time.monotonic()), self._check_fetches
+        )
+
+    @callback
+    def _check_fetches(self) -> None:
+        """Fetch late devices again or give up on them."""
+        self._fetch_timer = None
+        failed = self.fetches.expired()
+        if failed:
+            LOGGER.warning(
+                "[%s] Devices not fetched > %s",
+                self.worlty_pad.device_id if self.worlty_pad is not None else self._host,
+                failed,
+            )
+            if self.resync.discard(failed):
+                self._resynced()
+        self.hass.async_create_task(self._send_fetches())
+
+    @callback
+    def _resync_without_health(self) -> None:
+        """Fetch every known device, the pad sent no health since authenticated."""
+        self._resync_timer = None
+        if not self.resync.active or self.resync.planned:
+            return
+        pending = self.resync.plan_known(self.devices)
+        LOGGER.info(
+            "[%s] No health in %.0f seconds, resync %d known devices",
+            self.worlty_pad.device_id if self.worlty_pad is not None else self._host,
+            RESYNC_HEALTH_WAIT,
+            len(pending),
+        )
+        if pending:
+            self.hass.async_create_task(self._fetch(pending))
+        else:
+            self._resynced()
 
-    async def get_worlty_devices(self) -> dict[Platform, dict[str, dict[str, Any]]]:
+    def _resynced(self) -> None:
+        """Go live once every device fetched by the resync is up to date."""
+        self.resync.finish()
+        LOGGER.debug(
+            "[%s] Resynced %d devices in %.3fs",
+            self.worlty_pad.device_id if self.worlty_pad is not None else self._host,
+            self.resync.last_fetched,
+            self.resync.last_duration,
+        )
+        if self.state is WorltyConnectionState.SYNCING:
+            self._set_state(WorltyConnectionState.LIVE)
+
+    async def get_worlty_devices(
+        self,
+    ) -> dict[Platform, dict[str, WorltyDeviceRecord]]:
         """Get devices from Worlty."""
-        return self._entities
+        return self.devices.by_platform
 
     def make_unique_id(self, pk: int, fk: int = 0, did: str = "") -> str:
         """Get unique id from worlty device."""
-        return (
-            f"{self.worlty_pad.device_id}:{pk}:{did}"
-            if fk == 0
-            else f"{self.worlty_pad.device_id}:{fk}_{pk}:{did}"
-        )
+        return self.devices.make_unique_id(pk, fk, did)
 
     def update_device(self, device: dict[str, Any]) -> None:
-        """Update device or append if not exists in _devices."""
-        self._update_or_create_worlty_entity(device)
-
-        for child in device.get("children", []):
-            # if child.get("hide") is not True:
-            child["parent_unique_id"] = self.make_unique_id(
-                device.get("pk"), 0, device.get("did")
-            )
-            self._update_or_create_worlty_entity(child)
-
-    def _update_or_create_worlty_entity(self, device: dict[str, Any]) -> None:
-        """Create the device map."""
-        pk: int = device.get("pk", 0)
-        fk: int = device.get("fk", 0)
-
-        unique_id = self.make_unique_id(pk, fk, device.get("did" if fk == 0 else "cid"))
-        worlty_entity: WorltyBaseEntity = self.worlty_entity.get(unique_id)
-
-        if worlty_entity is not None:
-            self._entity_map.update({unique_id: device})
-            worlty_entity.update_entity(device)
+        """Update device or append if not exists in devices."""
+        parent = self._update_or_create_worlty_entity(device, None)
+
+        for child in device.get("children", ()):
+            self._update_or_create_worlty_entity(child, parent)
+
+    def _update_or_create_worlty_entity(
+        self, device: dict[str, Any], parent: Optional[WorltyDeviceRecord]
+    ) -> WorltyDeviceRecord:
+        """Apply a device frame to its record."""
+        record = self.devices.find(device, parent)
+
+        if record is None:
+            record = self.devices.add(device, parent)
+            if record.platform is not None:
+                self._queue_add(record)
+        elif not self.devices.accept(record, device):
+            # Stale or nothing advanced, leave the entity and the snapshot alone.
+            return record
         else:
-            entity = self._entity_map.setdefault(unique_id, device)
-            entity.update(device)
-
-            entity_platform: Platform = map_worlty_to_platform(
-                entity.get("type"), entity.get("cls")
-            )
-
-            if entity_platform is not None:
-                entity = self._entities[entity_platform].setdefault(unique_id, device)
-                entity.update(device)
-                add_entity_callback = self._add_entity_listeners.get(entity_platform)
+            changed = record.apply(device)
+            if record.entity is not None:
+                record.entity.update_entity(record, changed)
 
-                if add_entity_callback is not None:
-                    add_entity_callback(entity)
+        if self._snapshot is not None:
+            self._snapshot.async_mark_dirty(record.unique_id)
+        return record
 
     def register_entity(self, worlty_entity: "WorltyBaseEntity"):
-        """Register entity to worlty_entity."""
+        """Register entity to its device record."""
         if worlty_entity.worlty_type is not None:
-            self.worlty_entity[worlty_entity.worlty_unique_id] = worlty_entity
+            worlty_entity.record.entity = worlty_entity
             self.worlty_entities[worlty_entity.worlty_type].append(worlty_entity)
 
     def register_add_listener(self, entity_type: Platform, cb: callback) -> None:
-        """Register async add entities callback."""
+        """Register async add entities callback, add the devices held for it."""
         self._add_entity_listeners[entity_type] = cb
+        held = self._pending_adds.pop(entity_type, None)
+        if held:
+            self._add_records(cb, held.values())
+
+    def _queue_add(self, record: WorltyDeviceRecord) -> None:
+        """Add the entity of a new device with the next batch of its platform."""
+        if record.platform not in PLATFORMS:
+            LOGGER.debug(
+                "[%s] Platform %s not supported, skip %s",
+                self.worlty_pad.device_id if self.worlty_pad is not None else self._host,
+                record.platform,
+                record.unique_id,
+            )
+            return
+        self._pending_adds.setdefault(record.platform, {})[record.unique_id] = record
+        if record.platform not in self._add_entity_listeners:
+            # Held until the platform registers its listener.
+            LOGGER.debug(
+                "[%s] Platform %s not loaded, hold %s",
+                self.worlty_pad.device_id if self.worlty_pad is not None else self._host,
+                record.platform,
+                record.unique_id,
+            )
+            if not record.hide:
+                self._load_platform(record.platform)
+            return
+        if self._adds_flush is None:
+            self._adds_flush = asyncio.get_running_loop().call_soon(self._flush_adds)
+
+    def _load_platform(self, platform: Platform) -> None:
+        """Forward the config entry to a platform seen for the first time."""
+        if platform in self.platforms or self._entry is None:
+            return
+        self.platforms.add(platform)
+        LOGGER.info(
+            "[%s] Load platform %s",
+            self.worlty_pad.device_id if self.worlty_pad is not None else self._host,
+            platform,
+        )
+        # Waits for the setup lock, so it is safe while the entry sets up.
+        task = self.hass.async_create_task(
+            self.hass.config_entries.async_late_forward_entry_setups(
+                self._entry, [platform]
+            )
+        )
+        self._platform_loads[platform] = task
+        task.add_done_callback(partial(self._platform_load_done, platform))
+
+    def _platform_load_done(self, platform: Platform, task: asyncio.Task) -> None:
+        """Forget a finished platform forward."""
+        if self._platform_loads.get(platform) is task:
+            del self._platform_loads[platform]
+
+    async def async_cancel_platform_loads(self) -> None:
+        """Cancel the platform forwards still waiting, they never set up.
+
+        The forwards wait for the setup lock an unload holds, so they can not
+        be awaited from the unload.
+        """
+        tasks = [task for task in self._platform_loads.values() if not task.done()]
+        for platform, task in list(self._platform_loads.items()):
+            if task.cancel():
+                self.platforms.discard(platform)
+        self._platform_loads.clear()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    def _flush_adds(self) -> None:
+        """Add the queued devices, one batch per loaded platform."""
+        self._adds_flush = None
+        for platform, cb in self._add_entity_listeners.items():
+            records = self._pending_adds.pop(platform, None)
+            if records:
+                self._add_records(cb, records.values())
+
+    def _add_records(self, cb: callback, records) -> None:
+        """Call an add entities callback with the records still without entity."""
+        records = [
+            record for record in records if record.entity is None and not record.hide
+        ]
+        if not records:
+            return
+        self.entity_batches += 1
+        self.entities_added += len(records)
+        cb(records)
 
     async def loop(self) -> None:
-        """Loop for publish payload."""
-        await asyncio.sleep(0.05)
+        """Publish every queued command in one set frame."""
         if len(self._queue) > 0:
+            devices = [
+                {"pk": pk, "payload": payload} for pk, payload in self._queue.items()
+            ]
+            for device in devices:
+                record = self.devices.get_pk(device["pk"])
+                self.commands.sent(
+                    device["pk"],
+                    device["payload"],
+                    self._queue_types.get(device["pk"]),
+                    record.lct if record is not None else 0,
+                )
+            self.deque()
             await self.publish(
                 {
                     "type": "set",
-                    "data": {"devices": self._queue},
+                    "data": {"devices": devices},
                 }
             )
-            self.deque()
+            self._schedule_ack_check()
 
     def queue(self, data) -> None:
-        """Queue message."""
-        self._queue = [q for q in self._queue if q.get("pk") != data.get("pk")]
-        self._queue.append(data)
-
-        if self.hass.data[DOMAIN][self._entry.entry_id].get("loop") is not None:
-            self.hass.data[DOMAIN][self._entry.entry_id]["loop"].cancel()
+        """Queue message.
+
+        Payload fields for the same pk are merged, the last write of a field
+        wins, so commands for several children of one parent are all sent.
+        """
+        self._queue.setdefault(data.get("pk"), {}).update(data.get("payload", {}))
+        if data.get("type") is not None:
+            self._queue_types[data.get("pk")] = data.get("type")
+
+        if self._queue_flush is None:
+            self._queue_flush = self.hass.loop.call_later(
+                COMMAND_FLUSH_DELAY, self._flush_queue
+            )
 
-        self.hass.data[DOMAIN][self._entry.entry_id]["loop"] = (
-            self.hass.loop.create_task(self.loop())
-        )
+    @callback
+    def _flush_queue(self) -> None:
+        """Flush queued commands."""
+        if self.outbound.congested:
+            # Keep merging commands until the writer catches up.
+            self._queue_flush = self.hass.loop.call_later(
+                COMMAND_FLUSH_DELAY, self._flush_queue
+            )
+            return
+        self._queue_flush = None
+        self.hass.async_create_task(self.loop())
 
     def deque(self) -> None:
         """Deque message."""
         if len(self._queue) > 0:
-            self._queue.clear()
+            self._queue = {}
+            self._queue_types = {}
+
+    def _schedule_ack_check(self) -> None:
+        """Arm the timer for the earliest command deadline."""
+        deadline = self.commands.next_deadline
+        if self._ack_timer is not None or deadline is None:
+            return
+        self._ack_timer = self.hass.loop.call_later(
+            max(0.0, deadline - time.monotonic()), self._check_acks
+        )
+
+    @callback
+    def _check_acks(self) -> None:
+        """Retry or report commands the pad did not acknowledge in time."""
+        self._ack_timer = None
+        retry, failed = self.commands.expired()
+        for command in failed:
+            self._settle_optimistic(command.pk, False)
+            LOGGER.warning(
+                "[%s] Command not acknowledged > %s%s",
+                self.worlty_pad.device_id if self.worlty_pad is not None else self._host,
+                command,
+                " (state mismatch)" if command.mismatched else "",
+            )
+        if retry:
+            self.hass.async_create_task(self._retry_commands(retry))
+        self._schedule_ack_check()
+
+    def _match_command(self, device: dict[str, Any]) -> None:
+        """Match an updated device against its pending command."""
+        acked = self.commands.match(device)
+        if device.get("pk") not in self._optimistic:
+            return
+        if acked is not None:
+            self._settle_optimistic(device.get("pk"), True)
+        elif (command := self.commands.get(device.get("pk"))) and command.mismatched:
+            self._settle_optimistic(device.get("pk"), False)
+
+    def track_optimistic(self, pk: int, worlty_entity: "WorltyBaseEntity") -> None:
+        """Remember an entity showing optimistic state for a command to pk."""
+        self._optimistic.setdefault(pk, {})[worlty_entity.worlty_unique_id] = worlty_entity
+
+    def _settle_optimistic(self, pk: int, confirmed: bool) -> None:
+        """Confirm or roll back the optimistic state of a command to pk."""
+        for worlty_entity in self._optimistic.pop(pk, {}).values():
+            worlty_entity.settle_optimistic(confirmed)
+
+    async def _retry_commands(self, commands: list[WorltyCommand]) -> None:
+        """Publish the fields the pad has not reported yet."""
+        LOGGER.debug(
+            "[%s] Retry commands > %s",
+            self.worlty_pad.device_id if self.worlty_pad is not None else self._host,
+            commands,
+        )
+        await self.publish(
+            {
+                "type": "set",
+                "data": {
+                    "devices": [
+                        {"pk": command.pk, "payload": dict(command.fields)}
+                        for command in commands
+                    ]
+                },
+            }
+        )
 
 
 class WorltyBaseDevice:
@@ -689,7 +1252,7 @@ class WorltyBaseEntity(Entity):
     """Worlty entity class."""
 
     coordinator: WorltyLocal
-    worlty_entity_info: dict[str, Any]
+    record: WorltyDeviceRecord
     worlty_is_child: bool
     worlty_parent: int
     worlty_parent_unique_id: str
@@ -703,63 +1266,56 @@ class WorltyBaseEntity(Entity):
     worlty_last_changed_time: int
     worlty_attribute: dict[str, Any]
     _loaded: bool
+    _optimistic_pending: bool
     _update_entity: callback
 
     def __init__(
         self,
         coordinator: "WorltyLocal",
-        entity_info: dict[str, Any],
+        record: WorltyDeviceRecord,
         entity_update: callback,
     ) -> None:
         """Initialize an worlty entity."""
         self.coordinator = coordinator
         self.hass = coordinator.hass
-        self.entity_info = entity_info
-        self.worlty_is_child = entity_info.get("fk", 0) > 0
-        self.worlty_parent = entity_info.get("fk", 0)
-        self.worlty_parent_unique_id = entity_info.get(
-            "parent_unique_id", self.worlty_parent
+        self.record = record
+        self.worlty_is_child = record.parent is not None
+        self.worlty_parent = record.fk
+        self.worlty_parent_unique_id = (
+            record.parent.unique_id if record.parent is not None else 0
         )
-        self.worlty_pk = entity_info.get("pk")
+        self.worlty_pk = record.pk
 
         if not self.worlty_is_child:
-            self.worlty_name = entity_info.get("did")
+            self.worlty_name = record.did
             self.worlty_sub = map_worlty_sub(
                 self.hass.config.language, self.worlty_name.split("_")[1]
             )
         else:
-            parent_sub = (
-                self.coordinator.get_worlty_entity(self.worlty_parent_unique_id)
-                .get("did")
-                .split("_")[1]
-            )
-            self.worlty_name = entity_info.get("cid")
+            parent_sub = record.parent.did.split("_")[1]
+            self.worlty_name = record.cid
             self.worlty_sub = f"{map_worlty_sub(self.hass.config.language, self.worlty_name)}({map_worlty_sub(self.hass.config.language,parent_sub)})"
 
-        self.worlty_unique_id = coordinator.make_unique_id(
-            self.worlty_pk, self.worlty_parent, self.worlty_name
-        )
-        self.worlty_type = entity_info.get("type")
-        self.worlty_class = entity_info.get("cls")
-        self.worlty_last_changed_time = entity_info.get("lct")
-        self.worlty_attribute = entity_info.get("payload")
-        state = map_worlty_state(self.hass.config.language, entity_info.get("stt"))
-
-        self.worlty_state = (
-            state
-            if self.worlty_type != WorltyBaseType.EVENT.value
-            else f"{state}({datetime.datetime.fromtimestamp(self.worlty_last_changed_time).strftime("%H:%M:%S")})"
-        )
+        self.worlty_unique_id = record.unique_id
+        self.worlty_type = record.type
+        self.worlty_class = record.cls
+        self.worlty_last_changed_time = record.lct
+        self.worlty_attribute = record.payload
+        self._set_worlty_state(self._record_state())
 
         self._update_entity = entity_update
         self._loaded = False
+        self._optimistic_pending = False
         self._attr_unique_id = self.worlty_unique_id.lower()
         self._attr_device_info = DeviceInfo(
             identifiers={(DOMAIN, self.coordinator.worlty_pad.mac_address)},
         )
 
         description, key = map_worlty_entity_description(
-            self.worlty_type, self.worlty_class, self.worlty_sub
+            self.worlty_type,
+            self.worlty_class,
+            self.worlty_sub,
+            self.hass.config.language,
         )
 
         self.entity_id = generate_entity_id(
@@ -782,39 +1338,58 @@ class WorltyBaseEntity(Entity):
     async def async_added_to_hass(self):
         """Call when entity is added to hass."""
         self._loaded = True
-        self._update_callback()
+        # Frames applied before the entity was added only reached the record.
+        self.worlty_last_changed_time = self.record.lct
+        self._set_worlty_state(self._record_state())
+
+    async def async_will_remove_from_hass(self) -> None:
+        """Call when entity will be removed from hass."""
+        self._loaded = False
+        self.coordinator.writes.discard(self)
 
     def _update_callback(self):
-        """Update the state."""
-        self.schedule_update_ha_state()
-
-    def update_entity(self, entity_info: dict[str, Any]) -> None:
-        """Update entity info."""
-        if self._loaded is True:
-            if "payload" in entity_info:
-                self.worlty_last_changed_time = entity_info.get("lct")
-                payload: dict = entity_info.get("payload")
-
-                if payload != self.worlty_attribute:
-                    if self._update_entity is not None:
-                        self._update_entity()
-                    self.worlty_attribute.update(entity_info.get("payload"))
-
-                state = map_worlty_state(
-                    self.hass.config.language, entity_info.get("stt")
-                )
+        """Write the state with the next flush of the write scheduler."""
+        if self._loaded is not True:
+            return
+        self.coordinator.writes.mark(
+            self, self.record.platform in WRITE_PRIORITY_PLATFORMS
+        )
 
-                payload_state = map_worlty_state(
-                    self.hass.config.language, payload.get("stt")
-                )
-                
-                if state != self.worlty_state or payload_state != self.worlty_state:
-                    self.worlty_state = (
-                        state
-                        if self.worlty_type != WorltyBaseType.EVENT.value
-                        else f"{state}({datetime.datetime.fromtimestamp(self.worlty_last_changed_time).strftime("%H:%M:%S")})"
-                    )
-                    self._update_callback()
+    def _set_worlty_state(self, state: Any) -> None:
+        """Set the state and the values derived from it."""
+        self.worlty_state = state
+        self._update_state()
+
+    def _update_state(self) -> None:
+        """Derive cached values from worlty_state, called whenever it is set."""
+
+    def _record_state(self) -> Any:
+        """Return the state of the record as shown by the entity."""
+        state = map_worlty_state(self.hass.config.language, self.record.stt)
+        if self.worlty_type != WorltyBaseType.EVENT.value:
+            return state
+        return f"{state}({datetime.datetime.fromtimestamp(self.record.lct).strftime("%H:%M:%S")})"
+
+    def update_entity(self, record: WorltyDeviceRecord, changed: set[str]) -> None:
+        """Update entity from the fields of its record a frame changed."""
+        if self._loaded is not True or not changed:
+            return
+        self.worlty_last_changed_time = record.lct
+        if self._optimistic_pending:
+            # Keep showing the command, the record holds what the pad reports.
+            return
+
+        if self._update_entity is not None and not changed.isdisjoint(
+            CAPABILITY_FIELDS
+        ):
+            self._update_entity()
+
+        event = self.worlty_type == WorltyBaseType.EVENT.value
+        if "stt" in changed or (event and "lct" in changed):
+            self._set_worlty_state(self._record_state())
+        elif changed <= STATELESS_FIELDS:
+            return
+        self._update_callback()
 
     async def set_device(self, **kwargs: Any) -> None:
         """Publish set device."""
@@ -826,15 +1401,55 @@ class WorltyBaseEntity(Entity):
                 {
                     "pk": self.worlty_parent,
                     "payload": payload,
+                    "type": self.worlty_type,
                 }
             )
+            if payload and self.coordinator.optimistic:
+                self._apply_optimistic(self.worlty_parent, {"stt": kwargs["stt"]})
         else:
             self.coordinator.queue(
                 {
                     "pk": self.worlty_pk,
                     "payload": {**kwargs},
+                    "type": self.worlty_type,
                 }
             )
+            if kwargs and self.coordinator.optimistic:
+                self._apply_optimistic(self.worlty_pk, kwargs)
+
+    def _apply_optimistic(self, pk: int, fields: dict[str, Any]) -> None:
+        """Show the commanded fields until the pad confirms them."""
+        self._optimistic_pending = True
+        # Copy, the record payload is the pad state.
+        self.worlty_attribute = {**self.worlty_attribute, **fields}
+        if "stt" in fields:
+            self._set_worlty_state(
+                map_worlty_state(self.hass.config.language, fields["stt"])
+            )
+        self.coordinator.track_optimistic(pk, self)
+        if self._update_entity is not None and not CAPABILITY_FIELDS.isdisjoint(
+            fields
+        ):
+            self._update_entity()
+        self._update_callback()
+
+    def settle_optimistic(self, confirmed: bool) -> None:
+        """End optimistic state and show the pad state of the record."""
+        if not self._optimistic_pending:
+            return
+        self._optimistic_pending = False
+        self.worlty_attribute = self.record.payload
+        if not confirmed:
+            LOGGER.debug(
+                "[%s] Roll back optimistic state > %s",
+                self.coordinator.get_data("device_id"),
+                self.worlty_unique_id,
+            )
+        # Frames held back while pending may have changed more than the command.
+        self._set_worlty_state(self._record_state())
+        if self._update_entity is not None:
+            self._update_entity()
+        self._update_callback()
 
     @property
     def available(self):
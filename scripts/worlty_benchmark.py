@@ -0,0 +1,409 @@
+"""Benchmark the WorltyLocal client against the pad simulator.
+
+The simulator runs on its own thread and event loop so the CPU time that is
+reported belongs to the client only. A Home Assistant development
+environment with ``pytest-homeassistant-custom-component`` is required.
+
+    python scripts/worlty_benchmark.py --devices 300 --children 2
+    python scripts/worlty_benchmark.py --no-dump --offline-changes 30
+
+Before every reconnect --offline-changes devices change while the client
+cannot see it, with --no-dump the pad only sends health after authenticated
+and the client has to fetch those devices in its resync. Finally the pad
+goes silent without closing the connection, and the time until the client
+gives up on it is reported.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import logging
+from pathlib import Path
+import statistics
+import sys
+import threading
+import time
+from typing import Any
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from pytest_homeassistant_custom_component.common import (  # noqa: E402
+    MockConfigEntry,
+    async_test_home_assistant,
+)
+from worlty_simulator import (  # noqa: E402
+    DEFAULT_ACCESS_TOKEN,
+    PAD_INFO,
+    WorltyPadSimulator,
+    build_devices,
+)
+
+from custom_components.worlty.const import (  # noqa: E402
+    CONF_PING_INTERVAL,
+    DOMAIN,
+    WorltyConnectionState,
+)
+from custom_components.worlty.worlty import WorltyLocal  # noqa: E402
+
+
+class SimulatorThread(threading.Thread):
+    """Run a WorltyPadSimulator on a dedicated event loop."""
+
+    def __init__(self, simulator: WorltyPadSimulator) -> None:
+        """Initialize."""
+        super().__init__(daemon=True)
+        self.simulator = simulator
+        self.loop = asyncio.new_event_loop()
+        self._started = threading.Event()
+
+    def run(self) -> None:
+        """Run the simulator loop."""
+        asyncio.set_event_loop(self.loop)
+        self.loop.run_until_complete(self.simulator.start())
+        self._started.set()
+        self.loop.run_forever()
+
+    def start_and_wait(self) -> None:
+        """Start the thread and wait until the server listens."""
+        self.start()
+        self._started.wait()
+
+    async def call(self, coro) -> Any:
+        """Run a coroutine on the simulator loop."""
+        return await asyncio.wrap_future(
+            asyncio.run_coroutine_threadsafe(coro, self.loop)
+        )
+
+    def stop(self) -> None:
+        """Stop the simulator."""
+        asyncio.run_coroutine_threadsafe(self.simulator.stop(), self.loop).result()
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.join()
+
+
+class BenchmarkWorltyLocal(WorltyLocal):
+    """WorltyLocal that counts handled messages and resolves command waiters."""
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        """Initialize."""
+        super().__init__(*args, **kwargs)
+        self.handled = 0
+        self.handled_devices = 0
+        self.waiters: dict[int, asyncio.Future] = {}
+        self.progress = asyncio.Event()
+
+    async def handle_message(self, message: dict[str, Any]) -> None:
+        """Handle a message and record it."""
+        await super().handle_message(message)
+        self.handled += 1
+        if message.get("type") == "update":
+            devices = message.get("data", {}).get("devices", [])
+            self.handled_devices += len(devices)
+            for device in devices:
+                waiter = self.waiters.pop(device.get("pk"), None)
+                if waiter is not None and not waiter.done():
+                    waiter.set_result(None)
+        self.progress.set()
+
+    async def wait_converged(self, lcts: dict[int, int], timeout: float) -> bool:
+        """Wait until every record is as new as its lct in lcts."""
+        deadline = time.monotonic() + timeout
+        while any(
+            (record := self.devices.get_pk(pk)) is None or record.lct < lct
+            for pk, lct in lcts.items()
+        ):
+            self.progress.clear()
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+            try:
+                await asyncio.wait_for(self.progress.wait(), remaining)
+            except asyncio.TimeoutError:
+                return False
+        return True
+
+
+async def flood(simulator: WorltyPadSimulator, frames: int) -> None:
+    """Send frames single device updates back to back."""
+    pks = list(simulator.devices)
+    for index in range(frames):
+        pk = pks[index % len(pks)]
+        simulator.mutate(pk)
+        await simulator.send_update([pk])
+
+
+def percentile(values: list[float], pct: int) -> float:
+    """Return the pct percentile of values."""
+    if len(values) < 2:
+        return values[0] if values else 0.0
+    return statistics.quantiles(values, n=100, method="inclusive")[pct - 1]
+
+
+async def start_client(hass, entry, port: int) -> BenchmarkWorltyLocal:
+    """Start the connection supervisor like async_setup_entry does."""
+    hass.data.setdefault(DOMAIN, {})[entry.entry_id] = {}
+    api = BenchmarkWorltyLocal(hass, "127.0.0.1", port, DEFAULT_ACCESS_TOKEN)
+    if not await api.start(entry):
+        await api.disconnect()
+        raise RuntimeError("Authentication against the simulator failed")
+    return api
+
+
+async def stop_client(hass, entry, api: WorltyLocal) -> None:
+    """Stop every task the client started."""
+    await api.disconnect()
+    hass.data[DOMAIN].pop(entry.entry_id, None)
+    await hass.async_block_till_done()
+
+
+async def change(simulator: WorltyPadSimulator, count: int, offset: int) -> None:
+    """Change count devices without sending an update."""
+    pks = list(simulator.devices)
+    for index in range(count):
+        simulator.mutate(pks[(offset + index) % len(pks)])
+
+
+async def wait_resynced(api: WorltyLocal, resyncs: int, timeout: float) -> bool:
+    """Wait until the client finished resyncs resyncs."""
+    deadline = time.monotonic() + timeout
+    while api.resync.resyncs < resyncs:
+        if time.monotonic() > deadline:
+            return False
+        await asyncio.sleep(0.01)
+    return True
+
+
+async def set_silent(simulator: WorltyPadSimulator, silent: bool) -> None:
+    """Stop or resume sending to the connected clients."""
+    simulator.silent = silent
+
+
+async def wait_lost(api: WorltyLocal, timeout: float) -> bool:
+    """Wait until the supervisor gave up on the connection."""
+    deadline = time.monotonic() + timeout
+    while api.state is WorltyConnectionState.LIVE:
+        if time.monotonic() > deadline:
+            return False
+        await asyncio.sleep(0.01)
+    return True
+
+
+async def wait_recovered(api: WorltyLocal, recoveries: int, timeout: float) -> bool:
+    """Wait until the supervisor is live again after a dropped connection."""
+    deadline = time.monotonic() + timeout
+    while api.recoveries < recoveries:
+        if time.monotonic() > deadline:
+            return False
+        await asyncio.sleep(0.01)
+    return True
+
+
+async def run(args: argparse.Namespace) -> dict[str, Any]:
+    """Run every scenario and return the results."""
+    simulator = WorltyPadSimulator(
+        build_devices(args.devices, args.children, args.seed),
+        health_interval=3600,
+        command_delay=args.command_delay,
+        initial_dump=not args.no_dump,
+        seed=args.seed,
+    )
+    sim_thread = SimulatorThread(simulator)
+    sim_thread.start_and_wait()
+    results: dict[str, Any] = {}
+
+    try:
+        async with async_test_home_assistant() as hass:
+            entry = MockConfigEntry(
+                domain=DOMAIN,
+                unique_id=PAD_INFO["mac_address"],
+                options={CONF_PING_INTERVAL: args.ping_interval},
+                data={
+                    "ip_address": "127.0.0.1",
+                    "port": simulator.port,
+                    "access_token": DEFAULT_ACCESS_TOKEN,
+                },
+            )
+            entry.add_to_hass(hass)
+
+            started = time.perf_counter()
+            api = await start_client(hass, entry, simulator.port)
+            await wait_resynced(api, 1, args.timeout)
+            results["initial_sync_s"] = time.perf_counter() - started
+
+            base = api.handled
+            inbound = api.inbound.as_dict()
+            cpu = time.thread_time()
+            started = time.perf_counter()
+            await sim_thread.call(flood(simulator, args.frames))
+            # Superseded and dropped frames are never handled, wait for the
+            # last state of every device instead of a count of handled frames.
+            lcts = {pk: device.lct for pk, device in simulator.devices.items()}
+            complete = await api.wait_converged(lcts, args.timeout)
+            elapsed = time.perf_counter() - started
+            cpu = time.thread_time() - cpu
+            # Frames taken off the socket that are no longer queued.
+            consumed = (
+                api.inbound.received - inbound["received"] - len(api.inbound)
+            )
+            results["flood_frames"] = consumed
+            results["flood_complete"] = complete
+            results["flood_handled"] = api.handled - base
+            results["flood_superseded"] = (
+                api.inbound.superseded - inbound["superseded"]
+            )
+            results["flood_dropped"] = api.inbound.dropped - inbound["dropped"]
+            results["messages_per_s"] = consumed / elapsed if elapsed else 0.0
+            results["cpu_us_per_message"] = cpu / consumed * 1e6 if consumed else 0.0
+
+            controllable = [
+                pk
+                for pk, device in simulator.devices.items()
+                if device.type in (3, 4)
+            ]
+            latencies = []
+            for index in range(args.commands):
+                pk = controllable[index % len(controllable)]
+                waiter = hass.loop.create_future()
+                api.waiters[pk] = waiter
+                started = time.perf_counter()
+                api.queue(
+                    {
+                        "pk": pk,
+                        "payload": {"stt": index % 2 == 0},
+                        "type": simulator.devices[pk].type,
+                    }
+                )
+                try:
+                    await asyncio.wait_for(waiter, args.timeout)
+                except asyncio.TimeoutError:
+                    api.waiters.pop(pk, None)
+                    continue
+                latencies.append((time.perf_counter() - started) * 1000)
+            results["commands_acked"] = len(latencies)
+            results["command_rtt_ms"] = {
+                "p50": percentile(latencies, 50),
+                "p95": percentile(latencies, 95),
+                "max": max(latencies, default=0.0),
+            }
+            results["commands"] = api.commands.as_dict()
+
+            reconnects = []
+            resyncs = []
+            fetched = []
+            for index in range(args.reconnects):
+                await sim_thread.call(
+                    change(simulator, args.offline_changes, index * args.offline_changes)
+                )
+                await sim_thread.call(simulator.drop_clients())
+                if await wait_recovered(api, index + 1, args.timeout):
+                    reconnects.append(api.last_recovery * 1000)
+                    resyncs.append(api.resync.last_duration * 1000)
+                    fetched.append(api.resync.last_fetched)
+            results["reconnect_ms"] = {
+                "count": len(reconnects),
+                "p50": percentile(reconnects, 50),
+                "max": max(reconnects, default=0.0),
+            }
+            results["resync_ms"] = {
+                "p50": percentile(resyncs, 50),
+                "max": max(resyncs, default=0.0),
+                "fetched": max(fetched, default=0),
+            }
+            await sim_thread.call(set_silent(simulator, True))
+            started = time.perf_counter()
+            lost = await wait_lost(api, args.timeout)
+            results["half_open_s"] = time.perf_counter() - started if lost else None
+            await sim_thread.call(set_silent(simulator, False))
+            await wait_recovered(api, api.recoveries + 1, args.timeout)
+            results["liveness"] = api.liveness.as_dict()
+
+            results["connection"] = api.connection_metrics()
+            results["fetches"] = api.fetches.as_dict()
+
+            await stop_client(hass, entry, api)
+    finally:
+        sim_thread.stop()
+
+    results["simulator"] = dict(simulator.stats)
+    return results
+
+
+def main() -> None:
+    """Parse arguments, run the benchmark and print a report."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--devices", type=int, default=300)
+    parser.add_argument("--children", type=int, default=2)
+    parser.add_argument("--frames", type=int, default=5000)
+    parser.add_argument("--commands", type=int, default=50)
+    parser.add_argument("--command-delay", type=float, default=0.0)
+    parser.add_argument("--reconnects", type=int, default=5)
+    parser.add_argument("--offline-changes", type=int, default=0)
+    parser.add_argument("--no-dump", action="store_true")
+    parser.add_argument("--ping-interval", type=float, default=5.0)
+    parser.add_argument("--timeout", type=float, default=60.0)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.WARNING)
+
+    results = asyncio.run(run(args))
+    rtt = results["command_rtt_ms"]
+    print(f"devices            {args.devices} (+{args.children} children each)")
+    print(f"initial sync       {results['initial_sync_s']:.3f} s")
+    print(
+        f"throughput         {results['messages_per_s']:.0f} messages/s"
+        f" ({results['flood_frames']}/{args.frames} frames)"
+    )
+    print(
+        f"  handled {results['flood_handled']}"
+        f"  superseded {results['flood_superseded']}"
+        f"  dropped {results['flood_dropped']}"
+    )
+    print(f"cpu per message    {results['cpu_us_per_message']:.1f} us")
+    print(
+        f"command rtt        p50 {rtt['p50']:.1f} ms  p95 {rtt['p95']:.1f} ms"
+        f"  max {rtt['max']:.1f} ms ({results['commands_acked']}/{args.commands})"
+    )
+    commands = results["commands"]
+    print(
+        f"command tracker    acked {commands['acked']}  retried {commands['retried']}"
+        f"  failed {commands['failed']}  pending {commands['pending']}"
+    )
+    for kind, kind_rtt in commands["rtt"].items():
+        print(
+            f"  {kind:<16} p50 {kind_rtt['p50'] * 1000:.1f} ms"
+            f"  p95 {kind_rtt['p95'] * 1000:.1f} ms  p99 {kind_rtt['p99'] * 1000:.1f} ms"
+        )
+    reconnect = results["reconnect_ms"]
+    print(
+        f"reconnect          p50 {reconnect['p50']:.1f} ms  max {reconnect['max']:.1f} ms"
+        f" ({reconnect['count']}/{args.reconnects})"
+    )
+    resync = results["resync_ms"]
+    print(
+        f"resync             p50 {resync['p50']:.1f} ms  max {resync['max']:.1f} ms"
+        f"  fetched {resync['fetched']} devices"
+    )
+    liveness = results["liveness"]
+    print(
+        "half-open detected "
+        + (
+            f"{results['half_open_s']:.1f} s"
+            if results["half_open_s"] is not None
+            else "no"
+        )
+        + f"  ping rtt p50 {liveness['rtt']['p50'] * 1000:.1f} ms"
+        f" ({liveness['probes']} probes, {liveness['unanswered']} unanswered)"
+    )
+    fetches = results["fetches"]
+    print(
+        f"fetches            sent {fetches['sent']}  max in flight {fetches['max_in_flight']}"
+        f"  retried {fetches['retried']}  failed {fetches['failed']}"
+    )
+    for state, spent in results["connection"]["time_in_state"].items():
+        print(f"  {state:<16} {spent:.3f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""Benchmark frame decoding from 1 KB to 1 MB.
+
+Compares the former readline path (decode to str, strip, json.loads) with
+WorltyFrameDecoder fed in socket sized chunks and each available codec.
+Frames are synthetic update dumps unless a capture of newline delimited
+frames is given with --frames-file.
+
+    python scripts/worlty_codec_benchmark.py
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+from pathlib import Path
+import sys
+import time
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from worlty_simulator import build_devices  # noqa: E402
+
+from custom_components.worlty.codec import (  # noqa: E402
+    JSON_CODEC,
+    ORJSON_CODEC,
+    READ_CHUNK_SIZE,
+    WorltyFrameDecoder,
+)
+
+SIZES = [1024, 16 * 1024, 64 * 1024, 256 * 1024, 1024 * 1024]
+
+
+def synthetic_frame(size: int) -> bytes:
+    """Return an update frame of at least size bytes."""
+    count = 1
+    while True:
+        devices = [device.as_dict() for device in build_devices(count, 2).values()]
+        frame = json.dumps({"type": "update", "data": {"devices": devices}}).encode()
+        if len(frame) >= size:
+            return frame + b"\n"
+        count = max(count + 1, int(count * size / len(frame)))
+
+
+def readline_path(data: bytes) -> None:
+    """Decode the way subscribe did before the frame decoder."""
+    for line in data.splitlines(keepends=True):
+        msg = line.decode("utf-8", errors="replace").strip()
+        if msg:
+            json.loads(msg)
+
+
+def decoder_path(data: bytes, codec) -> None:
+    """Decode with WorltyFrameDecoder fed in socket sized chunks."""
+    decoder = WorltyFrameDecoder()
+    for start in range(0, len(data), READ_CHUNK_SIZE):
+        decoder.feed(data[start : start + READ_CHUNK_SIZE])
+        while (frame := decoder.next_frame()) is not None:
+            codec.loads(frame)
+
+
+def measure(func, *args, budget: float = 0.5) -> float:
+    """Return seconds per call."""
+    calls = 0
+    started = time.perf_counter()
+    while (elapsed := time.perf_counter() - started) < budget or calls < 3:
+        func(*args)
+        calls += 1
+    return elapsed / calls
+
+
+def main() -> None:
+    """Run the benchmark and print a report."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--frames-file", type=Path)
+    args = parser.parse_args()
+
+    if args.frames_file:
+        frames = [
+            line + b"\n" for line in args.frames_file.read_bytes().splitlines() if line
+        ]
+    else:
+        frames = [synthetic_frame(size) for size in SIZES]
+
+    paths = [("readline", readline_path, ())]
+    paths.append(("decoder+json", decoder_path, (JSON_CODEC,)))
+    if ORJSON_CODEC is not None:
+        paths.append(("decoder+orjson", decoder_path, (ORJSON_CODEC,)))
+
+    print(f"{'frame':>10}" + "".join(f"{name:>24}" for name, _, _ in paths))
+    for frame in sorted(frames, key=len):
+        row = f"{len(frame) / 1024:>8.0f}KB"
+        for _, func, extra in paths:
+            per_call = measure(func, frame, *extra)
+            cell = f"{per_call * 1e3:.3f} ms ({len(frame) / per_call / 1048576:.0f} MB/s)"
+            row += f"{cell:>24}"
+        print(row)
+
+
+if __name__ == "__main__":
+    main()
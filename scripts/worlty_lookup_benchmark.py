@@ -0,0 +1,145 @@
+"""Benchmark the lookups done per entity construction and per update.
+
+Compares const.py of a baseline revision, which rebuilt its tables on every
+call, with the module level tables and the shared description cache of the
+working tree. A Home Assistant development environment is required.
+
+    python scripts/worlty_lookup_benchmark.py --baseline <rev>
+"""
+
+from __future__ import annotations
+
+import argparse
+from pathlib import Path
+import subprocess
+import sys
+import time
+import types
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from custom_components.worlty import const  # noqa: E402
+from custom_components.worlty.worlty import (  # noqa: E402
+    ENTITY_DESCRIPTION_CLASSES,
+    map_worlty_entity_description,
+)
+
+LANGUAGE = "ko"
+
+
+def load_baseline(rev: str) -> types.ModuleType:
+    """Load const.py as it was at rev."""
+    source = subprocess.run(
+        ["git", "show", f"{rev}:custom_components/worlty/const.py"],
+        cwd=ROOT,
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout
+    module = types.ModuleType("worlty_const_baseline")
+    exec(compile(source, f"{rev}:const.py", "exec"), module.__dict__)
+    return module
+
+
+def baseline_describe(module: types.ModuleType):
+    """Return the description builder as it was, a new instance per entity."""
+
+    def describe(worlty_type, worlty_class, worlty_sub, language):
+        key, device_class, icon, unit = module.get_worlty_description(
+            worlty_type, worlty_class
+        )
+        if key is None:
+            return None, "unknown"
+        cls = ENTITY_DESCRIPTION_CLASSES.get(
+            module.map_worlty_to_platform(worlty_type, worlty_class)
+        )
+        if cls is None:
+            return None, "unknown"
+        extra = {"native_unit_of_measurement": unit} if unit is not None else {}
+        return cls(
+            key=key,
+            has_entity_name=True,
+            icon=icon,
+            device_class=device_class,
+            translation_key=key,
+            translation_placeholders={"sub_id": worlty_sub},
+            **extra,
+        ), key
+
+    return describe
+
+
+def construct(module, describe, samples) -> None:
+    """Do the lookups of WorltyBaseEntity.__init__ for every sample."""
+    for worlty_type, worlty_class in samples:
+        sub = module.map_worlty_sub(LANGUAGE, "light")
+        module.map_worlty_state(LANGUAGE, "auto")
+        describe(worlty_type, worlty_class, sub, LANGUAGE)
+        module.map_worlty_to_platform(worlty_type, worlty_class)
+
+
+def update(module, states) -> None:
+    """Do the lookups of WorltyBaseEntity.update_entity for every state."""
+    for state in states:
+        module.map_worlty_state(LANGUAGE, state)
+        module.map_worlty_state(LANGUAGE, state)
+
+
+def measure(func, *args, budget: float = 0.5) -> float:
+    """Return seconds per call."""
+    calls = 0
+    started = time.perf_counter()
+    while (elapsed := time.perf_counter() - started) < budget or calls < 3:
+        func(*args)
+        calls += 1
+    return elapsed / calls
+
+
+def main() -> None:
+    """Run the benchmark and print a report."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--baseline",
+        default=subprocess.run(
+            ["git", "rev-list", "--max-parents=0", "HEAD"],
+            cwd=ROOT,
+            capture_output=True,
+            text=True,
+        ).stdout.split()[0],
+    )
+    args = parser.parse_args()
+
+    baseline = load_baseline(args.baseline)
+    samples = [
+        (worlty_type, worlty_class)
+        for worlty_type, classes in const.WORLTY_DESCRIPTIONS.items()
+        for worlty_class in classes
+    ]
+    states = [*const.WORLTY_STATES["en"], True, False, 21.5, "-"]
+
+    rows = [
+        (
+            "entity construction",
+            len(samples),
+            measure(construct, baseline, baseline_describe(baseline), samples),
+            measure(construct, const, map_worlty_entity_description, samples),
+        ),
+        (
+            "update",
+            len(states),
+            measure(update, baseline, states),
+            measure(update, const, states),
+        ),
+    ]
+    print(f"{'':<22}{'before':>12}{'after':>12}{'speedup':>10}")
+    for name, count, before, after in rows:
+        print(
+            f"{name:<22}{before / count * 1e6:>9.2f} us{after / count * 1e6:>9.2f} us"
+            f"{before / after:>9.1f}x"
+        )
+    print(f"interned descriptions: {map_worlty_entity_description.cache_info()}")
+
+
+if __name__ == "__main__":
+    main()
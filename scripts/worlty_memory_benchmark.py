@@ -0,0 +1,105 @@
+"""Compare memory held by the device map and the device record store.
+
+  dicts     the former layout, decoded frames kept in the unique id map and
+            the platform maps, children with injected fk and
+            parent_unique_id
+  records   WorltyDeviceStore records built from the same frames
+
+A Home Assistant development environment is required.
+
+    python scripts/worlty_memory_benchmark.py --sizes 100 1000 10000
+"""
+
+from __future__ import annotations
+
+import argparse
+from collections import defaultdict
+import gc
+import json
+from pathlib import Path
+import sys
+import tracemalloc
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from worlty_simulator import build_devices  # noqa: E402
+
+from custom_components.worlty.const import map_worlty_to_platform  # noqa: E402
+from custom_components.worlty.devices import WorltyDeviceStore  # noqa: E402
+
+DEVICE_ID = "worlty_sim"
+
+
+def frame(count: int, children: int) -> bytes:
+    """Return an update frame with count devices."""
+    devices = [device.as_dict() for device in build_devices(count, children).values()]
+    return json.dumps({"type": "update", "data": {"devices": devices}}).encode()
+
+
+def build_dicts(devices: list[dict]) -> tuple:
+    """Keep devices the way the former unique id and platform maps did."""
+    entity_map: dict[str, dict] = {}
+    entities: dict[str, dict[str, dict]] = defaultdict(dict)
+
+    def keep(unique_id: str, device: dict) -> None:
+        entity_map[unique_id] = device
+        platform = map_worlty_to_platform(device.get("type"), device.get("cls"))
+        if platform is not None:
+            entities[platform][unique_id] = device
+
+    for device in devices:
+        parent_unique_id = f"{DEVICE_ID}:{device['pk']}:{device['did']}"
+        keep(parent_unique_id, device)
+        for child in device["children"]:
+            child["fk"] = device["pk"]
+            child["parent_unique_id"] = parent_unique_id
+            keep(f"{DEVICE_ID}:{device['pk']}_{child['pk']}:{child['cid']}", child)
+    return entity_map, entities
+
+
+def build_records(devices: list[dict]) -> WorltyDeviceStore:
+    """Build a record store from the devices."""
+    store = WorltyDeviceStore(DEVICE_ID)
+    for device in devices:
+        parent = store.add(device)
+        for child in device["children"]:
+            store.add(child, parent)
+    return store
+
+
+def measure(data: bytes, build) -> int:
+    """Return the bytes still allocated after decoding data and building."""
+    gc.collect()
+    tracemalloc.start()
+    devices = json.loads(data)["data"]["devices"]
+    kept = build(devices)
+    del devices
+    gc.collect()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del kept
+    return current
+
+
+def main() -> None:
+    """Run the comparison and print a report."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 10000])
+    parser.add_argument("--children", type=int, default=2)
+    args = parser.parse_args()
+
+    print(f"{'devices':>8}{'records':>9}{'dicts':>12}{'records':>12}{'saved':>8}")
+    for size in args.sizes:
+        data = frame(size, args.children)
+        before = measure(data, build_dicts)
+        after = measure(data, build_records)
+        records = size * (1 + args.children)
+        print(
+            f"{size:>8}{records:>9}{before / 1024:>9.0f} KiB{after / 1024:>8.0f} KiB"
+            f"{(1 - after / before) * 100:>7.0f}%"
+        )
+
+
+if __name__ == "__main__":
+    main()
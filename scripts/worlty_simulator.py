@@ -0,0 +1,487 @@
+"""Local Worlty pad simulator.
+
+Speaks the same protocol as a Worlty wall pad so ``WorltyLocal`` can be
+exercised without real hardware. Frames in both directions are newline
+delimited JSON, a client sending anything else is disconnected.
+
+    python scripts/worlty_simulator.py --devices 300 --children 2 --rate 20
+
+Only the standard library is required.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+from dataclasses import dataclass, field
+import json
+import logging
+import random
+import time
+from typing import Any
+
+LOGGER = logging.getLogger("worlty_simulator")
+
+DEFAULT_ACCESS_TOKEN = "worlty-simulator"
+PAD_INFO = {
+    "device_id": "worlty_sim",
+    "model": "WT-SIM",
+    "mac_address": "00:00:5e:00:53:01",
+    "version": "0.0.0-sim",
+}
+
+# (did prefix, type, class)
+DEVICE_KINDS: list[tuple[str, int, int]] = [
+    ("light", 3, 0),
+    ("dimming", 3, 1),
+    ("switch", 4, 0),
+    ("outlet", 4, 1),
+    ("temperature", 2, 44),
+    ("power", 2, 34),
+    ("motion", 1, 16),
+    ("boiler", 8, 1),
+    ("ac", 8, 2),
+    ("fan", 6, 0),
+]
+
+# (cid, type, class, stt)
+CHILD_KINDS: list[tuple[str, int, int, Any]] = [
+    ("timer", 4, 0, False),
+    ("interval_ms", 7, 0, 600000),
+    ("temp_offset", 7, 0, 0),
+    ("usage", 2, 34, "0"),
+]
+
+
+def _next_lct(lct: int) -> int:
+    """Return a last change time that is newer than lct."""
+    return max(int(time.time()), lct + 1)
+
+
+def _payload(worlty_type: int, worlty_class: int, rnd: random.Random) -> dict[str, Any]:
+    """Build an initial payload for a device kind."""
+    if worlty_type == 3:
+        if worlty_class == 1:
+            return {"stt": False, "lvm": 3, "lv": 1, "sc": 1 << 1}
+        return {"stt": False, "lvm": 1, "lv": 0, "sc": 0}
+    if worlty_type == 4:
+        return {"stt": False}
+    if worlty_type == 2:
+        return {"stt": f"{rnd.uniform(18, 26):.1f}"}
+    if worlty_type == 1:
+        return {"stt": "off"}
+    if worlty_type == 8 and worlty_class == 1:
+        return {"stt": True, "m": 1, "tt": 22, "tc": 21.5, "ts": 0.5, "sm": 0b1000011}
+    if worlty_type == 8:
+        return {
+            "stt": False,
+            "m": 2,
+            "tt": 24,
+            "tc": 26.0,
+            "ts": 1,
+            "sm": 0b0111101,
+            "sf": 0b111000,
+            "ssw": 0b11,
+            "f": 3,
+            "sw": 0,
+            "a": 2,
+        }
+    if worlty_type == 6:
+        return {"stt": False, "m": 1, "sp": 3, "sm": 0b110, "ssp": 0b111000, "ssw": 0}
+    return {"stt": None}
+
+
+@dataclass
+class SimulatedDevice:
+    """Simulated Worlty device or child."""
+
+    pk: int
+    name: str
+    type: int
+    cls: int
+    lct: int
+    payload: dict[str, Any]
+    fk: int = 0
+    hide: bool = False
+    children: list["SimulatedDevice"] = field(default_factory=list)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the device as it is sent by the pad."""
+        device = {
+            "pk": self.pk,
+            "cid" if self.fk else "did": self.name,
+            "type": self.type,
+            "cls": self.cls,
+            "lct": self.lct,
+            "stt": self.payload.get("stt"),
+            "payload": dict(self.payload),
+        }
+        if self.hide:
+            device["hide"] = True
+        if not self.fk:
+            device["children"] = [child.as_dict() for child in self.children]
+        return device
+
+    def touch(self) -> None:
+        """Bump last change time."""
+        self.lct = _next_lct(self.lct)
+
+
+def build_devices(
+    count: int, children: int = 0, seed: int = 0
+) -> dict[int, SimulatedDevice]:
+    """Build a deterministic set of simulated devices."""
+    rnd = random.Random(seed)
+    lct = int(time.time())
+    devices: dict[int, SimulatedDevice] = {}
+    for index in range(count):
+        prefix, worlty_type, worlty_class = DEVICE_KINDS[index % len(DEVICE_KINDS)]
+        pk = index + 1
+        device = SimulatedDevice(
+            pk=pk,
+            name=f"{prefix}_{index + 1}",
+            type=worlty_type,
+            cls=worlty_class,
+            lct=lct,
+            payload=_payload(worlty_type, worlty_class, rnd),
+        )
+        for child_index in range(children):
+            cid, child_type, child_class, stt = CHILD_KINDS[
+                child_index % len(CHILD_KINDS)
+            ]
+            device.children.append(
+                SimulatedDevice(
+                    pk=child_index + 1,
+                    name=cid,
+                    type=child_type,
+                    cls=child_class,
+                    lct=lct,
+                    payload={"stt": stt},
+                    fk=pk,
+                )
+            )
+        devices[pk] = device
+    return devices
+
+
+class FrameReader:
+    """Split newline delimited JSON objects from a stream."""
+
+    def __init__(self) -> None:
+        """Initialize."""
+        self._buffer = b""
+
+    def feed(self, data: bytes) -> list[dict[str, Any]]:
+        """Feed received bytes and return every complete frame.
+
+        Raises ValueError for a line that is not exactly one JSON object,
+        such as frames written back to back without a delimiter.
+        """
+        *lines, self._buffer = (self._buffer + data).split(b"\n")
+        frames = []
+        for line in lines:
+            if not line.strip():
+                continue
+            frame = json.loads(line)
+            if not isinstance(frame, dict):
+                raise ValueError(f"Frame is not an object: {line[:80]!r}")
+            frames.append(frame)
+        return frames
+
+
+class WorltyPadSimulator:
+    """Asyncio TCP server that behaves like a Worlty pad."""
+
+    def __init__(
+        self,
+        devices: dict[int, SimulatedDevice],
+        host: str = "127.0.0.1",
+        port: int = 0,
+        access_token: str = DEFAULT_ACCESS_TOKEN,
+        update_rate: float = 0.0,
+        burst_size: int = 0,
+        burst_interval: float = 0.0,
+        health_interval: float = 30.0,
+        command_delay: float = 0.0,
+        auth_delay: float = 0.0,
+        initial_dump: bool = True,
+        seed: int = 0,
+    ) -> None:
+        """Initialize.
+
+        update_rate is the number of spontaneous device changes per second,
+        burst_size changes are sent back to back every burst_interval seconds,
+        command_delay emulates the bus latency before a set is applied and
+        auth_delay a pad that is slow to answer an auth. Without initial_dump
+        only a health frame follows authenticated.
+        """
+        self.devices = devices
+        self.host = host
+        self.port = port
+        self.access_token = access_token
+        self.update_rate = update_rate
+        self.burst_size = burst_size
+        self.burst_interval = burst_interval
+        self.health_interval = health_interval
+        self.command_delay = command_delay
+        self.auth_delay = auth_delay
+        self.initial_dump = initial_dump
+        # Connected clients stop hearing from the pad, like a half-open session.
+        self.silent = False
+        self.stats: dict[str, int] = {
+            "frames_sent": 0,
+            "bytes_sent": 0,
+            "frames_received": 0,
+            "commands": 0,
+            "gets": 0,
+            "bad_frames": 0,
+        }
+        self._random = random.Random(seed)
+        self._server: asyncio.Server | None = None
+        self._clients: set[asyncio.StreamWriter] = set()
+
+    async def start(self) -> None:
+        """Start listening."""
+        self._server = await asyncio.start_server(
+            self._handle_client, self.host, self.port
+        )
+        self.port = self._server.sockets[0].getsockname()[1]
+        LOGGER.info("Simulated pad listening on %s:%s", self.host, self.port)
+
+    async def stop(self) -> None:
+        """Close every client and stop listening."""
+        for writer in list(self._clients):
+            writer.close()
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    async def drop_clients(self) -> None:
+        """Close client connections but keep listening."""
+        for writer in list(self._clients):
+            writer.close()
+
+    async def broadcast(self, message: dict[str, Any]) -> None:
+        """Send a frame to every authenticated client."""
+        for writer in list(self._clients):
+            await self._send(writer, message)
+
+    async def send_update(self, pks: list[int]) -> None:
+        """Send an update frame for pks."""
+        await self.broadcast(self._update_frame(pks))
+
+    async def send_health(self) -> None:
+        """Send a health frame."""
+        await self.broadcast(self._health_frame())
+
+    async def send_device_list(self) -> None:
+        """Send a device/list frame."""
+        await self.broadcast(
+            {"type": "device/list", "data": {"devices": list(self.devices)}}
+        )
+
+    async def delete_devices(self, pks: list[int]) -> None:
+        """Delete devices and send a device/delete frame."""
+        for pk in pks:
+            self.devices.pop(pk, None)
+        await self.broadcast({"type": "device/delete", "data": {"devices": pks}})
+
+    def mutate(self, pk: int) -> None:
+        """Change the state of a device the way a sensor tick would."""
+        device = self.devices[pk]
+        payload = device.payload
+        stt = payload.get("stt")
+        if device.type == 2:
+            payload["stt"] = f"{self._random.uniform(18, 26):.1f}"
+        elif device.type == 8:
+            payload["tc"] = round(self._random.uniform(18, 28) * 2) / 2
+        elif device.type == 1:
+            payload["stt"] = "off" if stt == "on" else "on"
+        elif isinstance(stt, bool):
+            payload["stt"] = not stt
+        device.touch()
+
+    def _update_frame(self, pks: list[int]) -> dict[str, Any]:
+        """Build an update frame."""
+        return {
+            "type": "update",
+            "data": {
+                "devices": [
+                    self.devices[pk].as_dict() for pk in pks if pk in self.devices
+                ]
+            },
+        }
+
+    def _health_frame(self) -> dict[str, Any]:
+        """Build a health frame."""
+        return {
+            "type": "health",
+            "data": {
+                "devices": {str(pk): device.lct for pk, device in self.devices.items()}
+            },
+        }
+
+    async def _send(self, writer: asyncio.StreamWriter, message: dict[str, Any]) -> None:
+        """Write a newline delimited frame."""
+        if writer.is_closing() or self.silent:
+            return
+        data = json.dumps(message).encode() + b"\n"
+        writer.write(data)
+        self.stats["frames_sent"] += 1
+        self.stats["bytes_sent"] += len(data)
+        try:
+            await writer.drain()
+        except ConnectionError:
+            writer.close()
+
+    async def _handle_client(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        """Serve one client."""
+        frames = FrameReader()
+        traffic: asyncio.Task | None = None
+        await self._send(writer, {"type": "auth_required"})
+        try:
+            while data := await reader.read(65536):
+                for frame in frames.feed(data):
+                    self.stats["frames_received"] += 1
+                    if frame.get("type") == "auth":
+                        if frame.get("access_token") != self.access_token:
+                            await self._send(writer, {"type": "auth_invalid"})
+                            writer.close()
+                            return
+                        if self.auth_delay:
+                            await asyncio.sleep(self.auth_delay)
+                        await self._send(
+                            writer, {"type": "authenticated", "data": dict(PAD_INFO)}
+                        )
+                        self._clients.add(writer)
+                        if self.initial_dump:
+                            await self._send(
+                                writer, self._update_frame(list(self.devices))
+                            )
+                        await self._send(writer, self._health_frame())
+                        traffic = asyncio.create_task(self._traffic(writer))
+                    elif writer in self._clients:
+                        await self._handle_frame(writer, frame)
+        except ConnectionError:
+            pass
+        except ValueError as e:
+            self.stats["bad_frames"] += 1
+            LOGGER.error("Disconnect client sending an undelimited frame: %s", e)
+        finally:
+            self._clients.discard(writer)
+            if traffic is not None:
+                traffic.cancel()
+            writer.close()
+
+    async def _handle_frame(
+        self, writer: asyncio.StreamWriter, frame: dict[str, Any]
+    ) -> None:
+        """Handle a frame from an authenticated client."""
+        data: dict[str, Any] = frame.get("data") or {}
+        if frame.get("type") == "get":
+            self.stats["gets"] += 1
+            await self._send(writer, self._update_frame(data.get("devices", [])))
+        elif frame.get("type") == "set":
+            commands = data.get("devices", [])
+            self.stats["commands"] += len(commands)
+            if self.command_delay:
+                await asyncio.sleep(self.command_delay)
+            pks = []
+            for command in commands:
+                device = self.devices.get(command.get("pk"))
+                if device is None:
+                    continue
+                children = {child.name: child for child in device.children}
+                for key, value in command.get("payload", {}).items():
+                    if (child := children.get(key)) is not None:
+                        child.payload["stt"] = value
+                        child.touch()
+                    else:
+                        device.payload[key] = value
+                device.touch()
+                pks.append(device.pk)
+            if pks:
+                await self._send(writer, self._update_frame(pks))
+        else:
+            LOGGER.debug("Unhandled frame %s", frame)
+
+    async def _traffic(self, writer: asyncio.StreamWriter) -> None:
+        """Generate spontaneous updates, bursts and health frames."""
+        loop = asyncio.get_running_loop()
+        next_health = loop.time() + self.health_interval
+        next_burst = loop.time() + (self.burst_interval or float("inf"))
+        interval = 1 / self.update_rate if self.update_rate > 0 else 1.0
+        pks = list(self.devices)
+        while not writer.is_closing():
+            await asyncio.sleep(interval)
+            now = loop.time()
+            if self.update_rate > 0 and pks:
+                pk = self._random.choice(pks)
+                self.mutate(pk)
+                await self._send(writer, self._update_frame([pk]))
+            if self.burst_size and now >= next_burst:
+                next_burst = now + self.burst_interval
+                for _ in range(self.burst_size):
+                    pk = self._random.choice(pks)
+                    self.mutate(pk)
+                    await self._send(writer, self._update_frame([pk]))
+            if now >= next_health:
+                next_health = now + self.health_interval
+                await self._send(writer, self._health_frame())
+
+
+async def _main(args: argparse.Namespace) -> None:
+    """Run the simulator until interrupted."""
+    simulator = WorltyPadSimulator(
+        build_devices(args.devices, args.children, args.seed),
+        host=args.host,
+        port=args.port,
+        access_token=args.token,
+        update_rate=args.rate,
+        burst_size=args.burst,
+        burst_interval=args.burst_interval,
+        health_interval=args.health_interval,
+        command_delay=args.command_delay,
+        auth_delay=args.auth_delay,
+        initial_dump=not args.no_dump,
+        seed=args.seed,
+    )
+    await simulator.start()
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await simulator.stop()
+
+
+def main() -> None:
+    """Parse arguments and run the simulator."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=8899)
+    parser.add_argument("--token", default=DEFAULT_ACCESS_TOKEN)
+    parser.add_argument("--devices", type=int, default=100)
+    parser.add_argument("--children", type=int, default=0)
+    parser.add_argument("--rate", type=float, default=5.0, help="updates per second")
+    parser.add_argument("--burst", type=int, default=0, help="updates per burst")
+    parser.add_argument("--burst-interval", type=float, default=10.0)
+    parser.add_argument("--health-interval", type=float, default=30.0)
+    parser.add_argument("--command-delay", type=float, default=0.05)
+    parser.add_argument("--auth-delay", type=float, default=0.0)
+    parser.add_argument(
+        "--no-dump", action="store_true", help="send only health after auth"
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("-v", "--verbose", action="store_true")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.DEBUG if args.verbose else logging.INFO)
+    try:
+        asyncio.run(_main(args))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
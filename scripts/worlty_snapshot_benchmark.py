@@ -0,0 +1,95 @@
+"""Compare bytes written per hour by the device persistence strategies.
+
+  set_data      the whole device map in the config entry, rewritten per update
+  snapshot      the whole device map rewritten once per flush interval
+  journal       changed devices appended per flush interval, compacted into
+                the base snapshot once the journal outgrows the map
+
+A Home Assistant development environment is required for the journal
+encoder.
+
+    python scripts/worlty_snapshot_benchmark.py --devices 300 --rate 5
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+from pathlib import Path
+import random
+import sys
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from worlty_simulator import build_devices  # noqa: E402
+
+from custom_components.worlty.store import (  # noqa: E402
+    JOURNAL_COMPACT_MIN_ENTRIES,
+    journal_line,
+)
+
+
+def device_map(devices) -> dict[str, dict]:
+    """Flatten simulated devices into the persisted map."""
+    result = {}
+    for device in devices.values():
+        data = device.as_dict()
+        result[f"worlty_sim:{device.pk}:{device.name}"] = data
+        for child in data["children"]:
+            child["fk"] = device.pk
+            result[f"worlty_sim:{device.pk}_{child['pk']}:{child['cid']}"] = child
+    return result
+
+
+def main() -> None:
+    """Run the comparison and print a report."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--devices", type=int, default=300)
+    parser.add_argument("--children", type=int, default=2)
+    parser.add_argument("--rate", type=float, default=5.0, help="updates per second")
+    parser.add_argument("--interval", type=float, default=30.0, help="flush seconds")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rnd = random.Random(args.seed)
+    devices = device_map(build_devices(args.devices, args.children, args.seed))
+    unique_ids = list(devices)
+    entry_bytes = len(json.dumps({"data": {"devices": devices}}))
+    snapshot_bytes = len(json.dumps({"devices": devices}))
+    line_bytes = sum(len(journal_line(uid, dev)) for uid, dev in devices.items())
+    line_bytes /= len(devices)
+
+    windows = int(3600 / args.interval)
+    updates_per_window = round(args.rate * args.interval)
+    compact_at = max(JOURNAL_COMPACT_MIN_ENTRIES, len(devices))
+    journal_bytes = 0.0
+    journal_entries = 0
+    compactions = 0
+    for _ in range(windows):
+        changed = {rnd.choice(unique_ids) for _ in range(updates_per_window)}
+        journal_bytes += len(changed) * line_bytes
+        journal_entries += len(changed)
+        if journal_entries > compact_at:
+            journal_bytes += snapshot_bytes
+            journal_entries = 0
+            compactions += 1
+
+    updates = args.rate * 3600
+    rows = [
+        ("set_data", updates * entry_bytes, int(updates)),
+        ("snapshot", windows * snapshot_bytes if updates_per_window else 0, windows),
+        ("journal", journal_bytes, windows + compactions),
+    ]
+    print(
+        f"{len(devices)} persisted devices, {args.rate:g} updates/s,"
+        f" {args.interval:g} s flush interval"
+    )
+    print(f"{'strategy':<10}{'MiB/hour':>12}{'writes/hour':>14}")
+    for name, written, writes in rows:
+        print(f"{name:<10}{written / 1048576:>12.2f}{writes:>14}")
+    print(f"journal compactions per hour: {compactions}")
+
+
+if __name__ == "__main__":
+    main()
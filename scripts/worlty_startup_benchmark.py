@@ -0,0 +1,194 @@
+"""Measure config entry setup time and memory against the pad simulator.
+
+The entry is set up once to fill the device snapshot, unloaded, and then
+set up again while setup time, the time until every device has an entity,
+the time until the connection is live, the loaded platforms and the
+allocated memory are measured. For the second setup the pad is healthy,
+slow to authenticate or offline. --eager forwards every platform at startup
+as the integration used to. A Home Assistant development environment with
+``pytest-homeassistant-custom-component`` is required.
+
+    python scripts/worlty_startup_benchmark.py --devices 50
+    python scripts/worlty_startup_benchmark.py --devices 50 --eager
+    python scripts/worlty_startup_benchmark.py --pad offline
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import logging
+from pathlib import Path
+import sys
+import time
+import tracemalloc
+from typing import Any
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from homeassistant import loader  # noqa: E402
+from pytest_homeassistant_custom_component.common import (  # noqa: E402
+    MockConfigEntry,
+    async_test_home_assistant,
+)
+from worlty_benchmark import SimulatorThread  # noqa: E402
+from worlty_simulator import (  # noqa: E402
+    DEFAULT_ACCESS_TOKEN,
+    PAD_INFO,
+    WorltyPadSimulator,
+    build_devices,
+)
+
+import custom_components.worlty as worlty  # noqa: E402
+from custom_components.worlty.const import (  # noqa: E402
+    DOMAIN,
+    WorltyConnectionState,
+)
+
+
+def entity_count(hass, entry) -> int:
+    """Return the number of device entities the API created."""
+    api = hass.data[DOMAIN][entry.entry_id]["api"].api
+    return sum(len(entities) for entities in api.worlty_entities.values())
+
+
+def expected_count(hass, entry) -> int:
+    """Return the number of devices that get an entity."""
+    api = hass.data[DOMAIN][entry.entry_id]["api"].api
+    return sum(
+        1 for record in api.devices if record.platform is not None and not record.hide
+    )
+
+
+async def wait_entities(hass, entry, timeout: float) -> bool:
+    """Wait until every known device has an entity."""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        await hass.async_block_till_done()
+        expected = expected_count(hass, entry)
+        if expected and entity_count(hass, entry) >= expected:
+            return True
+        await asyncio.sleep(0.01)
+    return False
+
+
+async def wait_live(hass, entry, timeout: float) -> bool:
+    """Wait until the connection supervisor is live."""
+    api = hass.data[DOMAIN][entry.entry_id]["api"].api
+    deadline = time.monotonic() + timeout
+    while api.state is not WorltyConnectionState.LIVE:
+        if time.monotonic() > deadline:
+            return False
+        await asyncio.sleep(0.01)
+    return True
+
+
+async def run(args: argparse.Namespace) -> dict[str, Any]:
+    """Set up the entry twice and measure the second setup."""
+    if args.eager:
+        worlty.startup_platforms = lambda api: list(worlty.PLATFORMS)
+
+    simulator = WorltyPadSimulator(
+        build_devices(args.devices, args.children, args.seed),
+        health_interval=3600,
+        seed=args.seed,
+    )
+    sim_thread = SimulatorThread(simulator)
+    sim_thread.start_and_wait()
+    results: dict[str, Any] = {}
+
+    try:
+        async with async_test_home_assistant() as hass:
+            hass.data.pop(loader.DATA_CUSTOM_COMPONENTS, None)
+            entry = MockConfigEntry(
+                domain=DOMAIN,
+                unique_id=PAD_INFO["device_id"],
+                data={
+                    "ip_address": "127.0.0.1",
+                    "port": simulator.port,
+                    "access_token": DEFAULT_ACCESS_TOKEN,
+                },
+            )
+            entry.add_to_hass(hass)
+
+            await hass.config_entries.async_setup(entry.entry_id)
+            await wait_entities(hass, entry, args.timeout)
+            await hass.config_entries.async_unload(entry.entry_id)
+            await hass.async_block_till_done()
+
+            if args.pad == "offline":
+                sim_thread.stop()
+            elif args.pad == "slow":
+                simulator.auth_delay = args.auth_delay
+
+            tracemalloc.start()
+            started = time.perf_counter()
+            await hass.config_entries.async_setup(entry.entry_id)
+            results["setup_s"] = time.perf_counter() - started
+            results["ready"] = await wait_entities(hass, entry, args.timeout)
+            results["ready_s"] = time.perf_counter() - started
+            current, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            results["memory_kib"] = current / 1024
+            results["peak_kib"] = peak / 1024
+            results["live_s"] = (
+                time.perf_counter() - started
+                if args.pad != "offline" and await wait_live(hass, entry, args.timeout)
+                else None
+            )
+
+            api = hass.data[DOMAIN][entry.entry_id]["api"].api
+            results["platforms"] = sorted(api.platforms)
+            results["entities"] = entity_count(hass, entry)
+            results["modules"] = sorted(
+                name
+                for name in sys.modules
+                if name.startswith("homeassistant.components.")
+                and name.count(".") == 2
+            )
+
+            await hass.config_entries.async_unload(entry.entry_id)
+            await hass.async_block_till_done()
+    finally:
+        if sim_thread.is_alive():
+            sim_thread.stop()
+    return results
+
+
+def main() -> None:
+    """Parse arguments, run the benchmark and print a report."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--devices", type=int, default=50)
+    parser.add_argument("--children", type=int, default=0)
+    parser.add_argument("--eager", action="store_true")
+    parser.add_argument(
+        "--pad", choices=("healthy", "slow", "offline"), default="healthy"
+    )
+    parser.add_argument("--auth-delay", type=float, default=5.0)
+    parser.add_argument("--timeout", type=float, default=30.0)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.WARNING)
+
+    results = asyncio.run(run(args))
+    print(f"mode               {'eager' if args.eager else 'lazy'}, pad {args.pad}")
+    print(f"setup              {results['setup_s'] * 1000:.1f} ms")
+    print(
+        f"entities ready     {results['ready_s'] * 1000:.1f} ms"
+        f" ({results['entities']} entities{'' if results['ready'] else ', timed out'})"
+    )
+    print(
+        "live               "
+        + (f"{results['live_s'] * 1000:.1f} ms" if results["live_s"] else "-")
+    )
+    print(f"platforms          {len(results['platforms'])}: {', '.join(results['platforms'])}")
+    print(
+        f"memory             {results['memory_kib']:.0f} KiB"
+        f" (peak {results['peak_kib']:.0f} KiB)"
+    )
+    print(f"component modules  {len(results['modules'])}")
+
+
+if __name__ == "__main__":
+    main()
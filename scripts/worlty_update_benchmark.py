@@ -0,0 +1,94 @@
+"""Measure the CPU time and allocations of applying one update frame.
+
+Every frame carries all devices, as a get response does, with none, one
+percent or all of them changed since the previous frame. Point --tree at an
+older checkout to measure the client of that revision. A Home Assistant
+development environment is required.
+
+    python scripts/worlty_update_benchmark.py --devices 300 --children 2
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import gc
+from pathlib import Path
+import sys
+import time
+import tracemalloc
+
+parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+parser.add_argument("--devices", type=int, default=300)
+parser.add_argument("--children", type=int, default=2)
+parser.add_argument("--frames", type=int, default=50)
+parser.add_argument("--tree", type=Path, default=Path(__file__).resolve().parents[1])
+args = parser.parse_args()
+
+sys.path.insert(0, str(args.tree.resolve()))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from worlty_simulator import PAD_INFO, WorltyPadSimulator, build_devices  # noqa: E402
+
+from custom_components.worlty.worlty import WorltyBaseDevice, WorltyLocal  # noqa: E402
+
+
+def make_client() -> WorltyLocal:
+    """Return a client without a connection or entities."""
+    api = WorltyLocal(None, "127.0.0.1", 0, "")
+    api.worlty_pad = WorltyBaseDevice(PAD_INFO)
+    if hasattr(api, "devices"):
+        api.devices.device_id = api.worlty_pad.device_id
+    return api
+
+
+def build_frames(simulator, changed: int) -> list[dict]:
+    """Return update frames of every device with changed devices each."""
+    pks = list(simulator.devices)
+    frames = []
+    for index in range(args.frames):
+        for offset in range(changed):
+            simulator.mutate(pks[(index * changed + offset) % len(pks)])
+        frames.append(simulator._update_frame(pks))
+    return frames
+
+
+async def measure(api, simulator, changed: int) -> tuple[float, float]:
+    """Return CPU seconds and allocated KiB per frame."""
+    frames = build_frames(simulator, changed)
+    gc.collect()
+    started = time.process_time()
+    for frame in frames:
+        await api.handle_message(frame)
+    elapsed = time.process_time() - started
+
+    # Traced separately, tracemalloc slows every allocation down.
+    frames = build_frames(simulator, changed)
+    gc.collect()
+    tracemalloc.start()
+    allocated = 0
+    for frame in frames:
+        before, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        await api.handle_message(frame)
+        _, peak = tracemalloc.get_traced_memory()
+        allocated += peak - before
+    tracemalloc.stop()
+    return elapsed / len(frames), allocated / len(frames) / 1024
+
+
+async def run() -> None:
+    """Run the benchmark and print a report."""
+    simulator = WorltyPadSimulator(build_devices(args.devices, args.children))
+    api = make_client()
+    await api.handle_message(simulator._update_frame(list(simulator.devices)))
+
+    print(f"tree: {args.tree}")
+    print(f"{'changed':>8}{'cpu/frame':>14}{'alloc/frame':>14}")
+    for changed in (0, max(1, args.devices // 100), args.devices):
+        cpu, alloc = await measure(api, simulator, changed)
+        print(f"{changed:>8}{cpu * 1e3:>11.3f} ms{alloc:>10.1f} KiB")
+
+
+if __name__ == "__main__":
+    asyncio.run(run())